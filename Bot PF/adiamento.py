@@ -0,0 +1,124 @@
+"""Adiamento automático de respostas a comandos lentos.
+
+O Discord só espera 3 segundos pela primeira resposta de uma interação. Cada
+comando ganha um timer quando chega: se o handler ainda não respondeu quando o
+orçamento acaba, o timer chama `interaction.response.defer()` ("pensando...")
+e a resposta final sai depois por `interaction.followup`.
+
+Os handlers respondem com `responder(interaction, ...)` (mesmos argumentos de
+`send_message`), que escolhe sozinho entre a resposta inicial e o followup. O
+timer e `responder` usam a mesma trava, então nunca tentam responder ao mesmo
+tempo.
+
+A resposta adiada herda a visibilidade do defer: comandos cuja resposta é
+privada declaram `extras={"efemero": True}`. Respostas privadas de um comando
+público (erros, cooldowns) que chegam depois de um defer público apagam o
+"pensando..." e saem como um followup privado.
+"""
+import asyncio
+import time
+from collections import defaultdict
+
+import discord
+
+
+class Estatistica:
+    __slots__ = ("execucoes", "adiados", "tempo_total", "tempo_maximo")
+
+    def __init__(self):
+        self.execucoes = 0
+        self.adiados = 0
+        self.tempo_total = 0.0
+        self.tempo_maximo = 0.0
+
+    @property
+    def taxa(self):
+        return self.adiados / self.execucoes if self.execucoes else 0.0
+
+    @property
+    def tempo_medio(self):
+        return self.tempo_total / self.execucoes if self.execucoes else 0.0
+
+
+class _Pendente:
+    __slots__ = ("nome", "inicio", "trava", "timer", "adiado_publico")
+
+    def __init__(self, nome):
+        self.nome = nome
+        self.inicio = time.monotonic()
+        self.trava = asyncio.Lock()
+        self.timer = None
+        self.adiado_publico = False
+
+
+class AdiamentoAutomatico:
+    """Timers de adiamento e estatísticas por comando.
+
+    - `orcamento`: segundos que um comando tem para responder antes de ser
+      adiado (precisa ficar abaixo dos 3s do Discord, com folga para a rede)
+    """
+
+    def __init__(self, orcamento=2.0):
+        self.orcamento = orcamento
+        self.estatisticas = defaultdict(Estatistica)
+        self._pendentes = {}
+
+    def iniciar(self, interaction: discord.Interaction):
+        """Começa a contar o orçamento de um comando que acabou de chegar."""
+        comando = interaction.command
+        nome = comando.qualified_name if comando else interaction.data.get("name", "?")
+        pendente = self._pendentes[interaction.id] = _Pendente(nome)
+        self.estatisticas[nome].execucoes += 1
+        efemero = bool(comando and comando.extras.get("efemero"))
+        pendente.timer = asyncio.create_task(self._adiar(interaction, pendente, efemero))
+
+    async def _adiar(self, interaction, pendente, efemero):
+        await asyncio.sleep(self.orcamento)
+        async with pendente.trava:
+            if interaction.response.is_done():
+                return
+            try:
+                await interaction.response.defer(ephemeral=efemero, thinking=True)
+            except discord.HTTPException as e:
+                print(f"⚠️ Não foi possível adiar /{pendente.nome}: {e}")
+                return
+            pendente.adiado_publico = not efemero
+        self.estatisticas[pendente.nome].adiados += 1
+        print(f"⏳ /{pendente.nome} passou de {self.orcamento:.1f}s e foi adiado")
+
+    async def responder(self, interaction: discord.Interaction, *args, **kwargs):
+        """Responde pela resposta inicial ou, se já adiado, pelo followup."""
+        pendente = self._pendentes.get(interaction.id)
+        if pendente is None:
+            return await _enviar(interaction, *args, **kwargs)
+        async with pendente.trava:
+            # Respondido a tempo: o timer não tem mais o que fazer
+            pendente.timer.cancel()
+            if pendente.adiado_publico and kwargs.get("ephemeral"):
+                # O primeiro followup substituiria o "pensando..." público; sem
+                # ele, o followup pode ser privado
+                pendente.adiado_publico = False
+                try:
+                    await interaction.delete_original_response()
+                except discord.HTTPException as e:
+                    print(f"⚠️ Não foi possível apagar o adiamento de /{pendente.nome}: {e}")
+            return await _enviar(interaction, *args, **kwargs)
+
+    def terminar(self, interaction: discord.Interaction):
+        """Fecha o timer do comando (com sucesso ou erro) e registra a duração."""
+        pendente = self._pendentes.pop(interaction.id, None)
+        if pendente is None:
+            return
+        if not pendente.trava.locked():
+            # Se está no meio do defer, deixa terminar para não cortar a requisição
+            pendente.timer.cancel()
+        duracao = time.monotonic() - pendente.inicio
+        estatistica = self.estatisticas[pendente.nome]
+        estatistica.tempo_total += duracao
+        estatistica.tempo_maximo = max(estatistica.tempo_maximo, duracao)
+
+
+async def _enviar(interaction, *args, **kwargs):
+    if interaction.response.is_done():
+        return await interaction.followup.send(*args, **kwargs)
+    return await interaction.response.send_message(*args, **kwargs)
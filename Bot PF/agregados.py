@@ -0,0 +1,108 @@
+"""Totais da economia mantidos a cada alteração (para /admin_economia).
+
+Em vez de percorrer todos os usuários a cada consulta, AgregadosEconomia
+guarda a contribuição de cada usuário (carteira, banco, se tem o Anel
+Supremo, se tem VIP) e ajusta os totais pela diferença sempre que o usuário é marcado
+como alterado (é um ouvinte do GerenciadorPersistencia, como o ranking).
+
+Uma alteração feita sem marcar o usuário não chega aqui; `auditar` recalcula
+tudo a partir dos registros, devolve a divergência encontrada e corrige os
+totais.
+
+`ativos` junta os usuários alterados desde a última amostra de métricas
+(ver `coletar_ativos`).
+"""
+import time
+
+CAMPOS = ("usuarios", "carteiras", "bancos", "aneis", "vips")
+
+
+def _contribuicao(registro):
+    return (
+        registro["carteira"],
+        registro["banco"],
+        "anel_supremo" in registro["inventario"],
+        bool(registro.get("vip")),
+    )
+
+
+class AgregadosEconomia:
+    def __init__(self):
+        self._por_usuario = {}
+        self.usuarios = 0
+        self.carteiras = 0
+        self.bancos = 0
+        self.aneis = 0
+        self.vips = 0
+        self.ativos = set()
+        self.ultima_auditoria = None  # time.time() da última auditoria
+        self.ultima_divergencia = {}
+
+    @property
+    def circulacao(self):
+        return self.carteiras + self.bancos
+
+    @property
+    def media(self):
+        return self.circulacao // self.usuarios if self.usuarios else 0
+
+    def totais(self):
+        return {campo: getattr(self, campo) for campo in CAMPOS}
+
+    def reconstruir(self, dados):
+        self.limpar()
+        for user_id, registro in dados.items():
+            self._somar(user_id, _contribuicao(registro))
+
+    def limpar(self):
+        self._por_usuario = {}
+        self.usuarios = self.carteiras = self.bancos = self.aneis = self.vips = 0
+
+    def coletar_ativos(self):
+        """Quantos usuários foram alterados desde a última coleta (e zera)."""
+        quantidade = len(self.ativos)
+        self.ativos = set()
+        return quantidade
+
+    # ---- ouvinte do GerenciadorPersistencia ----
+
+    def atualizar(self, user_id, registro):
+        if registro is not None:
+            self.ativos.add(user_id)
+        antiga = self._por_usuario.get(user_id)
+        nova = _contribuicao(registro) if registro is not None else None
+        if nova == antiga:
+            return
+        if antiga is not None:
+            carteira, banco, anel, vip = antiga
+            self.usuarios -= 1
+            self.carteiras -= carteira
+            self.bancos -= banco
+            self.aneis -= anel
+            self.vips -= vip
+            del self._por_usuario[user_id]
+        if nova is not None:
+            self._somar(user_id, nova)
+
+    def _somar(self, user_id, contribuicao):
+        carteira, banco, anel, vip = contribuicao
+        self._por_usuario[user_id] = contribuicao
+        self.usuarios += 1
+        self.carteiras += carteira
+        self.bancos += banco
+        self.aneis += anel
+        self.vips += vip
+
+    # ---- auditoria ----
+
+    def auditar(self, dados):
+        """Recalcula tudo; devolve {campo: (mantido, real)} do que estava errado."""
+        mantidos = self.totais()
+        self.reconstruir(dados)
+        reais = self.totais()
+        self.ultima_auditoria = time.time()
+        self.ultima_divergencia = {
+            campo: (mantidos[campo], reais[campo])
+            for campo in CAMPOS if mantidos[campo] != reais[campo]
+        }
+        return self.ultima_divergencia
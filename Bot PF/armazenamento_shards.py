@@ -0,0 +1,186 @@
+"""Armazenamento da economia dividido em vários arquivos JSON (shards).
+
+Cada usuário vai para o shard `crc32(user_id) % quantidade`. Em uma gravação
+só os shards que têm usuários alterados são regravados, então um /transferir
+entre dois usuários reescreve no máximo dois arquivos pequenos em vez da
+economia inteira. Na inicialização os shards são lidos em paralelo.
+
+Estrutura do diretório:
+    meta.json        {"shards": N}
+    s016-000.json    shard 0 de 16 (mesmo layout do economy_data.json)
+    s016-001.json    ...
+
+Importar um economy_data.json ou mudar a quantidade de shards:
+    python armazenamento_shards.py importar economy_data.json economy_shards 16
+    python armazenamento_shards.py rebalancear economy_shards 64
+"""
+import json
+import os
+import sys
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from persistencia import copiar_registro, gravar_atomico, para_json
+
+QUANTIDADE_PADRAO = 16
+
+
+def shard_de(user_id, quantidade):
+    # crc32 em vez de hash(): precisa ser o mesmo entre execuções
+    return zlib.crc32(str(user_id).encode()) % quantidade
+
+
+def _nome_shard(quantidade, indice):
+    return f"s{quantidade:03d}-{indice:03d}.json"
+
+
+class ArmazenamentoShards:
+    """Mesma interface do ArmazenamentoJSON, com um arquivo por shard.
+
+    `quantidade` só é usada ao criar um diretório novo; depois vale o que está
+    no meta.json (para mudar, use o comando `rebalancear`). Se o diretório
+    ainda não existir, os dados são importados de `caminho_legado`.
+    """
+
+    def __init__(self, diretorio, quantidade=None, caminho_legado=None, leitores=8):
+        self.diretorio = diretorio
+        self.caminho_legado = caminho_legado
+        self.leitores = leitores
+        self._trava = threading.Lock()
+        os.makedirs(diretorio, exist_ok=True)
+        self.quantidade = self._ler_meta() or quantidade or QUANTIDADE_PADRAO
+        if quantidade and self.quantidade != quantidade:
+            print(f"[SHARDS] {diretorio} usa {self.quantidade} shards (configurado: {quantidade}); "
+                  f"use 'python armazenamento_shards.py rebalancear' para mudar")
+        self._shards = [{} for _ in range(self.quantidade)]
+
+    # ----- Arquivos -----
+
+    def _caminho_meta(self):
+        return os.path.join(self.diretorio, "meta.json")
+
+    def _ler_meta(self):
+        try:
+            with open(self._caminho_meta(), 'r', encoding='utf-8') as f:
+                return json.load(f)["shards"]
+        except FileNotFoundError:
+            return None
+
+    def _caminho(self, indice, quantidade=None):
+        return os.path.join(self.diretorio, _nome_shard(quantidade or self.quantidade, indice))
+
+    def _ler_shard(self, indice):
+        try:
+            with open(self._caminho(indice), 'rb') as f:
+                return json.loads(f.read().decode('utf-8'))
+        except FileNotFoundError:
+            return {}
+
+    def _gravar_shard(self, indice, usuarios, quantidade=None):
+        conteudo = json.dumps(usuarios, ensure_ascii=False, separators=(',', ':'), default=para_json)
+        gravar_atomico(self._caminho(indice, quantidade), conteudo.encode('utf-8'))
+
+    def _gravar_todos(self, shards):
+        """Grava um conjunto completo de shards e só então troca o meta.json.
+
+        Os arquivos levam a quantidade no nome, então um crash no meio deixa o
+        conjunto antigo intacto e em uso.
+        """
+        quantidade = len(shards)
+        antigos = self._ler_meta()
+        for indice, usuarios in enumerate(shards):
+            self._gravar_shard(indice, usuarios, quantidade)
+        gravar_atomico(self._caminho_meta(), json.dumps({"shards": quantidade}).encode('utf-8'))
+        if antigos and antigos != quantidade:
+            for indice in range(antigos):
+                try:
+                    os.remove(self._caminho(indice, antigos))
+                except FileNotFoundError:
+                    pass
+        self.quantidade = quantidade
+        self._shards = shards
+
+    def _distribuir(self, dados, quantidade):
+        shards = [{} for _ in range(quantidade)]
+        for uid, registro in dados.items():
+            shards[shard_de(uid, quantidade)][uid] = registro
+        return shards
+
+    # ----- Interface do armazenamento -----
+
+    def carregar(self):
+        if self._ler_meta() is None:
+            if self.caminho_legado and os.path.exists(self.caminho_legado):
+                total = self.importar_json(self.caminho_legado)
+                print(f"[SHARDS] {total} usuários importados de {self.caminho_legado}")
+            else:
+                self._gravar_todos(self._shards)
+        # Leitura de arquivo libera o GIL; com muitos shards as leituras se sobrepõem
+        with ThreadPoolExecutor(max_workers=self.leitores) as executor:
+            shards = list(executor.map(self._ler_shard, range(self.quantidade)))
+        dados = {}
+        for usuarios in shards:
+            dados.update(usuarios)
+        return dados
+
+    def espelhar(self, dados):
+        self._shards = self._distribuir(
+            {uid: copiar_registro(r) for uid, r in dados.items()}, self.quantidade
+        )
+
+    def gravar(self, lote, removidos):
+        """Aplica o lote e regrava apenas os shards que mudaram."""
+        with self._trava:
+            sujos = set()
+            for uid in removidos:
+                indice = shard_de(uid, self.quantidade)
+                if self._shards[indice].pop(uid, None) is not None:
+                    sujos.add(indice)
+            for uid, registro in lote.items():
+                indice = shard_de(uid, self.quantidade)
+                self._shards[indice][uid] = registro
+                sujos.add(indice)
+            for indice in sorted(sujos):
+                self._gravar_shard(indice, self._shards[indice])
+
+    def importar_json(self, caminho_json):
+        """Distribui todos os usuários de um economy_data.json nos shards."""
+        with open(caminho_json, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+        with self._trava:
+            self._gravar_todos(self._distribuir(dados, self.quantidade))
+        return len(dados)
+
+    def rebalancear(self, quantidade):
+        """Redistribui os usuários em `quantidade` shards."""
+        with self._trava:
+            if quantidade == self.quantidade:
+                return
+            dados = {}
+            for usuarios in self._shards:
+                dados.update(usuarios)
+            self._gravar_todos(self._distribuir(dados, quantidade))
+
+
+if __name__ == '__main__':
+    argumentos = sys.argv[1:]
+    if len(argumentos) == 4 and argumentos[0] == 'importar':
+        _, origem, diretorio, quantidade = argumentos
+        if not os.path.exists(origem):
+            print(f'Arquivo não encontrado: {origem}')
+            sys.exit(1)
+        armazenamento = ArmazenamentoShards(diretorio, int(quantidade))
+        total = armazenamento.importar_json(origem)
+        print(f'{total} usuários importados em {armazenamento.quantidade} shards ({diretorio})')
+    elif len(argumentos) == 3 and argumentos[0] == 'rebalancear':
+        _, diretorio, quantidade = argumentos
+        armazenamento = ArmazenamentoShards(diretorio)
+        armazenamento.espelhar(armazenamento.carregar())
+        anterior = armazenamento.quantidade
+        armazenamento.rebalancear(int(quantidade))
+        print(f'{diretorio}: {anterior} -> {armazenamento.quantidade} shards')
+    else:
+        print('Uso: python armazenamento_shards.py importar <economy_data.json> <diretorio> <shards>')
+        print('     python armazenamento_shards.py rebalancear <diretorio> <shards>')
+        sys.exit(1)
@@ -0,0 +1,128 @@
+"""Armazenamento da economia em SQLite (uma linha por usuário).
+
+Alternativa ao arquivo JSON para servidores grandes: cada gravação do
+GerenciadorPersistencia vira uma única transação que atualiza só as linhas
+alteradas. Saldo, VIP e trabalho ficam em colunas próprias (dá para consultar
+o banco direto pelo sqlite3). Ranking e listagens do bot não vêm daqui: a
+economia inteira está em memória e os índices dela (ranking.py, indices.py)
+já respondem sem ir ao disco.
+
+Importação única de um economy_data.json existente:
+    python armazenamento_sqlite.py economy_data.json economy_data.db
+"""
+import json
+import os
+import sqlite3
+import sys
+import threading
+
+# Campos guardados em colunas próprias; o resto do registro vai em `dados`
+COLUNAS = ("carteira", "banco", "vip", "trabalho")
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS usuarios (
+    user_id TEXT PRIMARY KEY,
+    carteira INTEGER NOT NULL DEFAULT 0,
+    banco INTEGER NOT NULL DEFAULT 0,
+    vip TEXT,
+    trabalho TEXT,
+    dados TEXT NOT NULL
+);
+"""
+
+
+class ArmazenamentoSQLite:
+    """Mesma interface do ArmazenamentoJSON (`carregar` / `gravar`), em SQLite."""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        # A conexão é criada aqui e usada pela thread de persistência;
+        # a trava garante que só uma thread a usa por vez
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False, isolation_level=None)
+        self._trava = threading.Lock()
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("PRAGMA synchronous=NORMAL")
+        self._conexao.executescript(ESQUEMA)
+
+    @staticmethod
+    def _para_linha(user_id, registro):
+        if hasattr(registro, 'para_dict'):
+            registro = registro.para_dict()
+        extras = {k: v for k, v in registro.items() if k not in COLUNAS}
+        return (
+            user_id,
+            registro.get("carteira", 0),
+            registro.get("banco", 0),
+            registro.get("vip"),
+            registro.get("trabalho"),
+            json.dumps(extras, ensure_ascii=False, separators=(',', ':')),
+        )
+
+    def carregar(self):
+        dados = {}
+        with self._trava:
+            cursor = self._conexao.execute(
+                "SELECT user_id, carteira, banco, vip, trabalho, dados FROM usuarios"
+            )
+            for user_id, carteira, banco, vip, trabalho, extras in cursor:
+                registro = json.loads(extras)
+                registro["carteira"] = carteira
+                registro["banco"] = banco
+                registro["vip"] = vip
+                registro["trabalho"] = trabalho
+                dados[user_id] = registro
+        return dados
+
+    def gravar(self, lote, removidos):
+        """Grava o lote inteiro em uma única transação."""
+        with self._trava:
+            conexao = self._conexao
+            conexao.execute("BEGIN")
+            try:
+                if removidos:
+                    conexao.executemany(
+                        "DELETE FROM usuarios WHERE user_id = ?",
+                        ((uid,) for uid in removidos)
+                    )
+                if lote:
+                    conexao.executemany(
+                        "INSERT INTO usuarios (user_id, carteira, banco, vip, trabalho, dados) "
+                        "VALUES (?, ?, ?, ?, ?, ?) "
+                        "ON CONFLICT(user_id) DO UPDATE SET carteira=excluded.carteira, "
+                        "banco=excluded.banco, vip=excluded.vip, trabalho=excluded.trabalho, "
+                        "dados=excluded.dados",
+                        (self._para_linha(uid, r) for uid, r in lote.items())
+                    )
+                conexao.execute("COMMIT")
+            except Exception:
+                conexao.execute("ROLLBACK")
+                raise
+
+    def vazio(self):
+        with self._trava:
+            return self._conexao.execute("SELECT 1 FROM usuarios LIMIT 1").fetchone() is None
+
+    def importar_json(self, caminho_json):
+        """Copia todos os usuários de um economy_data.json para o banco."""
+        with open(caminho_json, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+        self.gravar(dados, ())
+        return len(dados)
+
+    def fechar(self):
+        with self._trava:
+            self._conexao.close()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        print('Uso: python armazenamento_sqlite.py <economy_data.json> <economy_data.db>')
+        sys.exit(1)
+    origem, destino = sys.argv[1], sys.argv[2]
+    if not os.path.exists(origem):
+        print(f'Arquivo não encontrado: {origem}')
+        sys.exit(1)
+    banco = ArmazenamentoSQLite(destino)
+    total = banco.importar_json(origem)
+    banco.fechar()
+    print(f'{total} usuários importados para {destino}')
@@ -0,0 +1,116 @@
+"""Compara tamanho e tempo de carga do snapshot JSON com o formato compacto.
+
+Uso: python bench_snapshot.py [quantidades...]   (padrão: 10000 100000 1000000)
+
+Gera usuários sintéticos, grava cada formato em um diretório temporário e
+mede quanto tempo leva para ler o arquivo e reconstruir o dict da economia.
+"""
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import snapshot_compacto
+
+ITENS = ["celular", "pc_gamer", "carro", "mansao", "iate", "anel_supremo",
+         "arma_plasma", "diamante_sangue", "passaporte_falso", "chip_hacker"]
+APPS = ["banco_digital", "bolsa_valores", "delivery", "uber"]
+TRABALHOS = ["entregador", "caixa", "programador", "medico", "empresario"]
+VIPS = ["alpha", "beta", "omega", "diamond", "diamond2"]
+
+
+def gerar_usuarios(quantidade, semente=42):
+    rnd = random.Random(semente)
+    agora = datetime(2025, 10, 24, 12, 0, 0)
+
+    def talvez_data():
+        if rnd.random() < 0.5:
+            return None
+        return (agora - timedelta(seconds=rnd.randint(0, 30 * 86400), microseconds=rnd.randint(0, 999999))).isoformat()
+
+    dados = {}
+    for i in range(quantidade):
+        ativo = rnd.random() < 0.4
+        dados[str(700000000000000000 + i * 7919)] = {
+            "carteira": rnd.randint(0, 5_000_000) if ativo else 1000,
+            "banco": rnd.randint(0, 1_000_000) if ativo else 0,
+            "inventario": {item: 1 for item in rnd.sample(ITENS, rnd.randint(0, 4))} if ativo else {},
+            "trabalho": rnd.choice(TRABALHOS) if ativo else None,
+            "ultimo_trabalho": talvez_data() if ativo else None,
+            "ultimo_daily": talvez_data() if ativo else None,
+            "ultimo_roubo": talvez_data() if ativo else None,
+            "celular": ativo and rnd.random() < 0.5,
+            "apps": rnd.sample(APPS, rnd.randint(0, 2)) if ativo else [],
+            "nivel": rnd.randint(1, 20) if ativo else 1,
+            "xp": rnd.randint(0, 5000) if ativo else 0,
+            "reputacao": rnd.randint(-500, 100) if ativo else 0,
+            "vip": rnd.choice(VIPS) if rnd.random() < 0.02 else None,
+            "vip_expira": None,
+            "anel_ultimo_uso_criar": None,
+            "anel_ultimo_uso_punir": None,
+        }
+    return dados
+
+
+def medir_carga(caminho, leitor, repeticoes):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        gc.collect()
+        inicio = time.perf_counter()
+        with open(caminho, 'rb') as f:
+            resultado = leitor(f.read())
+        melhor = min(melhor, time.perf_counter() - inicio)
+        del resultado
+    return melhor
+
+
+def comparar(quantidade, diretorio):
+    dados = gerar_usuarios(quantidade)
+    formatos = [
+        ("json (indent=4)", "snapshot.json",
+         lambda d: json.dumps(d, indent=4, ensure_ascii=False).encode('utf-8'),
+         lambda b: json.loads(b.decode('utf-8'))),
+        ("compacto", "snapshot.bin",
+         lambda d: snapshot_compacto.codificar(d),
+         snapshot_compacto.decodificar),
+        ("compacto + zlib", "snapshot.binz",
+         lambda d: snapshot_compacto.codificar(d, comprimir=True),
+         snapshot_compacto.decodificar),
+    ]
+    repeticoes = 3 if quantidade <= 100_000 else 1
+    linhas = []
+    for nome, arquivo, escritor, leitor in formatos:
+        caminho = os.path.join(diretorio, arquivo)
+        inicio = time.perf_counter()
+        conteudo = escritor(dados)
+        escrita = time.perf_counter() - inicio
+        with open(caminho, 'wb') as f:
+            f.write(conteudo)
+        del conteudo
+        carga = medir_carga(caminho, leitor, repeticoes)
+        linhas.append((nome, os.path.getsize(caminho), escrita, carga))
+        os.remove(caminho)
+    del dados
+    gc.collect()
+    return linhas
+
+
+def main():
+    quantidades = [int(q) for q in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    with tempfile.TemporaryDirectory() as diretorio:
+        for quantidade in quantidades:
+            print(f"\n{quantidade:,} usuários")
+            print(f"{'formato':<18}{'tamanho':>14}{'gravação':>12}{'carga':>12}")
+            base = None
+            for nome, tamanho, escrita, carga in comparar(quantidade, diretorio):
+                base = base or (tamanho, carga)
+                print(f"{nome:<18}{tamanho / 1024 / 1024:>11.2f} MB{escrita:>11.3f}s{carga:>11.3f}s"
+                      f"   ({base[0] / tamanho:.1f}x menor, {base[1] / carga:.1f}x mais rápido)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""Mede transações por segundo: LivroRazao + gravação em lote vs. edição do dict + save completo.
+
+Uso: python bench_transacoes.py [usuarios] [transacoes]   (padrão: 10000 20000)
+
+"dict + save" é o padrão antigo dos handlers: alterar as carteiras e regravar
+o economy_data.json inteiro a cada transferência (medido em uma amostra
+menor, porque cada save leva o tempo de serializar a economia toda). Os
+modos com LivroRazao rodam dentro de um event loop, cedendo a vez entre as
+transações como comandos independentes fariam, e incluem a gravação final.
+"""
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from bench_snapshot import gerar_usuarios
+from persistencia import ArmazenamentoJSON, ArmazenamentoJournal, GerenciadorPersistencia
+from registro_usuario import RegistroUsuario, configurar_catalogos
+from transacoes import LivroRazao, SaldoInsuficiente, Transacao
+
+
+def pares(ids, quantidade, semente=7):
+    rnd = random.Random(semente)
+    return [(rnd.choice(ids), rnd.choice(ids), rnd.randint(1, 500)) for _ in range(quantidade)]
+
+
+def medir_dict_save(dados, caminho, operacoes):
+    inicio = time.perf_counter()
+    for de, para, valor in operacoes:
+        if dados[de]["carteira"] < valor:
+            continue
+        dados[de]["carteira"] -= valor
+        dados[para]["carteira"] += valor - int(valor * 0.05)
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump(dados, f, indent=4, ensure_ascii=False)
+    return len(operacoes) / (time.perf_counter() - inicio)
+
+
+async def medir_livro(dados, armazenamento, operacoes):
+    registros = {uid: RegistroUsuario.de_dict(r) for uid, r in dados.items()}
+    persistencia = GerenciadorPersistencia(registros, armazenamento, intervalo=30, limite_alterados=100)
+    livro = LivroRazao(registros, persistencia, RegistroUsuario)
+    inicio = time.perf_counter()
+    for de, para, valor in operacoes:
+        try:
+            livro.aplicar(Transacao().transferir(de, para, valor, taxa=int(valor * 0.05)))
+        except SaldoInsuficiente:
+            pass
+        await asyncio.sleep(0)
+    persistencia.agendar()
+    await persistencia.aguardar()
+    persistencia.fechar()
+    return len(operacoes) / (time.perf_counter() - inicio)
+
+
+def main():
+    usuarios = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    quantidade = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    configurar_catalogos([], [])
+    dados = gerar_usuarios(usuarios)
+    for registro in dados.values():
+        registro["inventario"], registro["apps"] = {}, []
+    operacoes = pares(list(dados), quantidade)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        amostra = operacoes[:max(20, quantidade // 200)]
+        antigo = medir_dict_save(json.loads(json.dumps(dados)), os.path.join(diretorio, "antigo.json"), amostra)
+        resultados = [("dict + save completo", antigo)]
+
+        caminho = os.path.join(diretorio, "economy_data.json")
+        for nome, armazenamento in (
+            ("livro + journal", ArmazenamentoJournal(caminho)),
+            ("livro + json em lote", ArmazenamentoJSON(caminho)),
+        ):
+            armazenamento.carregar()
+            resultados.append((nome, asyncio.run(medir_livro(dados, armazenamento, operacoes))))
+            if hasattr(armazenamento, 'fechar'):
+                armazenamento.fechar()
+
+    print(f"{usuarios:,} usuários, {quantidade:,} transferências")
+    for nome, por_segundo in resultados:
+        print(f"{nome:<24}{por_segundo:>12,.0f} transações/s   ({por_segundo / antigo:,.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
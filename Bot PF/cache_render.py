@@ -0,0 +1,34 @@
+"""Cache dos embeds e SelectOptions montados a partir dos catálogos.
+
+/loja, /ajuda, /loja_vip, os menus de compra etc. montavam os mesmos embeds
+e opções a partir de LOJA, MERCADO_NEGRO, VIPS e APPS a cada chamada. Aqui
+cada peça é montada uma vez e reaproveitada enquanto a versão do catálogo não
+mudar; quem altera um catálogo chama `invalidar()`.
+
+    embed = renders.obter("loja", montar_embed_loja)
+
+Só o que depende do usuário (já possui, instalado...) é montado na hora,
+escolhendo entre as variantes guardadas aqui. O que sai do cache é
+compartilhado: copie (`embed.copy()`, `list(opcoes)`) antes de alterar.
+"""
+
+
+class CacheRender:
+    def __init__(self):
+        self.versao = 0
+        self._montados = {}  # chave -> (versão, valor)
+        self.construcoes = 0
+
+    def obter(self, chave, montar):
+        montado = self._montados.get(chave)
+        if montado is not None and montado[0] == self.versao:
+            return montado[1]
+        valor = montar()
+        self.construcoes += 1
+        self._montados[chave] = (self.versao, valor)
+        return valor
+
+    def invalidar(self):
+        """Um catálogo mudou: tudo é remontado no próximo uso."""
+        self.versao += 1
+        self._montados.clear()
@@ -0,0 +1,133 @@
+"""Cargos dos planos VIP: configuração por servidor e sincronização em segundo plano.
+
+ConfiguracaoCargos guarda em um JSON qual cargo corresponde a cada plano em
+cada servidor (o que o /admin_configurar_cargo_vip define), para sobreviver
+a reinícios:
+
+    {"<guild_id>": {"alpha": 123, "beta": 456}}
+
+SincronizadorCargos é a fila de "dar/tirar cargo". Compras e comandos de
+admin só enfileiram e respondem na hora; um worker aplica as operações pela
+API (`http.add_role` / `http.remove_role`, sem precisar buscar o membro).
+As rotas de cargo têm limite de taxa por servidor, então cada servidor tem
+o seu ritmo (uma requisição a cada `intervalo` segundos) e servidores
+diferentes não esperam um pelo outro. Um 429 que o discord.py não conseguiu
+absorver, ou um erro do Discord, devolve a operação para a fila com uma
+espera maior.
+
+A fila guarda só o estado desejado de cada (usuário, cargo): enfileirar
+"dar" e depois "tirar" antes do worker chegar nele vira só "tirar".
+"""
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+
+import discord
+
+from persistencia import gravar_atomico
+
+ESPERA_FALHA = 30  # segundos sem mexer no servidor depois de uma falha
+
+
+class ConfiguracaoCargos:
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._cargos = {}  # guild_id -> {vip: cargo_id}
+        self._gravando = asyncio.Lock()
+        if os.path.exists(caminho):
+            with open(caminho, 'r', encoding='utf-8') as f:
+                self._cargos = {
+                    int(guild_id): {vip: int(cargo_id) for vip, cargo_id in cargos.items()}
+                    for guild_id, cargos in json.load(f).items()
+                }
+
+    def cargo(self, guild_id, vip):
+        return self._cargos.get(guild_id, {}).get(vip)
+
+    def do_servidor(self, guild_id):
+        """{vip: cargo_id} configurados no servidor."""
+        return dict(self._cargos.get(guild_id, {}))
+
+    async def definir(self, guild_id, vip, cargo_id):
+        """Vale na hora; a gravação (com fsync) roda numa thread, fora do event loop."""
+        self._cargos.setdefault(guild_id, {})[vip] = cargo_id
+        conteudo = json.dumps(
+            {str(guild_id): cargos for guild_id, cargos in self._cargos.items()},
+            indent=4
+        ).encode('utf-8')
+        # Uma gravação por vez: todas usam o mesmo arquivo temporário
+        async with self._gravando:
+            await asyncio.to_thread(gravar_atomico, self.caminho, conteudo)
+
+
+class SincronizadorCargos:
+    def __init__(self, intervalo=1.0):
+        self.intervalo = intervalo
+        self._pendentes = {}  # guild_id -> OrderedDict{(user_id, cargo_id): dar?}
+        self._liberado_em = {}  # guild_id -> time.monotonic() da próxima requisição
+        self._evento = asyncio.Event()
+        self._tarefa = None
+        self.aplicadas = 0
+        self.descartadas = 0
+
+    def __len__(self):
+        return sum(len(fila) for fila in self._pendentes.values())
+
+    def dar(self, guild_id, user_id, cargo_id):
+        self._agendar(guild_id, user_id, cargo_id, True)
+
+    def tirar(self, guild_id, user_id, cargo_id):
+        self._agendar(guild_id, user_id, cargo_id, False)
+
+    def _agendar(self, guild_id, user_id, cargo_id, dar):
+        fila = self._pendentes.setdefault(guild_id, OrderedDict())
+        fila[(int(user_id), cargo_id)] = dar
+        self._evento.set()
+
+    def iniciar(self, cliente):
+        if self._tarefa is None or self._tarefa.done():
+            self._tarefa = asyncio.create_task(self._executar(cliente))
+
+    async def _executar(self, cliente):
+        while True:
+            if not self._pendentes:
+                self._evento.clear()
+                await self._evento.wait()
+                continue
+            # O servidor que pode receber uma requisição mais cedo
+            guild_id = min(self._pendentes, key=lambda g: self._liberado_em.get(g, 0))
+            espera = self._liberado_em.get(guild_id, 0) - time.monotonic()
+            if espera > 0:
+                await asyncio.sleep(espera)
+                continue
+            fila = self._pendentes[guild_id]
+            (user_id, cargo_id), dar = fila.popitem(last=False)
+            if not fila:
+                del self._pendentes[guild_id]
+            self._liberado_em[guild_id] = time.monotonic() + self.intervalo
+            await self._aplicar(cliente, guild_id, user_id, cargo_id, dar)
+
+    async def _aplicar(self, cliente, guild_id, user_id, cargo_id, dar):
+        motivo = "Sincronização de VIP"
+        try:
+            if dar:
+                await cliente.http.add_role(guild_id, user_id, cargo_id, reason=motivo)
+            else:
+                await cliente.http.remove_role(guild_id, user_id, cargo_id, reason=motivo)
+        except (discord.Forbidden, discord.NotFound) as e:
+            # Sem permissão, cargo apagado ou membro saiu: tentar de novo não adianta
+            print(f"⚠️ Cargo {cargo_id} de {user_id} em {guild_id} não sincronizado: {e}")
+            self.descartadas += 1
+        except Exception as e:
+            # 429 que o discord.py não absorveu, erro do Discord ou da conexão
+            print(f"⚠️ Sincronização de cargos em {guild_id} falhou ({e!r}); tentando de novo em {ESPERA_FALHA}s")
+            fila = self._pendentes.setdefault(guild_id, OrderedDict())
+            # Se nada mais novo foi pedido para o mesmo cargo, volta para o começo da fila
+            if (user_id, cargo_id) not in fila:
+                fila[(user_id, cargo_id)] = dar
+                fila.move_to_end((user_id, cargo_id), last=False)
+            self._liberado_em[guild_id] = time.monotonic() + ESPERA_FALHA
+        else:
+            self.aplicadas += 1
@@ -0,0 +1,142 @@
+"""Motor único de cooldowns (daily, trabalhar, roubar, anel...).
+
+Os horários continuam guardados nos registros dos usuários (`ultimo_daily`,
+`ultimo_roubo`...), então são salvos junto com o resto dos dados. Em memória
+o motor mantém um índice de expiração:
+
+- `{user_id: {acao: expira_em}}`: "o usuário X pode fazer Y?" em O(1) e todos
+  os timers pendentes de um usuário em uma consulta
+- um heap de (expira_em, user_id, acao): "quem fica livre primeiro" em
+  O(log n); entradas vencidas ou substituídas são descartadas ao passar pelo topo
+
+O fim de cada cooldown é calculado quando a ação é usada. Se a duração
+depende do registro (ex.: o tempo do trabalho atual) e esse campo muda,
+chame `recalcular` para o índice seguir o mesmo cálculo do `reconstruir`.
+"""
+import heapq
+
+DIA = 86400
+
+
+class Acao:
+    """Como calcular o fim do cooldown de uma ação.
+
+    - `campo`: campo do registro com o último uso (segundos desde a época)
+    - `duracao`: segundos, ou função (registro) -> segundos
+    - `diaria`: libera na virada do dia (UTC) em vez de após uma duração
+    """
+
+    __slots__ = ("campo", "duracao", "diaria")
+
+    def __init__(self, campo, duracao=0, diaria=False):
+        self.campo = campo
+        self.duracao = duracao
+        self.diaria = diaria
+
+    def expira(self, registro, inicio):
+        if self.diaria:
+            return (inicio // DIA + 1) * DIA
+        duracao = self.duracao(registro) if callable(self.duracao) else self.duracao
+        return inicio + duracao
+
+
+class MotorCooldowns:
+    def __init__(self, acoes):
+        self.acoes = acoes
+        self._por_usuario = {}
+        self._heap = []
+
+    def reconstruir(self, dados, agora):
+        """Monta o índice a partir dos registros carregados do disco."""
+        self._por_usuario = {}
+        self._heap = []
+        for user_id, registro in dados.items():
+            for nome, acao in self.acoes.items():
+                inicio = registro.get(acao.campo)
+                if inicio:
+                    try:
+                        expira = acao.expira(registro, inicio)
+                    except KeyError:
+                        continue  # ex.: trabalho que não existe mais
+                    if expira > agora:
+                        self._por_usuario.setdefault(user_id, {})[nome] = expira
+                        self._heap.append((expira, user_id, nome))
+        heapq.heapify(self._heap)
+
+    def restante(self, user_id, acao, agora):
+        """Segundos até `acao` ficar livre para o usuário (0 = pode usar)."""
+        expira = self._por_usuario.get(str(user_id), {}).get(acao, 0)
+        return max(0, expira - agora)
+
+    def pronto(self, user_id, acao, agora):
+        return self.restante(user_id, acao, agora) == 0
+
+    def iniciar(self, user_id, acao, registro, agora):
+        """Registra o uso agora: grava no registro e atualiza o índice."""
+        user_id = str(user_id)
+        definicao = self.acoes[acao]
+        registro[definicao.campo] = agora
+        expira = definicao.expira(registro, agora)
+        self._por_usuario.setdefault(user_id, {})[acao] = expira
+        heapq.heappush(self._heap, (expira, user_id, acao))
+        self.descartar_vencidos(agora)
+        return expira
+
+    def recalcular(self, user_id, acao, registro, agora):
+        """Refaz o fim do cooldown a partir do registro (ex.: o usuário trocou de trabalho)."""
+        user_id = str(user_id)
+        definicao = self.acoes[acao]
+        inicio = registro.get(definicao.campo)
+        expira = 0
+        if inicio:
+            try:
+                expira = definicao.expira(registro, inicio)
+            except KeyError:
+                pass  # ex.: ficou sem trabalho, igual ao reconstruir
+        timers = self._por_usuario.get(user_id)
+        if expira > agora:
+            self._por_usuario.setdefault(user_id, {})[acao] = expira
+            heapq.heappush(self._heap, (expira, user_id, acao))
+        elif timers and acao in timers:
+            # A entrada antiga no heap fica órfã e é descartada ao chegar no topo
+            del timers[acao]
+            if not timers:
+                del self._por_usuario[user_id]
+        return max(0, expira - agora)
+
+    def pendentes(self, user_id, agora):
+        """{acao: expira_em} dos cooldowns ainda ativos do usuário."""
+        timers = self._por_usuario.get(str(user_id), {})
+        return {acao: expira for acao, expira in timers.items() if expira > agora}
+
+    def proximo(self, agora):
+        """(expira_em, user_id, acao) do próximo cooldown a vencer, ou None."""
+        self.descartar_vencidos(agora)
+        while self._heap:
+            expira, user_id, acao = self._heap[0]
+            if self._por_usuario.get(user_id, {}).get(acao) == expira:
+                return self._heap[0]
+            heapq.heappop(self._heap)  # substituído por um uso mais novo ou esquecido
+        return None
+
+    def descartar_vencidos(self, agora):
+        """Tira do índice os cooldowns que já acabaram."""
+        heap = self._heap
+        while heap and heap[0][0] <= agora:
+            expira, user_id, acao = heapq.heappop(heap)
+            timers = self._por_usuario.get(user_id)
+            if timers and timers.get(acao) == expira:
+                del timers[acao]
+                if not timers:
+                    del self._por_usuario[user_id]
+
+    def esquecer(self, user_id):
+        """Remove todos os cooldowns do usuário (ex.: dados resetados)."""
+        self._por_usuario.pop(str(user_id), None)
+
+    def limpar(self):
+        self._por_usuario.clear()
+        self._heap.clear()
+
+    def __len__(self):
+        return sum(len(timers) for timers in self._por_usuario.values())
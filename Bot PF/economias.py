@@ -0,0 +1,125 @@
+"""Economias separadas por servidor, carregadas sob demanda.
+
+Cada servidor (guild) tem seus próprios usuários, armazenamento e
+GerenciadorPersistencia. Uma economia só é carregada na primeira interação
+vinda do servidor e volta para o disco depois de ficar ociosa, ou antes disso
+se o total de usuários em memória passar do limite (as menos usadas saem
+primeiro). Assim a memória acompanha os servidores ativos, e não todos os
+servidores em que o bot já esteve.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+
+from travas import TravasUsuarios
+
+# Nenhuma economia é descarregada com menos que isso de ociosidade, mesmo
+# acima do limite: um handler ainda pode estar usando os registros dela. Um
+# handler que passe disso recebe PersistenciaFechada ao marcar a alteração,
+# em vez de a gravação falhar em segundo plano e a alteração se perder
+OCIOSIDADE_MINIMA = 60
+
+
+class Economia:
+    """Usuários de um servidor e o armazenamento onde eles ficam."""
+
+    def __init__(self, chave, dados, armazenamento, persistencia, livro=None, cooldowns=None, ranking=None, agregados=None, indices=None, metricas=None):
+        self.chave = chave
+        self.dados = dados
+        self.armazenamento = armazenamento
+        self.persistencia = persistencia
+        # LivroRazao usado para movimentar dinheiro (ver transacoes)
+        self.livro = livro
+        # MotorCooldowns com o índice de expiração dos usuários desta economia
+        self.cooldowns = cooldowns
+        # RankingPatrimonio atualizado a cada usuário marcado como alterado
+        self.ranking = ranking
+        # AgregadosEconomia com os totais do /admin_economia
+        self.agregados = agregados
+        # IndicesAtributos: usuários por VIP, trabalho e item
+        self.indices = indices
+        # SerieMetricas com o histórico amostrado desta economia
+        self.metricas = metricas
+        self.travas = TravasUsuarios()
+        self.ultimo_uso = time.monotonic()
+
+    def fechar(self):
+        self.persistencia.fechar()
+        if self.metricas:
+            self.metricas.fechar()
+        if hasattr(self.armazenamento, 'fechar'):
+            self.armazenamento.fechar()
+
+
+class GerenciadorEconomias:
+    """Mantém as economias carregadas em ordem de uso (LRU).
+
+    - `abrir(chave)`: função que carrega a economia de um servidor (roda em
+      uma thread, então pode ler arquivos à vontade)
+    - `inatividade`: segundos sem uso até a economia ser descarregada
+    - `limite_usuarios`: total de usuários em memória que força descarregar
+      as economias menos usadas
+    """
+
+    def __init__(self, abrir, inatividade=1800, limite_usuarios=500_000):
+        self.abrir = abrir
+        self.inatividade = inatividade
+        self.limite_usuarios = limite_usuarios
+        self._carregadas = OrderedDict()
+        self._carregando = {}
+
+    async def obter(self, chave):
+        """Economia do servidor `chave`, carregando do disco se preciso."""
+        economia = self._carregadas.get(chave)
+        if economia is None:
+            # Interações simultâneas do mesmo servidor esperam a mesma carga
+            futuro = self._carregando.get(chave)
+            if futuro is None:
+                loop = asyncio.get_running_loop()
+                futuro = self._carregando[chave] = loop.run_in_executor(None, self.abrir, chave)
+            try:
+                economia = self._carregadas.setdefault(chave, await futuro)
+            finally:
+                self._carregando.pop(chave, None)
+        self._carregadas.move_to_end(chave)
+        economia.ultimo_uso = time.monotonic()
+        return economia
+
+    def carregadas(self):
+        return list(self._carregadas.values())
+
+    def total_usuarios(self):
+        return sum(len(economia.dados) for economia in self._carregadas.values())
+
+    async def descarregar_inativas(self):
+        """Grava e tira da memória as economias ociosas; devolve quantas saíram."""
+        agora = time.monotonic()
+        total = self.total_usuarios()
+        descarregadas = 0
+        # Do menos para o mais recentemente usado
+        for chave, economia in list(self._carregadas.items()):
+            ociosa = agora - economia.ultimo_uso
+            acima_do_limite = total > self.limite_usuarios and ociosa >= OCIOSIDADE_MINIMA
+            if ociosa < self.inatividade and not acima_do_limite:
+                continue
+            usuarios = len(economia.dados)
+            if await self._descarregar(chave, economia):
+                total -= usuarios
+                descarregadas += 1
+        return descarregadas
+
+    async def _descarregar(self, chave, economia):
+        uso = economia.ultimo_uso
+        economia.persistencia.agendar()
+        await economia.persistencia.aguardar()
+        # Voltou a ser usada (ou alterada) enquanto gravava: fica para a próxima
+        if economia.ultimo_uso != uso or economia.persistencia.pendente or len(economia.travas):
+            return False
+        self._carregadas.pop(chave, None)
+        economia.fechar()
+        return True
+
+    def gravar_todas(self):
+        """Grava o que estiver pendente em todas as economias carregadas."""
+        for economia in self._carregadas.values():
+            economia.persistencia.agendar()
@@ -0,0 +1,120 @@
+"""Índices secundários: quem tem cada VIP, cada trabalho e cada item.
+
+Consultas como "todos os VIPs" ou "quem tem o Anel Supremo" respondem em
+tempo proporcional ao resultado, sem percorrer todos os usuários. Os índices
+são montados ao carregar a economia e acompanham cada usuário marcado como
+alterado (ouvinte do GerenciadorPersistencia, como o ranking).
+
+Os conjuntos devolvidos são os do próprio índice: só leia, não altere.
+
+Listas paginadas de VIPs (`fatia_vip`) leem só os planos que caem na página;
+cada plano é ordenado por ID uma vez e reordenado só depois de mudar.
+"""
+from bisect import bisect_left
+from itertools import islice
+
+_VAZIO = frozenset()
+
+
+def _atributos(registro):
+    return registro.get("vip"), registro["trabalho"], frozenset(registro["inventario"])
+
+
+def _tirar(indice, chave, user_id):
+    usuarios = indice.get(chave)
+    if usuarios is not None:
+        usuarios.discard(user_id)
+        if not usuarios:
+            del indice[chave]
+
+
+class IndicesAtributos:
+    def __init__(self):
+        self.vip = {}       # vip -> {user_id}
+        self.trabalho = {}  # trabalho -> {user_id}
+        self.itens = {}     # item -> {user_id}
+        self._por_usuario = {}
+        self._vip_ordenado = {}  # vip -> [user_id] por ID, refeito quando o plano muda
+
+    def reconstruir(self, dados):
+        self.limpar()
+        for user_id, registro in dados.items():
+            self.atualizar(user_id, registro)
+
+    def limpar(self):
+        self.vip, self.trabalho, self.itens, self._por_usuario = {}, {}, {}, {}
+        self._vip_ordenado = {}
+
+    # ---- ouvinte do GerenciadorPersistencia ----
+
+    def atualizar(self, user_id, registro):
+        antigos = self._por_usuario.get(user_id)
+        novos = _atributos(registro) if registro is not None else None
+        if novos == antigos:
+            return
+        vip_antigo, trabalho_antigo, itens_antigos = antigos or (None, None, _VAZIO)
+        vip, trabalho, itens = novos or (None, None, _VAZIO)
+
+        if vip != vip_antigo:
+            _tirar(self.vip, vip_antigo, user_id)
+            if vip:
+                self.vip.setdefault(vip, set()).add(user_id)
+            self._vip_ordenado.pop(vip_antigo, None)
+            self._vip_ordenado.pop(vip, None)
+        if trabalho != trabalho_antigo:
+            _tirar(self.trabalho, trabalho_antigo, user_id)
+            if trabalho:
+                self.trabalho.setdefault(trabalho, set()).add(user_id)
+        for item in itens_antigos - itens:
+            _tirar(self.itens, item, user_id)
+        for item in itens - itens_antigos:
+            self.itens.setdefault(item, set()).add(user_id)
+
+        if novos is None:
+            del self._por_usuario[user_id]
+        else:
+            self._por_usuario[user_id] = novos
+
+    # ---- consultas ----
+
+    def com_vip(self, vip):
+        return self.vip.get(vip, _VAZIO)
+
+    def com_trabalho(self, trabalho):
+        return self.trabalho.get(trabalho, _VAZIO)
+
+    def com_item(self, item):
+        return self.itens.get(item, _VAZIO)
+
+    def _ordenados(self, vip):
+        ordenados = self._vip_ordenado.get(vip)
+        if ordenados is None:
+            ordenados = self._vip_ordenado[vip] = sorted(self.com_vip(vip), key=int)
+        return ordenados
+
+    def total_vip(self, vips):
+        """Quantos usuários têm algum dos planos `vips`."""
+        return sum(len(self.com_vip(vip)) for vip in vips)
+
+    def fatia_vip(self, vips, inicio, quantidade):
+        """[(user_id, vip)] da posição `inicio` em diante, com os planos na ordem de `vips`."""
+        fatia = []
+        for vip in vips:
+            tamanho = len(self.com_vip(vip))
+            if inicio >= tamanho:
+                inicio -= tamanho
+                continue
+            fatia += ((user_id, vip) for user_id in islice(self._ordenados(vip), inicio, inicio + quantidade - len(fatia)))
+            inicio = 0
+            if len(fatia) >= quantidade:
+                break
+        return fatia
+
+    def posicao_vip(self, vips, user_id):
+        """Posição do usuário na lista de `fatia_vip` (None se não tem um desses planos)."""
+        atributos = self._por_usuario.get(user_id)
+        if atributos is None or atributos[0] not in vips:
+            return None
+        vip = atributos[0]
+        anteriores = self.total_vip(vips[:vips.index(vip)])
+        return anteriores + bisect_left(self._ordenados(vip), int(user_id), key=int)
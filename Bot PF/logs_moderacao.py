@@ -0,0 +1,94 @@
+"""Fila dos logs de moderação (Anel Supremo e comandos de admin).
+
+Os comandos só chamam `registrar(embed)`, que não espera nada: o envio sai
+do tempo de resposta do comando. O loop `enviar_logs` do main.py chama
+`enviar` a cada poucos segundos, que junta até 10 embeds por mensagem (o
+máximo do Discord, respeitando também os 6000 caracteres por mensagem).
+
+O canal é resolvido uma vez (`get_channel`, depois `fetch_channel`) e
+guardado. Se o Discord recusar o envio por limite de taxa ou erro do
+servidor, o lote volta para o começo da fila e sai na próxima rodada; se o
+canal sumiu ou o bot perdeu a permissão, o lote é descartado e o canal é
+resolvido de novo depois de `ESPERA_CANAL` segundos.
+
+A fila tem tamanho máximo: com o canal fora do ar, os logs mais antigos são
+descartados primeiro (e contados em `descartados`).
+"""
+import time
+from collections import deque
+
+import discord
+
+EMBEDS_POR_MENSAGEM = 10
+CARACTERES_POR_MENSAGEM = 6000
+ESPERA_CANAL = 60  # segundos até tentar resolver de novo um canal que falhou
+
+
+class FilaLogs:
+    def __init__(self, canal_id, limite=1000):
+        self.canal_id = canal_id
+        self._fila = deque()
+        self.limite = limite
+        self._canal = None
+        self._tentar_canal_em = 0
+        self.enviadas = 0  # mensagens enviadas
+        self.descartados = 0  # embeds que não chegaram ao canal
+
+    def __len__(self):
+        return len(self._fila)
+
+    def registrar(self, embed: discord.Embed):
+        if len(self._fila) >= self.limite:
+            self._fila.popleft()
+            self.descartados += 1
+        self._fila.append(embed)
+
+    async def _resolver_canal(self, cliente):
+        if self._canal is not None:
+            return self._canal
+        if time.monotonic() < self._tentar_canal_em:
+            return None
+        canal = cliente.get_channel(self.canal_id)
+        if canal is None:
+            try:
+                canal = await cliente.fetch_channel(self.canal_id)
+            except discord.HTTPException as e:
+                print(f"⚠️ Canal de logs {self.canal_id} indisponível: {e}")
+                self._tentar_canal_em = time.monotonic() + ESPERA_CANAL
+                return None
+        self._canal = canal
+        return canal
+
+    def _proximo_lote(self):
+        lote = []
+        caracteres = 0
+        while self._fila and len(lote) < EMBEDS_POR_MENSAGEM:
+            tamanho = len(self._fila[0])
+            if lote and caracteres + tamanho > CARACTERES_POR_MENSAGEM:
+                break
+            lote.append(self._fila.popleft())
+            caracteres += tamanho
+        return lote
+
+    async def enviar(self, cliente):
+        """Envia tudo o que estiver na fila, em lotes. Para na primeira falha."""
+        while self._fila:
+            canal = await self._resolver_canal(cliente)
+            if canal is None:
+                return
+            lote = self._proximo_lote()
+            try:
+                await canal.send(embeds=lote)
+            except (discord.Forbidden, discord.NotFound) as e:
+                # Sem permissão ou canal apagado: tentar de novo não adianta
+                print(f"⚠️ Não foi possível enviar {len(lote)} logs ao canal {self.canal_id}: {e}")
+                self.descartados += len(lote)
+                self._canal = None
+                self._tentar_canal_em = time.monotonic() + ESPERA_CANAL
+                return
+            except discord.HTTPException as e:
+                # Limite de taxa (o discord.py já esperou e desistiu) ou erro do servidor
+                print(f"⚠️ Envio de logs falhou ({e.status}); {len(lote)} embeds voltam para a fila")
+                self._fila.extendleft(reversed(lote))
+                return
+            self.enviadas += 1
@@ -1,7 +1,10 @@
 import discord
 from discord.ext import commands, tasks
-from discord import Embed, Interaction, app_commands
-import json
+from discord import app_commands
+import asyncio
+import atexit
+import contextvars
+import os
 
 try:
     from dotenv import load_dotenv
@@ -28,19 +31,44 @@ try:
 except Exception:
     # python-dotenv is optional; if not installed, environment variables must be set externally
     pass
-from datetime import datetime, timedelta
+from datetime import datetime
 import random
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+from persistencia import ArmazenamentoJSON, ArmazenamentoJournal, GerenciadorPersistencia
+from armazenamento_sqlite import ArmazenamentoSQLite
+from armazenamento_shards import ArmazenamentoShards
+from registro_usuario import RegistroSomenteLeitura, RegistroUsuario, configurar_catalogos
+from economias import Economia, GerenciadorEconomias
+from cooldowns import DIA, Acao, MotorCooldowns
+from adiamento import AdiamentoAutomatico
+from ranking import RankingPatrimonio
+from agregados import AgregadosEconomia
+from indices import IndicesAtributos
+from metricas import SerieMetricas
+from cache_render import CacheRender
+from nomes_membros import CacheNomesMembros
+from logs_moderacao import FilaLogs
+from cargos_vip import ConfiguracaoCargos, SincronizadorCargos
+from sincronizacao_comandos import sincronizar_se_mudou
+from transacoes import MULTAS, LivroRazao, SaldoInsuficiente, Transacao
 
 # Single bot instance with proper intents
 intents = discord.Intents.default()
 intents.message_content = True
 intents.members = True
 
-bot = commands.Bot(command_prefix="!", intents=intents)
-import os
+class ArvoreComandos(app_commands.CommandTree):
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.type is discord.InteractionType.application_command:
+            adiamento.iniciar(interaction)
+        # Todo comando roda sobre a economia do servidor de onde veio
+        await selecionar_economia(interaction)
+        return True
 
-TOKEN = os.getenv('TOKEN')  # Pega do Railway
-bot.run(TOKEN)
+bot = commands.Bot(command_prefix="!", intents=intents, tree_cls=ArvoreComandos)
 
 # ============ COMANDOS ADMINISTRATIVOS ============
 @bot.tree.command(name="admin_remover_item", description="👑 [ADMIN] Remover um item de um usuário")
@@ -50,74 +78,90 @@ async def admin_remover_item(interaction: discord.Interaction, usuario: discord.
     item = item.lower().replace(" ", "_")
     
     if item not in user_data["inventario"]:
-        await interaction.response.send_message(f"{EMOJIS['erro']} {usuario.display_name} não possui este item!", ephemeral=True)
+        await responder(interaction, f"{EMOJIS['erro']} {usuario.display_name} não possui este item!", ephemeral=True)
         return
     
     del user_data["inventario"][item]
-    save_data(data)
+    marcar_alterado(usuario.id)
     
     embed = discord.Embed(
         title=f"{EMOJIS['sucesso']} Item Removido",
         description=f"**{item.replace('_', ' ').title()}** foi removido de {usuario.display_name}",
         color=discord.Color.red()
     )
-    await interaction.response.send_message(embed=embed)
+    await responder(interaction, embed=embed)
+    registrar_log(
+        interaction,
+        "Admin — Remover Item",
+        f"`{item}` removido de {usuario.mention}",
+        discord.Color.red(),
+        ("Alvo", usuario.mention)
+    )
 
 @bot.tree.command(name="admin_reset", description="👑 [ADMIN] Resetar dados de um usuário")
 @app_commands.checks.has_permissions(administrator=True)
 async def admin_reset(interaction: discord.Interaction, usuario: discord.Member):
-    if str(usuario.id) in data:
-        del data[str(usuario.id)]
-        save_data(data)
+    atual = economia()
+    if str(usuario.id) in atual.dados:
+        del atual.dados[str(usuario.id)]
+        atual.persistencia.remover(usuario.id)
+        atual.cooldowns.esquecer(usuario.id)
     
     embed = discord.Embed(
         title=f"{EMOJIS['sucesso']} Dados Resetados",
         description=f"Os dados de {usuario.display_name} foram resetados!",
         color=discord.Color.red()
     )
-    await interaction.response.send_message(embed=embed)
+    await responder(interaction, embed=embed)
+    registrar_log(
+        interaction,
+        "Admin — Reset",
+        f"Dados de {usuario.mention} resetados",
+        discord.Color.red(),
+        ("Alvo", usuario.mention)
+    )
 
 @bot.tree.command(name="admin_set_nivel", description="👑 [ADMIN] Definir nível de um usuário")
 @app_commands.checks.has_permissions(administrator=True)
 async def admin_set_nivel(interaction: discord.Interaction, usuario: discord.Member, nivel: int):
     user_data = get_user_data(usuario.id)
     user_data["nivel"] = max(1, nivel)
-    save_data(data)
+    marcar_alterado(usuario.id)
     
     embed = discord.Embed(
         title=f"{EMOJIS['estrela']} Nível Alterado",
         description=f"{usuario.display_name} agora é **Nível {nivel}**!",
         color=discord.Color.blue()
     )
-    await interaction.response.send_message(embed=embed)
+    await responder(interaction, embed=embed)
 
 @bot.tree.command(name="admin_set_xp", description="👑 [ADMIN] Definir XP de um usuário")
 @app_commands.checks.has_permissions(administrator=True)
 async def admin_set_xp(interaction: discord.Interaction, usuario: discord.Member, xp: int):
     user_data = get_user_data(usuario.id)
     user_data["xp"] = max(0, xp)
-    save_data(data)
+    marcar_alterado(usuario.id)
     
     embed = discord.Embed(
         title=f"{EMOJIS['estrela']} XP Alterado",
         description=f"{usuario.display_name} agora tem **{xp} XP**!",
         color=discord.Color.blue()
     )
-    await interaction.response.send_message(embed=embed)
+    await responder(interaction, embed=embed)
 
 @bot.tree.command(name="admin_set_reputacao", description="👑 [ADMIN] Definir reputação de um usuário")
 @app_commands.checks.has_permissions(administrator=True)
 async def admin_set_reputacao(interaction: discord.Interaction, usuario: discord.Member, reputacao: int):
     user_data = get_user_data(usuario.id)
     user_data["reputacao"] = reputacao
-    save_data(data)
+    marcar_alterado(usuario.id)
     
     embed = discord.Embed(
         title=f"{EMOJIS['diamante']} Reputação Alterada",
         description=f"{usuario.display_name} agora tem **{reputacao}** de reputação!",
         color=discord.Color.purple()
     )
-    await interaction.response.send_message(embed=embed)
+    await responder(interaction, embed=embed)
 
 @bot.tree.command(name="admin_set_trabalho", description="👑 [ADMIN] Definir trabalho de um usuário")
 @app_commands.checks.has_permissions(administrator=True)
@@ -126,28 +170,31 @@ async def admin_set_trabalho(interaction: discord.Interaction, usuario: discord.
     trabalho = trabalho.lower()
     
     if trabalho not in TRABALHOS and trabalho != "nenhum":
-        await interaction.response.send_message(f"{EMOJIS['erro']} Trabalho não encontrado! Use: {', '.join(TRABALHOS.keys())}", ephemeral=True)
+        await responder(interaction, f"{EMOJIS['erro']} Trabalho não encontrado! Use: {', '.join(TRABALHOS.keys())}", ephemeral=True)
         return
     
     user_data["trabalho"] = None if trabalho == "nenhum" else trabalho
-    save_data(data)
+    # O cooldown de /trabalhar depende do tempo do trabalho atual
+    economia().cooldowns.recalcular(usuario.id, "trabalhar", user_data, int(time.time()))
+    marcar_alterado(usuario.id)
     
     embed = discord.Embed(
         title=f"{EMOJIS['trabalho']} Trabalho Alterado",
         description=f"{usuario.display_name} agora trabalha como **{trabalho.title() if trabalho != 'nenhum' else 'Desempregado'}**!",
         color=discord.Color.blue()
     )
-    await interaction.response.send_message(embed=embed)
+    await responder(interaction, embed=embed)
 
 @bot.tree.command(name="admin_economia", description="👑 [ADMIN] Ver estatísticas gerais da economia")
 @app_commands.checks.has_permissions(administrator=True)
 async def admin_economia(interaction: discord.Interaction):
-    total_usuarios = len(data)
-    dinheiro_circulacao = sum(u["carteira"] + u["banco"] for u in data.values())
-    media_patrimonio = dinheiro_circulacao // total_usuarios if total_usuarios > 0 else 0
+    agregados = economia().agregados
+    total_usuarios = agregados.usuarios
+    dinheiro_circulacao = agregados.circulacao
+    media_patrimonio = agregados.media
     
-    aneis_supremos = sum(1 for u in data.values() if "anel_supremo" in u["inventario"])
-    vips_ativos = sum(1 for u in data.values() if u.get("vip"))
+    aneis_supremos = agregados.aneis
+    vips_ativos = agregados.vips
     
     embed = discord.Embed(
         title=f"{EMOJIS['grafico']} Estatísticas da Economia",
@@ -159,12 +206,109 @@ async def admin_economia(interaction: discord.Interaction):
     embed.add_field(name="💍 Portadores do Anel Supremo", value=f"**{aneis_supremos}**", inline=True)
     embed.add_field(name="🌟 VIPs Ativos", value=f"**{vips_ativos}**", inline=True)
     
-    await interaction.response.send_message(embed=embed)
+    if agregados.ultima_auditoria:
+        situacao = "⚠️ divergência corrigida" if agregados.ultima_divergencia else "✅ sem divergências"
+        embed.add_field(name="🔍 Última Auditoria", value=f"<t:{int(agregados.ultima_auditoria)}:R> — {situacao}", inline=False)
+    
+    await responder(interaction, embed=embed)
+
+PERIODOS_HISTORICO = {"24h": 86400, "7d": 7 * 86400, "30d": 30 * 86400}
+BLOCOS_GRAFICO = "▁▂▃▄▅▆▇█"
+
+def grafico_texto(valores, largura=24):
+    """Minigráfico (▁▂▃...) com no máximo `largura` colunas (médias de cada trecho)."""
+    if len(valores) > largura:
+        passo = len(valores) / largura
+        valores = [
+            sum(trecho) / len(trecho)
+            for trecho in (valores[int(i * passo):int((i + 1) * passo)] for i in range(largura))
+        ]
+    menor, maior = min(valores), max(valores)
+    if maior == menor:
+        return BLOCOS_GRAFICO[0] * len(valores)
+    return "".join(BLOCOS_GRAFICO[int((v - menor) / (maior - menor) * (len(BLOCOS_GRAFICO) - 1))] for v in valores)
+
+@bot.tree.command(name="admin_economia_historico", description="👑 [ADMIN] Ver a evolução da economia (24h, 7d ou 30d)")
+@app_commands.checks.has_permissions(administrator=True)
+async def admin_economia_historico(interaction: discord.Interaction, periodo: str = "24h"):
+    periodo = periodo.lower()
+    
+    if periodo not in PERIODOS_HISTORICO:
+        await responder(
+            interaction,
+            f"{EMOJIS['erro']} Período inválido! Disponíveis: {', '.join(PERIODOS_HISTORICO)}",
+            ephemeral=True
+        )
+        return
+    
+    serie = economia().metricas.serie(PERIODOS_HISTORICO[periodo], time.time())
+    
+    embed = discord.Embed(
+        title=f"{EMOJIS['grafico']} Histórico da Economia — {periodo}",
+        color=discord.Color.purple()
+    )
+    
+    if len(serie) < 2:
+        embed.description = f"Ainda não há amostras suficientes. Uma amostra é coletada a cada {INTERVALO_METRICAS} minutos."
+        await responder(interaction, embed=embed)
+        return
+    
+    linhas = {
+        "💰 Dinheiro em Circulação": [v["carteiras"] + v["bancos"] for _, v in serie],
+        "👛 Em Carteiras": [v["carteiras"] for _, v in serie],
+        "🏦 Em Bancos": [v["bancos"] for _, v in serie],
+        "🔥 Usuários Ativos (por amostra)": [v["ativos"] for _, v in serie],
+        "🌟 VIPs Ativos": [v["vips"] for _, v in serie],
+        "👥 Total de Usuários": [v["usuarios"] for _, v in serie],
+    }
+    
+    for nome, valores in linhas.items():
+        inicio, fim = valores[0], valores[-1]
+        variacao = f"{(fim - inicio) / inicio:+.1%}" if inicio else "—"
+        embed.add_field(
+            name=nome,
+            value=f"`{grafico_texto(valores)}`\n{inicio:,} → **{fim:,}** ({variacao})\nMín {min(valores):,} • Máx {max(valores):,}",
+            inline=False
+        )
+    
+    embed.description = f"Desde <t:{serie[0][0]}:f> ({len(serie)} pontos)"
+    await responder(interaction, embed=embed)
+
+@bot.tree.command(name="admin_adiamentos", description="👑 [ADMIN] Ver quais comandos passam do tempo de resposta", extras={"efemero": True})
+@app_commands.checks.has_permissions(administrator=True)
+async def admin_adiamentos(interaction: discord.Interaction):
+    estatisticas = sorted(
+        adiamento.estatisticas.items(),
+        key=lambda x: (x[1].adiados, x[1].tempo_maximo),
+        reverse=True
+    )
+    
+    embed = discord.Embed(
+        title="⏳ Adiamento de Respostas",
+        description=f"Comandos que não respondem em **{adiamento.orcamento:.1f}s** são adiados e respondem pelo followup.\n",
+        color=discord.Color.blue()
+    )
+    
+    for nome, estatistica in estatisticas[:25]:
+        embed.add_field(
+            name=f"/{nome}",
+            value=(
+                f"**Adiados:** {estatistica.adiados}/{estatistica.execucoes} ({estatistica.taxa:.0%})\n"
+                f"**Tempo médio:** {estatistica.tempo_medio:.2f}s\n"
+                f"**Tempo máximo:** {estatistica.tempo_maximo:.2f}s"
+            ),
+            inline=True
+        )
+    
+    if not estatisticas:
+        embed.description += "\nNenhum comando executado desde que o bot iniciou."
+    
+    await responder(interaction, embed=embed, ephemeral=True)
 
 @bot.tree.command(name="admin_ver_inventario", description="👑 [ADMIN] Ver inventário de um usuário")
 @app_commands.checks.has_permissions(administrator=True)
 async def admin_ver_inventario(interaction: discord.Interaction, usuario: discord.Member):
-    user_data = get_user_data(usuario.id)
+    user_data = ver_user_data(usuario.id)
     
     embed = discord.Embed(
         title=f"🔍 Inventário de {usuario.display_name}",
@@ -188,9 +332,9 @@ async def admin_ver_inventario(interaction: discord.Interaction, usuario: discor
     embed.add_field(name="🏦 Banco", value=f"R$ {user_data['banco']:,}", inline=True)
     embed.add_field(name="⭐ Nível", value=f"{user_data['nivel']}", inline=True)
     
-    await interaction.response.send_message(embed=embed)
+    await responder(interaction, embed=embed)
 
-@bot.tree.command(name="admin_listar_itens", description="👑 [ADMIN] Ver todos os itens disponíveis")
+@bot.tree.command(name="admin_listar_itens", description="👑 [ADMIN] Ver todos os itens disponíveis", extras={"efemero": True})
 @app_commands.checks.has_permissions(administrator=True)
 async def admin_listar_itens(interaction: discord.Interaction):
     embed = discord.Embed(
@@ -199,23 +343,23 @@ async def admin_listar_itens(interaction: discord.Interaction):
         color=discord.Color.gold()
     )
     
+    indices = economia().indices
+    linhas_loja, linhas_mercado = renders.obter("linhas_itens", montar_linhas_itens)
+    
     loja_texto = ""
-    for item, info in LOJA.items():
-        loja_texto += f"{info['emoji']} `{item}`"
-        if info.get("secreto"):
-            loja_texto += " ⚠️ **SECRETO**"
-        loja_texto += f"\n"
+    for item, inicio, fim in linhas_loja:
+        loja_texto += f"{inicio} ({len(indices.com_item(item))} 👥){fim}\n"
     
     embed.add_field(name="🛍️ Loja Comum", value=loja_texto, inline=False)
     
     mercado_texto = ""
-    for item, info in MERCADO_NEGRO.items():
-        mercado_texto += f"{info['emoji']} `{item}`\n"
+    for item, inicio, fim in linhas_mercado:
+        mercado_texto += f"{inicio} ({len(indices.com_item(item))} 👥){fim}\n"
     
     embed.add_field(name="🎭 Mercado Negro", value=mercado_texto, inline=False)
     
     embed.set_footer(text="Use: /admin_dar_item <usuario> <nome_do_item>")
-    await interaction.response.send_message(embed=embed, ephemeral=True)
+    await responder(interaction, embed=embed, ephemeral=True)
 
 @bot.tree.command(name="admin_limpar_economia", description="👑 [ADMIN] ⚠️ RESETAR TODA A ECONOMIA")
 @app_commands.checks.has_permissions(administrator=True)
@@ -223,104 +367,63 @@ async def admin_limpar_economia(interaction: discord.Interaction, confirmacao: s
     if confirmacao != "CONFIRMAR":
         embed = discord.Embed(
             title=f"{EMOJIS['alerta']} Confirmação Necessária",
-            description="Este comando irá **DELETAR TODOS OS DADOS** da economia!\n\nPara confirmar, use:\n`/admin_limpar_economia confirmacao:CONFIRMAR`",
+            description="Este comando irá **DELETAR TODOS OS DADOS** da economia deste servidor!\n\nPara confirmar, use:\n`/admin_limpar_economia confirmacao:CONFIRMAR`",
             color=discord.Color.red()
         )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await responder(interaction, embed=embed, ephemeral=True)
         return
     
-    data.clear()
-    save_data(data)
+    economia().persistencia.limpar()
+    economia().cooldowns.limpar()
     
     embed = discord.Embed(
         title=f"{EMOJIS['sucesso']} Economia Resetada",
-        description="**TODOS** os dados da economia foram deletados!",
+        description="**TODOS** os dados da economia deste servidor foram deletados!",
         color=discord.Color.dark_red()
     )
-    await interaction.response.send_message(embed=embed)
+    await responder(interaction, embed=embed)
+    registrar_log(
+        interaction,
+        "Admin — Limpar Economia",
+        "**Toda a economia do servidor foi apagada**",
+        discord.Color.dark_red()
+    )
 
 @bot.tree.command(name="admin_dar_dinheiro_todos", description="👑 [ADMIN] Dar dinheiro para todos do servidor")
 @app_commands.checks.has_permissions(administrator=True)
 async def admin_dar_dinheiro_todos(interaction: discord.Interaction, quantia: int):
+    if quantia <= 0:
+        await responder(interaction, f"{EMOJIS['erro']} Quantia inválida!", ephemeral=True)
+        return
+    
+    # Uma única transação (e um único lote de gravação) para o servidor todo
+    transacao = Transacao()
     contador = 0
     for member in interaction.guild.members:
         if not member.bot:
-            user_data = get_user_data(member.id)
-            user_data["carteira"] += quantia
+            transacao.emitir(member.id, quantia)
             contador += 1
     
-    save_data(data)
+    aplicar_transacao(transacao)
     
     embed = discord.Embed(
         title=f"{EMOJIS['presente']} Dinheiro Distribuído!",
         description=f"**R$ {quantia:,}** foram dados para **{contador} usuários**!",
         color=discord.Color.green()
     )
-    await interaction.response.send_message(embed=embed)
+    await responder(interaction, embed=embed)
+    registrar_log(
+        interaction,
+        "Admin — Dinheiro para Todos",
+        f"R$ {quantia:,} para {contador} usuários",
+        discord.Color.green(),
+        ("Total Emitido", f"R$ {quantia * contador:,}")
+    )
 
-@bot.tree.command(name="admin_ajuda", description="👑 [ADMIN] Ver todos os comandos administrativos")
+@bot.tree.command(name="admin_ajuda", description="👑 [ADMIN] Ver todos os comandos administrativos", extras={"efemero": True})
 @app_commands.checks.has_permissions(administrator=True)
 async def admin_ajuda(interaction: discord.Interaction):
-    embed = discord.Embed(
-        title="👑 Comandos Administrativos",
-        description="Lista completa de comandos para administradores:\n",
-        color=discord.Color.gold()
-    )
-    
-    embed.add_field(
-        name="💰 Economia",
-        value=(
-            "`/admin_add` - Adicionar dinheiro\n"
-            "`/admin_remove` - Remover dinheiro\n"
-            "`/admin_dar_dinheiro_todos` - Dar dinheiro a todos\n"
-            "`/admin_economia` - Ver estatísticas"
-        ),
-        inline=False
-    )
-    
-    embed.add_field(
-        name="🎒 Itens",
-        value=(
-            "`/admin_dar_item` - Dar item\n"
-            "`/admin_remover_item` - Remover item\n"
-            "`/admin_listar_itens` - Listar todos os itens\n"
-            "`/admin_ver_inventario` - Ver inventário de alguém"
-        ),
-        inline=False
-    )
-    
-    embed.add_field(
-        name="👤 Perfil",
-        value=(
-            "`/admin_set_nivel` - Definir nível\n"
-            "`/admin_set_xp` - Definir XP\n"
-            "`/admin_set_reputacao` - Definir reputação\n"
-            "`/admin_set_trabalho` - Definir trabalho\n"
-            "`/admin_reset` - Resetar dados"
-        ),
-        inline=False
-    )
-    
-    embed.add_field(
-        name="🌟 VIP",
-        value=(
-            "`/admin_dar_vip` - Dar VIP a alguém\n"
-            "`/admin_remover_vip` - Remover VIP\n"
-            "`/admin_listar_vips` - Ver todos os VIPs\n"
-            "`/admin_configurar_cargo_vip` - Configurar cargo VIP\n"
-            "`/admin_painel_vip` - Criar painel público de VIP"
-        ),
-        inline=False
-    )
-    
-    embed.add_field(
-        name="⚠️ Perigoso",
-        value="`/admin_limpar_economia` - Resetar TUDO (requer confirmação)",
-        inline=False
-    )
-    
-    embed.set_footer(text="⚡ Use com responsabilidade!")
-    await interaction.response.send_message(embed=embed, ephemeral=True)
+    await responder(interaction, embed=renders.obter("admin_ajuda", montar_embed_admin_ajuda), ephemeral=True)
 
 # ============ TRATAMENTO DE ERROS ============
 
@@ -333,18 +436,16 @@ async def on_app_command_error(interaction: discord.Interaction, error: app_comm
             color=discord.Color.red()
         )
         try:
-            if not interaction.response.is_done():
-                await interaction.response.send_message(embed=embed, ephemeral=True)
-            else:
-                await interaction.followup.send(embed=embed, ephemeral=True)
+            await responder(interaction, embed=embed, ephemeral=True)
         except Exception as e:
             print(f"Erro ao enviar mensagem de erro: {e}")
     else:
         print(f"Erro no comando: {error}")
+    adiamento.terminar(interaction)
 
 # ============ INICIAR BOT ============
 
-# O token deve ser fornecido via variável de ambiente BOT_TOKEN para segurança.
+# O token deve ser fornecido via variável de ambiente BOT_TOKEN (ou TOKEN, no Railway) para segurança.
 
 """
 ===========================================
@@ -404,53 +505,53 @@ Exemplo:
 
 @bot.tree.command(name="roubar", description="🎭 Tente roubar dinheiro de alguém (arriscado!)")
 async def roubar(interaction: discord.Interaction, vitima: discord.Member):
-    user_data = get_user_data(interaction.user.id)
-    vitima_data = get_user_data(vitima.id)
-    
-    if vitima.id == interaction.user.id:
-        await interaction.response.send_message(f"{EMOJIS['erro']} Você não pode roubar a si mesmo!", ephemeral=True)
-        return
-    
-    if user_data["ultimo_roubo"]:
-        ultimo = datetime.fromisoformat(user_data["ultimo_roubo"])
-        if datetime.now() - ultimo < timedelta(hours=2):
-            tempo_restante = timedelta(hours=2) - (datetime.now() - ultimo)
-            horas = tempo_restante.seconds // 3600
-            minutos = (tempo_restante.seconds % 3600) // 60
-            await interaction.response.send_message(f"{EMOJIS['alerta']} Aguarde {horas}h {minutos}min para roubar novamente!", ephemeral=True)
+    async with travar_usuarios(interaction.user.id, vitima.id):
+        user_data = get_user_data(interaction.user.id)
+        vitima_data = get_user_data(vitima.id)
+        
+        if vitima.id == interaction.user.id:
+            await responder(interaction, f"{EMOJIS['erro']} Você não pode roubar a si mesmo!", ephemeral=True)
             return
-    
-    if vitima_data["carteira"] < 100:
-        await interaction.response.send_message(f"{EMOJIS['erro']} {vitima.display_name} não tem dinheiro suficiente na carteira!", ephemeral=True)
-        return
-    
-    sucesso = random.random() > 0.5
-    
-    if sucesso:
-        quantia = random.randint(50, min(vitima_data["carteira"], 1000))
-        vitima_data["carteira"] -= quantia
-        user_data["carteira"] += quantia
-        user_data["reputacao"] -= 5
         
-        embed = discord.Embed(
-            title=f"{EMOJIS['roubou']} Roubo Bem-Sucedido!",
-            description=f"Você conseguiu roubar **R$ {quantia:,}** de {vitima.display_name}!\n\n⚠️ Sua reputação diminuiu.",
-            color=discord.Color.green()
-        )
-    else:
-        multa = random.randint(200, 500)
-        user_data["carteira"] -= min(multa, user_data["carteira"])
-        user_data["reputacao"] -= 10
+        agora = int(time.time())
+        tempo_restante = economia().cooldowns.restante(interaction.user.id, "roubar", agora)
+        if tempo_restante:
+            horas = tempo_restante // 3600
+            minutos = (tempo_restante % 3600) // 60
+            await responder(interaction, f"{EMOJIS['alerta']} Aguarde {horas}h {minutos}min para roubar novamente!", ephemeral=True)
+            return
         
-        embed = discord.Embed(
-            title=f"{EMOJIS['alerta']} Você foi Pego!",
-            description=f"Sua tentativa de roubo falhou!\n\n**Multa:** R$ {multa:,}\n⚠️ Sua reputação diminuiu significativamente.",
-            color=discord.Color.red()
-        )
-    
-    user_data["ultimo_roubo"] = datetime.now().isoformat()
-    save_data(data)
-    await interaction.response.send_message(embed=embed)
+        if vitima_data["carteira"] < 100:
+            await responder(interaction, f"{EMOJIS['erro']} {vitima.display_name} não tem dinheiro suficiente na carteira!", ephemeral=True)
+            return
+        
+        sucesso = random.random() > 0.5
+        
+        if sucesso:
+            quantia = random.randint(50, min(vitima_data["carteira"], 1000))
+            transacao = Transacao().transferir(vitima.id, interaction.user.id, quantia)
+            user_data["reputacao"] -= 5
+            
+            embed = discord.Embed(
+                title=f"{EMOJIS['roubou']} Roubo Bem-Sucedido!",
+                description=f"Você conseguiu roubar **R$ {quantia:,}** de {vitima.display_name}!\n\n⚠️ Sua reputação diminuiu.",
+                color=discord.Color.green()
+            )
+        else:
+            multa = random.randint(200, 500)
+            transacao = Transacao().recolher(interaction.user.id, min(multa, user_data["carteira"]), conta=MULTAS)
+            user_data["reputacao"] -= 10
+            
+            embed = discord.Embed(
+                title=f"{EMOJIS['alerta']} Você foi Pego!",
+                description=f"Sua tentativa de roubo falhou!\n\n**Multa:** R$ {multa:,}\n⚠️ Sua reputação diminuiu significativamente.",
+                color=discord.Color.red()
+            )
+        
+        economia().cooldowns.iniciar(interaction.user.id, "roubar", user_data, agora)
+        aplicar_transacao(transacao)
+        marcar_alterado(interaction.user.id, vitima.id)
+        await responder(interaction, embed=embed)
 
 
 # ============ ANEL SUPREMO ============
@@ -463,28 +564,28 @@ async def anel_criar(interaction: discord.Interaction, quantia: int):
 
     # Verifica se o usuário possui o anel
     if "anel_supremo" not in user_data.get("inventario", {}):
-        await interaction.response.send_message(f"{EMOJIS['erro']} Você não possui o Anel Supremo!", ephemeral=True)
+        await responder(interaction, f"{EMOJIS['erro']} Você não possui o Anel Supremo!", ephemeral=True)
         return
 
     # Checa cooldown diário (um uso por subcomando)
-    hoje = datetime.now().date().isoformat()
-    if user_data.get("anel_ultimo_uso_criar") == hoje:
-        await interaction.response.send_message(f"{EMOJIS['alerta']} Você já usou /anel criar hoje. Tente novamente amanhã.", ephemeral=True)
+    agora = int(time.time())
+    if not economia().cooldowns.pronto(interaction.user.id, "anel_criar", agora):
+        await responder(interaction, f"{EMOJIS['alerta']} Você já usou /anel criar hoje. Tente novamente amanhã.", ephemeral=True)
         return
 
     if quantia <= 0:
-        await interaction.response.send_message(f"{EMOJIS['erro']} Quantia inválida!", ephemeral=True)
+        await responder(interaction, f"{EMOJIS['erro']} Quantia inválida!", ephemeral=True)
         return
 
     MAX_DIARIO = 500_000
     if quantia > MAX_DIARIO:
-        await interaction.response.send_message(f"{EMOJIS['erro']} Quantia excede o limite diário de R$ {MAX_DIARIO:,}.", ephemeral=True)
+        await responder(interaction, f"{EMOJIS['erro']} Quantia excede o limite diário de R$ {MAX_DIARIO:,}.", ephemeral=True)
         return
 
     # Aplica criação do dinheiro
-    user_data["carteira"] += quantia
-    user_data["anel_ultimo_uso_criar"] = hoje
-    save_data(data)
+    aplicar_transacao(Transacao().emitir(interaction.user.id, quantia))
+    economia().cooldowns.iniciar(interaction.user.id, "anel_criar", user_data, agora)
+    marcar_alterado(interaction.user.id)
 
     embed = discord.Embed(
         title=f"{EMOJIS['foguete']} Poder Liberado!",
@@ -497,59 +598,47 @@ async def anel_criar(interaction: discord.Interaction, quantia: int):
     embed.add_field(name="Quantia Criada", value=f"R$ {quantia:,}", inline=True)
     embed.add_field(name="Limite Diário", value=f"R$ {MAX_DIARIO:,}", inline=True)
     embed.set_footer(text="Poder do Anel — use com responsabilidade")
-    await interaction.response.send_message(embed=embed)
-
-    # Log em canal de moderação (se configurado)
-    try:
-        log_channel = bot.get_channel(1398712093238235237)
-        if not log_channel:
-            try:
-                log_channel = await bot.fetch_channel(1398712093238235237)
-            except Exception:
-                log_channel = None
-
-        if log_channel:
-            log_embed = discord.Embed(
-                title="Anel Supremo — Criar",
-                description=f"{interaction.user.mention} usou `/anel criar {quantia}`",
-                color=discord.Color.gold(),
-                timestamp=datetime.now()
-            )
-            log_embed.add_field(name="Executor", value=interaction.user.mention, inline=True)
-            log_embed.add_field(name="Quantia", value=f"R$ {quantia:,}", inline=True)
-            log_embed.add_field(name="Servidor", value=interaction.guild.name if interaction.guild else "Direto/DM", inline=False)
-            await log_channel.send(embed=log_embed)
-    except Exception as e:
-        print(f"Erro ao enviar log do Anel (criar): {e}")
+    await responder(interaction, embed=embed)
+
+    registrar_log(
+        interaction,
+        "Anel Supremo — Criar",
+        f"{interaction.user.mention} usou `/anel criar {quantia}`",
+        discord.Color.gold(),
+        ("Quantia", f"R$ {quantia:,}")
+    )
 
 
 @anel.command(name="punir", description="⚔️ Punir um usuário — remove todo o dinheiro e itens (Anel Supremo somente).")
 async def anel_punir(interaction: discord.Interaction, usuario: discord.Member):
-    user_data = get_user_data(interaction.user.id)
+    async with travar_usuarios(interaction.user.id, usuario.id):
+        user_data = get_user_data(interaction.user.id)
 
-    # Verifica se o usuário possui o anel
-    if "anel_supremo" not in user_data.get("inventario", {}):
-        await interaction.response.send_message(f"{EMOJIS['erro']} Você não possui o Anel Supremo!", ephemeral=True)
-        return
+        # Verifica se o usuário possui o anel
+        if "anel_supremo" not in user_data.get("inventario", {}):
+            await responder(interaction, f"{EMOJIS['erro']} Você não possui o Anel Supremo!", ephemeral=True)
+            return
 
-    # Checa cooldown diário (um uso por subcomando)
-    hoje = datetime.now().date().isoformat()
-    if user_data.get("anel_ultimo_uso_punir") == hoje:
-        await interaction.response.send_message(f"{EMOJIS['alerta']} Você já usou /anel punir hoje. Tente novamente amanhã.", ephemeral=True)
-        return
+        # Checa cooldown diário (um uso por subcomando)
+        agora = int(time.time())
+        if not economia().cooldowns.pronto(interaction.user.id, "anel_punir", agora):
+            await responder(interaction, f"{EMOJIS['alerta']} Você já usou /anel punir hoje. Tente novamente amanhã.", ephemeral=True)
+            return
 
-    alvo_data = get_user_data(usuario.id)
+        alvo_data = get_user_data(usuario.id)
 
-    # Remove dinheiro e itens do alvo
-    alvo_data["carteira"] = 0
-    alvo_data["banco"] = 0
-    alvo_data["inventario"] = {}
-    alvo_data["apps"] = []
-    alvo_data["celular"] = False
-    save_data(data)
+        # Remove dinheiro e itens do alvo
+        aplicar_transacao(
+            Transacao()
+            .recolher(usuario.id, alvo_data["carteira"])
+            .recolher(usuario.id, alvo_data["banco"], campo="banco")
+        )
+        alvo_data["inventario"] = {}
+        alvo_data["apps"] = []
+        alvo_data["celular"] = False
 
-    user_data["anel_ultimo_uso_punir"] = hoje
-    save_data(data)
+        economia().cooldowns.iniciar(interaction.user.id, "anel_punir", user_data, agora)
+        marcar_alterado(interaction.user.id, usuario.id)
 
     embed = discord.Embed(
         title=f"{EMOJIS['caveira']} Castigo Cósmico!",
@@ -562,30 +651,15 @@ async def anel_punir(interaction: discord.Interaction, usuario: discord.Member):
     embed.add_field(name="Alvo", value=f"{usuario.mention}", inline=True)
     embed.add_field(name="Executor", value=f"{interaction.user.mention}", inline=True)
     embed.set_footer(text="Punição do Anel")
-    await interaction.response.send_message(embed=embed)
-
-    # Log em canal de moderação (se configurado)
-    try:
-        log_channel = bot.get_channel(1398712093238235237)
-        if not log_channel:
-            try:
-                log_channel = await bot.fetch_channel(1398712093238235237)
-            except Exception:
-                log_channel = None
-
-        if log_channel:
-            log_embed = discord.Embed(
-                title="Anel Supremo — Punir",
-                description=f"{interaction.user.mention} usou `/anel punir` em {usuario.mention}",
-                color=discord.Color.dark_red(),
-                timestamp=datetime.now()
-            )
-            log_embed.add_field(name="Executor", value=interaction.user.mention, inline=True)
-            log_embed.add_field(name="Alvo", value=usuario.mention, inline=True)
-            log_embed.add_field(name="Servidor", value=interaction.guild.name if interaction.guild else "Direto/DM", inline=False)
-            await log_channel.send(embed=log_embed)
-    except Exception as e:
-        print(f"Erro ao enviar log do Anel (punir): {e}")
+    await responder(interaction, embed=embed)
+
+    registrar_log(
+        interaction,
+        "Anel Supremo — Punir",
+        f"{interaction.user.mention} usou `/anel punir` em {usuario.mention}",
+        discord.Color.dark_red(),
+        ("Alvo", usuario.mention)
+    )
 
 
 # adiciona o group ao tree
@@ -593,53 +667,51 @@ bot.tree.add_command(anel)
 
 @bot.tree.command(name="transferir", description="💸 Transfira dinheiro para outro usuário")
 async def transferir(interaction: discord.Interaction, usuario: discord.Member, quantia: int):
-    user_data = get_user_data(interaction.user.id)
-    destinatario_data = get_user_data(usuario.id)
-    
-    if usuario.id == interaction.user.id:
-        await interaction.response.send_message(f"{EMOJIS['erro']} Você não pode transferir para si mesmo!", ephemeral=True)
-        return
-    
-    if quantia <= 0:
-        await interaction.response.send_message(f"{EMOJIS['erro']} Quantia inválida!", ephemeral=True)
-        return
-    
-    if user_data["carteira"] < quantia:
-        await interaction.response.send_message(f"{EMOJIS['erro']} Saldo insuficiente na carteira!", ephemeral=True)
-        return
-    
-    taxa = int(quantia * 0.05)
-    quantia_final = quantia - taxa
-    
-    user_data["carteira"] -= quantia
-    destinatario_data["carteira"] += quantia_final
-    save_data(data)
-    
-    embed = discord.Embed(
-        title=f"{EMOJIS['sucesso']} Transferência Realizada",
-        description=f"Você transferiu **R$ {quantia:,}** para {usuario.display_name}",
-        color=discord.Color.green()
-    )
-    embed.add_field(name="Valor Enviado", value=f"R$ {quantia_final:,}", inline=True)
-    embed.add_field(name="Taxa Bancária (5%)", value=f"R$ {taxa:,}", inline=True)
-    embed.add_field(name="Seu Saldo", value=f"R$ {user_data['carteira']:,}", inline=True)
-    
-    await interaction.response.send_message(embed=embed)
+    async with travar_usuarios(interaction.user.id, usuario.id):
+        user_data = get_user_data(interaction.user.id)
+        
+        if usuario.id == interaction.user.id:
+            await responder(interaction, f"{EMOJIS['erro']} Você não pode transferir para si mesmo!", ephemeral=True)
+            return
+        
+        if quantia <= 0:
+            await responder(interaction, f"{EMOJIS['erro']} Quantia inválida!", ephemeral=True)
+            return
+        
+        taxa = int(quantia * 0.05)
+        quantia_final = quantia - taxa
+        
+        try:
+            aplicar_transacao(Transacao().transferir(interaction.user.id, usuario.id, quantia, taxa=taxa))
+        except SaldoInsuficiente:
+            await responder(interaction, f"{EMOJIS['erro']} Saldo insuficiente na carteira!", ephemeral=True)
+            return
+        
+        embed = discord.Embed(
+            title=f"{EMOJIS['sucesso']} Transferência Realizada",
+            description=f"Você transferiu **R$ {quantia:,}** para {usuario.display_name}",
+            color=discord.Color.green()
+        )
+        embed.add_field(name="Valor Enviado", value=f"R$ {quantia_final:,}", inline=True)
+        embed.add_field(name="Taxa Bancária (5%)", value=f"R$ {taxa:,}", inline=True)
+        embed.add_field(name="Seu Saldo", value=f"R$ {user_data['carteira']:,}", inline=True)
+        
+        await responder(interaction, embed=embed)
 
 @bot.tree.command(name="investir", description="📈 Invista seu dinheiro e arrisque multiplicar")
 async def investir(interaction: discord.Interaction, quantia: int):
     user_data = get_user_data(interaction.user.id)
     
     if quantia <= 0:
-        await interaction.response.send_message(f"{EMOJIS['erro']} Quantia inválida!", ephemeral=True)
+        await responder(interaction, f"{EMOJIS['erro']} Quantia inválida!", ephemeral=True)
         return
     
     if user_data["carteira"] < quantia:
-        await interaction.response.send_message(f"{EMOJIS['erro']} Você não tem esse dinheiro!", ephemeral=True)
+        await responder(interaction, f"{EMOJIS['erro']} Você não tem esse dinheiro!", ephemeral=True)
         return
     
     if quantia < 500:
-        await interaction.response.send_message(f"{EMOJIS['erro']} Investimento mínimo: R$ 500", ephemeral=True)
+        await responder(interaction, f"{EMOJIS['erro']} Investimento mínimo: R$ 500", ephemeral=True)
         return
     
     resultado = random.random()
@@ -674,9 +746,9 @@ async def investir(interaction: discord.Interaction, quantia: int):
         embed.add_field(name="Perda", value=f"R$ {perda:,}", inline=True)
         embed.add_field(name="Recuperado", value=f"R$ {quantia - perda:,}", inline=True)
     
-    save_data(data)
+    marcar_alterado(interaction.user.id)
     embed.set_footer(text="⚠️ Investir envolve riscos!")
-    await interaction.response.send_message(embed=embed)
+    await responder(interaction, embed=embed)
 
 @bot.tree.command(name="apostar", description="🎰 Aposte no cara ou coroa")
 async def apostar(interaction: discord.Interaction, quantia: int, escolha: str):
@@ -684,15 +756,15 @@ async def apostar(interaction: discord.Interaction, quantia: int, escolha: str):
     escolha = escolha.lower()
     
     if escolha not in ["cara", "coroa"]:
-        await interaction.response.send_message(f"{EMOJIS['erro']} Escolha 'cara' ou 'coroa'!", ephemeral=True)
+        await responder(interaction, f"{EMOJIS['erro']} Escolha 'cara' ou 'coroa'!", ephemeral=True)
         return
     
     if quantia <= 0:
-        await interaction.response.send_message(f"{EMOJIS['erro']} Quantia inválida!", ephemeral=True)
+        await responder(interaction, f"{EMOJIS['erro']} Quantia inválida!", ephemeral=True)
         return
     
     if user_data["carteira"] < quantia:
-        await interaction.response.send_message(f"{EMOJIS['erro']} Saldo insuficiente!", ephemeral=True)
+        await responder(interaction, f"{EMOJIS['erro']} Saldo insuficiente!", ephemeral=True)
         return
     
     resultado = random.choice(["cara", "coroa"])
@@ -715,9 +787,9 @@ async def apostar(interaction: discord.Interaction, quantia: int, escolha: str):
             color=discord.Color.red()
         )
     
-    save_data(data)
+    marcar_alterado(interaction.user.id)
     embed.set_footer(text=f"Saldo atual: R$ {user_data['carteira']:,}")
-    await interaction.response.send_message(embed=embed)
+    await responder(interaction, embed=embed)
 
 @bot.tree.command(name="crime", description="🔫 Cometa um crime arriscado por dinheiro")
 async def crime(interaction: discord.Interaction):
@@ -768,70 +840,89 @@ async def crime(interaction: discord.Interaction):
             color=discord.Color.dark_red()
         )
     
-    save_data(data)
+    marcar_alterado(interaction.user.id)
     embed.set_footer(text="🔥 Crimes são muito arriscados!")
-    await interaction.response.send_message(embed=embed)
+    await responder(interaction, embed=embed)
+
+grupo_ranking = app_commands.Group(name="ranking", description="Ranking de patrimônio do servidor")
 
-@bot.tree.command(name="ranking", description="🏆 Veja os usuários mais ricos do servidor")
+@grupo_ranking.command(name="top", description="🏆 Veja os usuários mais ricos do servidor")
 async def ranking(interaction: discord.Interaction):
-    usuarios_ricos = []
-    
-    for user_id, user_data in data.items():
-        try:
-            membro = await interaction.guild.fetch_member(int(user_id))
-            total = user_data["carteira"] + user_data["banco"]
-            tem_anel = "anel_supremo" in user_data["inventario"]
-            usuarios_ricos.append((membro.display_name, total, tem_anel))
-        except:
-            continue
-    
-    usuarios_ricos.sort(key=lambda x: x[1], reverse=True)
-    top10 = usuarios_ricos[:10]
-    
+    # Lê o índice a cada clique: a view sobrevive à economia ser recarregada
+    def posicao(user_id):
+        posicao = economia().ranking.posicao(user_id)
+        return None if posicao is None else posicao - 1
+    
+    view = PaginadorView(
+        interaction.user.id,
+        total=lambda: len(economia().ranking),
+        itens=lambda inicio, quantidade: usuarios_por_patrimonio(quantidade, inicio),
+        renderizar=renderizar_ranking,
+        posicao=posicao
+    )
+    await responder(interaction, embed=await view.embed_pagina(interaction), view=view)
+
+async def renderizar_ranking(interaction: discord.Interaction, pagina, inicio):
     embed = discord.Embed(
         title=f"{EMOJIS['coroa']} Ranking de Patrimônio",
         description="Os mais ricos do servidor!\n",
         color=discord.Color.gold()
     )
     
+    nomes = await nomes_membros.resolver(interaction.guild, [user_id for user_id, _ in pagina])
+    portadores_anel = economia().indices.com_item("anel_supremo")
     medalhas = ["🥇", "🥈", "🥉"]
-    for i, (nome, total, tem_anel) in enumerate(top10):
+    for i, (user_id, total) in enumerate(pagina, start=inicio):
         medalha = medalhas[i] if i < 3 else f"{i+1}º"
-        anel_icon = " 💍" if tem_anel else ""
+        nome = nomes.get(int(user_id)) or "Usuário fora do servidor"
+        anel_icon = " 💍" if user_id in portadores_anel else ""
         embed.add_field(
             name=f"{medalha} {nome}{anel_icon}",
             value=f"R$ {total:,}",
             inline=False
         )
     
-    await interaction.response.send_message(embed=embed)
+    if not pagina:
+        embed.description += "\nNinguém no ranking ainda."
+    return embed
 
-@bot.tree.command(name="loja_vip", description="🌟 Veja e compre planos VIP do servidor")
-async def loja_vip(interaction: discord.Interaction):
+@grupo_ranking.command(name="posicao", description="📊 Veja a posição exata de alguém no ranking")
+async def ranking_posicao(interaction: discord.Interaction, usuario: discord.Member = None):
+    usuario = usuario or interaction.user
+    indice = economia().ranking
+    posicao = indice.posicao(usuario.id)
+    
+    if posicao is None:
+        await responder(interaction, f"{EMOJIS['erro']} {usuario.display_name} ainda não tem dinheiro registrado!", ephemeral=True)
+        return
+    
     embed = discord.Embed(
-        title="🌟 Loja VIP — Astral Roleplay",
-        description="Apoie o servidor e desbloqueie benefícios exclusivos no jogo e no Discord!\n\n**Use o menu abaixo para comprar:**",
-        color=discord.Color.purple()
+        title=f"{EMOJIS['coroa']} Posição no Ranking",
+        description=f"**{usuario.display_name}** está em **{posicao}º** de {len(indice):,}",
+        color=discord.Color.gold()
     )
+    embed.add_field(name=f"{EMOJIS['dinheiro']} Patrimônio", value=f"R$ {indice.patrimonio(usuario.id):,}", inline=True)
     
-    for vip_id, vip_info in VIPS.items():
-        beneficios_resumo = "\n".join([f"• {b}" for b in vip_info["beneficios"][:3]])
-        
-        embed.add_field(
-            name=f"{vip_info['emoji']} {vip_info['nome']}",
-            value=f"**R$ {vip_info['preco']:,}**\n{beneficios_resumo}",
-            inline=True
-        )
+    if posicao > 1:
+        # Quem está logo acima
+        (_, acima), = indice.fatia(posicao - 2, 1)
+        embed.add_field(name="⬆️ Para subir", value=f"Faltam R$ {acima - indice.patrimonio(usuario.id) + 1:,}", inline=True)
     
-    embed.set_footer(text="💡 O dinheiro do bot será usado para a compra!")
+    await responder(interaction, embed=embed)
+
+bot.tree.add_command(grupo_ranking)
+
+@bot.tree.command(name="loja_vip", description="🌟 Veja e compre planos VIP do servidor")
+async def loja_vip(interaction: discord.Interaction):
+    embed = renders.obter("loja_vip", montar_embed_loja_vip)
     
     view = VIPPainelView(interaction.user.id)
-    await interaction.response.send_message(embed=embed, view=view)
+    await responder(interaction, embed=embed, view=view)
 
 @bot.tree.command(name="vip", description="🌟 Veja informações sobre seu VIP")
 async def vip(interaction: discord.Interaction, usuario: discord.Member = None):
     usuario = usuario or interaction.user
-    user_data = get_user_data(usuario.id)
+    user_data = ver_user_data(usuario.id)
     
     embed = discord.Embed(
         title=f"🌟 Status VIP de {usuario.display_name}",
@@ -857,42 +948,11 @@ async def vip(interaction: discord.Interaction, usuario: discord.Member = None):
         embed.add_field(name="💡 Como Adquirir?", value="Use `/loja_vip` para comprar um plano VIP!", inline=False)
         embed.add_field(name="🌟 Benefícios VIP", value="Vantagens exclusivas no jogo e Discord\nDinheiro instantâneo no servidor\nCargos e áreas VIP", inline=False)
     
-    await interaction.response.send_message(embed=embed)
+    await responder(interaction, embed=embed)
 
 @bot.tree.command(name="ajuda", description="❓ Veja todos os comandos disponíveis")
 async def ajuda(interaction: discord.Interaction):
-    embed = discord.Embed(
-        title=f"{EMOJIS['diamante']} Central de Ajuda",
-        description="Bem-vindo ao sistema de economia mais completo!\n",
-        color=discord.Color.blue()
-    )
-    
-    embed.add_field(
-        name=f"{EMOJIS['dinheiro']} Comandos Básicos",
-        value="`/saldo` - Veja seu saldo\n`/perfil` - Perfil completo\n`/daily` - Auxílio diário\n`/inventario` - Seus itens\n`/ranking` - Top usuários\n`/vip` - Ver seu status VIP",
-        inline=False
-    )
-    
-    embed.add_field(
-        name=f"{EMOJIS['trabalho']} Trabalho",
-        value="`/empregos` - Ver e candidatar\n`/trabalhar` - Trabalhar",
-        inline=False
-    )
-    
-    embed.add_field(
-        name=f"{EMOJIS['celular']} Shopping",
-        value="`/loja` - Ver e comprar itens\n`/celular` - Smartphone completo\n`/transferir` - Enviar dinheiro\n`/loja_vip` - 🌟 **Comprar VIP**",
-        inline=False
-    )
-    
-    embed.add_field(
-        name=f"🎰 Jogos & Riscos",
-        value="`/apostar` - Cara ou coroa\n`/investir` - Bolsa de valores\n`/roubar` - Roubar alguém\n`/crime` - Cometer crimes",
-        inline=False
-    )
-    
-    embed.set_footer(text="💡 Explore os menus interativos!")
-    await interaction.response.send_message(embed=embed)
+    await responder(interaction, embed=renders.obter("ajuda", montar_embed_ajuda))
 
 # ============ COMANDOS ADMIN ============
 
@@ -903,7 +963,8 @@ async def admin_dar_vip(interaction: discord.Interaction, usuario: discord.Membe
     
     if vip not in VIPS:
         vips_disponiveis = ", ".join(VIPS.keys())
-        await interaction.response.send_message(
+        await responder(
+            interaction,
             f"{EMOJIS['erro']} VIP inválido! Disponíveis: {vips_disponiveis}",
             ephemeral=True
         )
@@ -912,19 +973,12 @@ async def admin_dar_vip(interaction: discord.Interaction, usuario: discord.Membe
     user_data = get_user_data(usuario.id)
     vip_info = VIPS[vip]
     
+    vip_anterior = user_data.get("vip")
     user_data["vip"] = vip
+    marcar_alterado(usuario.id)
     
-    cargo_adicionado = False
-    if vip_info["cargo_id"]:
-        try:
-            cargo = interaction.guild.get_role(vip_info["cargo_id"])
-            if cargo:
-                await usuario.add_roles(cargo)
-                cargo_adicionado = True
-        except Exception as e:
-            print(f"Erro ao adicionar cargo VIP: {e}")
-    
-    save_data(data)
+    # O cargo é dado em segundo plano (ver cargos_vip.py)
+    cargo_id = trocar_cargo_vip(interaction.guild.id, usuario.id, vip_anterior, vip)
     
     embed = discord.Embed(
         title=f"{EMOJIS['sucesso']} VIP Concedido!",
@@ -936,18 +990,25 @@ async def admin_dar_vip(interaction: discord.Interaction, usuario: discord.Membe
     embed.add_field(name="Benefícios", value=beneficios_text, inline=False)
     embed.add_field(name="💰 Dinheiro no Jogo", value=f"R$ {vip_info['dinheiro_jogo']:,}", inline=True)
     
-    if cargo_adicionado:
-        embed.add_field(name="👥 Cargo", value="✅ Adicionado", inline=True)
+    if cargo_id:
+        embed.add_field(name="👥 Cargo", value=f"⏳ <@&{cargo_id}> sendo adicionado", inline=True)
     else:
         embed.add_field(name="👥 Cargo", value="⚠️ Não configurado", inline=True)
     
     embed.set_footer(text="🎮 O jogador deve entrar no servidor para receber os benefícios!")
     
-    await interaction.response.send_message(embed=embed)
+    await responder(interaction, embed=embed)
+    registrar_log(
+        interaction,
+        "Admin — Dar VIP",
+        f"{vip_info['nome']} dado para {usuario.mention}",
+        vip_info["cor"],
+        ("Alvo", usuario.mention)
+    )
     
     try:
         dm_embed = discord.Embed(
-            title=f"🎉 Você recebeu VIP!",
+            title="🎉 Você recebeu VIP!",
             description=f"Um administrador te concedeu o **{vip_info['emoji']} {vip_info['nome']}**!",
             color=vip_info["cor"]
         )
@@ -963,7 +1024,8 @@ async def admin_remover_vip(interaction: discord.Interaction, usuario: discord.M
     user_data = get_user_data(usuario.id)
     
     if not user_data.get("vip"):
-        await interaction.response.send_message(
+        await responder(
+            interaction,
             f"{EMOJIS['erro']} {usuario.display_name} não possui VIP!",
             ephemeral=True
         )
@@ -972,17 +1034,10 @@ async def admin_remover_vip(interaction: discord.Interaction, usuario: discord.M
     vip_removido = user_data["vip"]
     vip_info = VIPS.get(vip_removido)
     
-    if vip_info and vip_info["cargo_id"]:
-        try:
-            cargo = interaction.guild.get_role(vip_info["cargo_id"])
-            if cargo and cargo in usuario.roles:
-                await usuario.remove_roles(cargo)
-        except Exception as e:
-            print(f"Erro ao remover cargo VIP: {e}")
-    
     user_data["vip"] = None
     user_data["vip_expira"] = None
-    save_data(data)
+    marcar_alterado(usuario.id)
+    trocar_cargo_vip(interaction.guild.id, usuario.id, vip_removido, None)
     
     embed = discord.Embed(
         title=f"{EMOJIS['sucesso']} VIP Removido",
@@ -993,38 +1048,51 @@ async def admin_remover_vip(interaction: discord.Interaction, usuario: discord.M
     if vip_info:
         embed.add_field(name="VIP Removido", value=f"{vip_info['emoji']} {vip_info['nome']}", inline=True)
     
-    await interaction.response.send_message(embed=embed)
+    await responder(interaction, embed=embed)
+    registrar_log(
+        interaction,
+        "Admin — Remover VIP",
+        f"VIP `{vip_removido}` removido de {usuario.mention}",
+        discord.Color.red(),
+        ("Alvo", usuario.mention)
+    )
 
 @bot.tree.command(name="admin_listar_vips", description="👑 [ADMIN] Ver todos os usuários com VIP")
 @app_commands.checks.has_permissions(administrator=True)
 async def admin_listar_vips(interaction: discord.Interaction):
-    usuarios_vip = []
-    
-    for user_id, user_data in data.items():
-        if user_data.get("vip"):
-            try:
-                membro = await interaction.guild.fetch_member(int(user_id))
-                vip_info = VIPS.get(user_data["vip"])
-                if vip_info:
-                    usuarios_vip.append((membro.display_name, vip_info["nome"], vip_info["emoji"]))
-            except:
-                continue
+    # Só os planos que existem, na ordem do catálogo. Cada página lê só o que
+    # mostra, do índice atual: a view sobrevive à economia ser recarregada
+    planos = list(VIPS)
     
-    embed = discord.Embed(
-        title="🌟 Lista de VIPs do Servidor",
-        color=discord.Color.purple()
+    async def renderizar(interaction, pagina, inicio):
+        embed = discord.Embed(
+            title="🌟 Lista de VIPs do Servidor",
+            color=discord.Color.purple()
+        )
+        
+        if not pagina:
+            embed.description = "Nenhum usuário possui VIP no momento."
+        else:
+            nomes = await nomes_membros.resolver(interaction.guild, [user_id for user_id, _ in pagina])
+            vip_text = ""
+            for user_id, vip_id in pagina:
+                vip_info = VIPS[vip_id]
+                nome = nomes.get(int(user_id)) or "Usuário fora do servidor"
+                vip_text += f"{vip_info['emoji']} **{nome}** — {vip_info['nome']}\n"
+            embed.description = vip_text
+        
+        embed.set_footer(text=f"Total de VIPs: {economia().indices.total_vip(planos)}")
+        return embed
+    
+    view = PaginadorView(
+        interaction.user.id,
+        total=lambda: economia().indices.total_vip(planos),
+        itens=lambda inicio, quantidade: economia().indices.fatia_vip(planos, inicio, quantidade),
+        renderizar=renderizar,
+        posicao=lambda user_id: economia().indices.posicao_vip(planos, str(user_id)),
+        por_pagina=20
     )
-    
-    if not usuarios_vip:
-        embed.description = "Nenhum usuário possui VIP no momento."
-    else:
-        vip_text = ""
-        for nome, vip_nome, emoji in usuarios_vip:
-            vip_text += f"{emoji} **{nome}** — {vip_nome}\n"
-        embed.description = vip_text
-    
-    embed.set_footer(text=f"Total de VIPs: {len(usuarios_vip)}")
-    await interaction.response.send_message(embed=embed)
+    await responder(interaction, embed=await view.embed_pagina(interaction), view=view)
 
 @bot.tree.command(name="admin_configurar_cargo_vip", description="👑 [ADMIN] Configurar ID do cargo VIP")
 @app_commands.checks.has_permissions(administrator=True)
@@ -1033,7 +1101,8 @@ async def admin_configurar_cargo_vip(interaction: discord.Interaction, vip: str,
     
     if vip not in VIPS:
         vips_disponiveis = ", ".join(VIPS.keys())
-        await interaction.response.send_message(
+        await responder(
+            interaction,
             f"{EMOJIS['erro']} VIP inválido! Disponíveis: {vips_disponiveis}",
             ephemeral=True
         )
@@ -1044,81 +1113,55 @@ async def admin_configurar_cargo_vip(interaction: discord.Interaction, vip: str,
         cargo = interaction.guild.get_role(cargo_id_int)
         
         if not cargo:
-            await interaction.response.send_message(
+            await responder(
+                interaction,
                 f"{EMOJIS['erro']} Cargo não encontrado! Verifique o ID.",
                 ephemeral=True
             )
             return
         
-        VIPS[vip]["cargo_id"] = cargo_id_int
+        await cargos_vip.definir(interaction.guild.id, vip, cargo_id_int)
+        # Configuração dos planos mudou: embeds e menus de VIP são remontados
+        renders.invalidar()
+        preparar_renders()
+        # Quem já tem o plano recebe o cargo
+        correcoes = await reconciliar_cargos_vip(interaction.guild)
         
         embed = discord.Embed(
             title=f"{EMOJIS['sucesso']} Cargo Configurado!",
             description=f"O cargo {cargo.mention} foi vinculado ao **{VIPS[vip]['nome']}**",
             color=discord.Color.green()
         )
+        embed.add_field(name="👥 Sincronização", value=f"{correcoes} alterações de cargo na fila", inline=True)
         embed.set_footer(text=f"ID do cargo: {cargo_id_int}")
         
-        await interaction.response.send_message(embed=embed)
+        await responder(interaction, embed=embed)
         
     except ValueError:
-        await interaction.response.send_message(
+        await responder(
+            interaction,
             f"{EMOJIS['erro']} ID inválido! Use apenas números.",
             ephemeral=True
         )
 
-@bot.tree.command(name="admin_painel_vip", description="👑 [ADMIN] Criar painel público de VIPs")
+@bot.tree.command(name="admin_painel_vip", description="👑 [ADMIN] Criar painel público de VIPs", extras={"efemero": True})
 @app_commands.checks.has_permissions(administrator=True)
 async def admin_painel_vip(interaction: discord.Interaction, canal: discord.TextChannel = None):
     canal = canal or interaction.channel
     
-    embed = discord.Embed(
-        title="🌟 Planos VIP — Astral Roleplay",
-        description="**Apoie o servidor e desbloqueie benefícios exclusivos no jogo e no Discord!**\n\nUse seus créditos do bot de economia para adquirir VIP!\nUse `/loja_vip` para comprar.\n",
-        color=discord.Color.from_rgb(138, 43, 226)
-    )
-    
-    embed.add_field(
-        name="⭐ VIP Alpha — R$3.000",
-        value="• Acesso à área VIP\n• Fila prioritária em tickets\n• **R$100.000,00** no jogo",
-        inline=False
-    )
-    
-    embed.add_field(
-        name="💎 VIP Beta — R$10.000",
-        value="• Tudo do Alpha\n• **R$250.000,00** no jogo\n• Cargo diferenciado no Discord",
-        inline=False
-    )
-    
-    embed.add_field(
-        name="👑 VIP Ômega — R$18.000",
-        value="• Tudo do Beta\n• **R$300.000,00** no jogo\n• Salário VIP",
-        inline=False
-    )
-    
-    embed.add_field(
-        name="💠 VIP Diamond — R$30.000",
-        value="• Tudo do Ômega\n• **R$750.000,00** no jogo\n• Loja VIP no jogo\n• Tag VIP DIAMOND\n• 1 veículo exclusivo",
-        inline=False
-    )
-    
-    embed.add_field(
-        name="💫 VIP Diamond 2.0 — R$50.000",
-        value="• Tudo do Diamond\n• 2 veículos únicos\n• **R$1.000.000,00** no jogo\n• Acesso antecipado a updates\n• Cores especiais no chat",
-        inline=False
-    )
-    
-    embed.set_footer(text="💰 Use /loja_vip para comprar | 🎮 Entre no servidor após a compra para receber os benefícios")
+    # Cópia: a miniatura é a do servidor
+    embed = renders.obter("painel_vip", montar_embed_painel_vip).copy()
     embed.set_thumbnail(url=interaction.guild.icon.url if interaction.guild.icon else None)
     
-    await canal.send(embed=embed)
+    # Painel público: qualquer um compra pelo menu, mesmo depois de reiniciar o bot
+    await canal.send(embed=embed, view=VIPPainelView(0))
     
     confirmacao = discord.Embed(
         title=f"{EMOJIS['sucesso']} Painel Criado!",
         description=f"O painel VIP foi enviado para {canal.mention}",
         color=discord.Color.green()
     )
-    await interaction.response.send_message(embed=confirmacao, ephemeral=True)
+    await responder(interaction, embed=confirmacao, ephemeral=True)
 
 
 @bot.tree.command(name="admin_sorteio", description="👑 [ADMIN] Realizar um sorteio — escolhe uma pessoa (não-bot) do servidor")
@@ -1131,7 +1174,7 @@ async def admin_sorteio(interaction: discord.Interaction, nome: str = None):
     enquanto o executor do comando receberá uma confirmação ephemera com o vencedor real.
     """
     if not interaction.guild:
-        await interaction.response.send_message(f"{EMOJIS['erro']} Este comando só pode ser usado em servidores.", ephemeral=True)
+        await responder(interaction, f"{EMOJIS['erro']} Este comando só pode ser usado em servidores.", ephemeral=True)
         return
 
     # Recolhe membros humanos (não bots).
@@ -1142,11 +1185,11 @@ async def admin_sorteio(interaction: discord.Interaction, nome: str = None):
         try:
             members = [m async for m in interaction.guild.fetch_members(limit=None) if not m.bot]
         except Exception:
-            await interaction.response.send_message(f"{EMOJIS['erro']} Não foi possível obter a lista de membros. Tente novamente mais tarde.", ephemeral=True)
+            await responder(interaction, f"{EMOJIS['erro']} Não foi possível obter a lista de membros. Tente novamente mais tarde.", ephemeral=True)
             return
 
     if not members:
-        await interaction.response.send_message(f"{EMOJIS['erro']} Nenhum membro humano encontrado para sortear.", ephemeral=True)
+        await responder(interaction, f"{EMOJIS['erro']} Nenhum membro humano encontrado para sortear.", ephemeral=True)
         return
 
     vencedor = random.choice(members)
@@ -1162,7 +1205,7 @@ async def admin_sorteio(interaction: discord.Interaction, nome: str = None):
         )
         public_embed.add_field(name="Nota", value="Vencedor real notificado ao administrador.", inline=False)
         public_embed.set_footer(text=f"Sorteio por {interaction.user.display_name}")
-        await interaction.response.send_message(embed=public_embed)
+        await responder(interaction, embed=public_embed)
 
         # enviar confirmação ephemera para o admin com o vencedor real (embed)
         try:
@@ -1176,7 +1219,7 @@ async def admin_sorteio(interaction: discord.Interaction, nome: str = None):
             await interaction.followup.send(embed=confirm_embed, ephemeral=True)
         except Exception:
             # fallback: resposta ephemera direta
-            await interaction.response.send_message(f"(Confirmação) Vencedor real: {vencedor.mention}", ephemeral=True)
+            await responder(interaction, f"(Confirmação) Vencedor real: {vencedor.mention}", ephemeral=True)
     else:
         public_embed = discord.Embed(
             title="🎉 Sorteio Realizado!",
@@ -1191,7 +1234,7 @@ async def admin_sorteio(interaction: discord.Interaction, nome: str = None):
                 public_embed.set_thumbnail(url=interaction.guild.icon.url)
         except Exception:
             pass
-        await interaction.response.send_message(embed=public_embed)
+        await responder(interaction, embed=public_embed)
 
     # Log no console (e opcionalmente poderia enviar para um canal de moderação)
     print(f"[SORTEIO] Executor: {interaction.user} | Vencedor: {vencedor} | exibido_nome: {nome or vencedor.display_name}")
@@ -1199,30 +1242,51 @@ async def admin_sorteio(interaction: discord.Interaction, nome: str = None):
 @bot.tree.command(name="admin_add", description="👑 [ADMIN] Adicionar dinheiro a um usuário")
 @app_commands.checks.has_permissions(administrator=True)
 async def admin_add(interaction: discord.Interaction, usuario: discord.Member, quantia: int):
-    user_data = get_user_data(usuario.id)
-    user_data["carteira"] += quantia
-    save_data(data)
+    if quantia <= 0:
+        await responder(interaction, f"{EMOJIS['erro']} Quantia inválida!", ephemeral=True)
+        return
+    
+    aplicar_transacao(Transacao().emitir(usuario.id, quantia))
     
     embed = discord.Embed(
         title=f"{EMOJIS['sucesso']} Dinheiro Adicionado",
         description=f"**R$ {quantia:,}** foram adicionados à carteira de {usuario.display_name}",
         color=discord.Color.green()
     )
-    await interaction.response.send_message(embed=embed)
+    await responder(interaction, embed=embed)
+    registrar_log(
+        interaction,
+        "Admin — Adicionar Dinheiro",
+        f"R$ {quantia:,} para {usuario.mention}",
+        discord.Color.green(),
+        ("Alvo", usuario.mention),
+        ("Quantia", f"R$ {quantia:,}")
+    )
 
 @bot.tree.command(name="admin_remove", description="👑 [ADMIN] Remover dinheiro de um usuário")
 @app_commands.checks.has_permissions(administrator=True)
 async def admin_remove(interaction: discord.Interaction, usuario: discord.Member, quantia: int):
-    user_data = get_user_data(usuario.id)
-    user_data["carteira"] = max(0, user_data["carteira"] - quantia)
-    save_data(data)
+    if quantia <= 0:
+        await responder(interaction, f"{EMOJIS['erro']} Quantia inválida!", ephemeral=True)
+        return
+    
+    user_data = ver_user_data(usuario.id)
+    aplicar_transacao(Transacao().recolher(usuario.id, min(quantia, user_data["carteira"])))
     
     embed = discord.Embed(
         title=f"{EMOJIS['sucesso']} Dinheiro Removido",
         description=f"**R$ {quantia:,}** foram removidos da carteira de {usuario.display_name}",
         color=discord.Color.orange()
     )
-    await interaction.response.send_message(embed=embed)
+    await responder(interaction, embed=embed)
+    registrar_log(
+        interaction,
+        "Admin — Remover Dinheiro",
+        f"R$ {quantia:,} de {usuario.mention}",
+        discord.Color.orange(),
+        ("Alvo", usuario.mention),
+        ("Quantia", f"R$ {quantia:,}")
+    )
 
 @bot.tree.command(name="admin_dar_item", description="👑 [ADMIN] Dar um item para um usuário")
 @app_commands.checks.has_permissions(administrator=True)
@@ -1241,15 +1305,15 @@ async def admin_dar_item(interaction: discord.Interaction, usuario: discord.Memb
         item_info = MERCADO_NEGRO[item]
     
     if not item_encontrado:
-        await interaction.response.send_message(f"{EMOJIS['erro']} Item não encontrado!", ephemeral=True)
+        await responder(interaction, f"{EMOJIS['erro']} Item não encontrado!", ephemeral=True)
         return
     
     if item in user_data["inventario"]:
-        await interaction.response.send_message(f"{EMOJIS['erro']} {usuario.display_name} já possui este item!", ephemeral=True)
+        await responder(interaction, f"{EMOJIS['erro']} {usuario.display_name} já possui este item!", ephemeral=True)
         return
     
     user_data["inventario"][item] = 1
-    save_data(data)
+    marcar_alterado(usuario.id)
     
     embed = discord.Embed(
         title=f"{EMOJIS['presente']} Item Entregue!",
@@ -1258,15 +1322,106 @@ async def admin_dar_item(interaction: discord.Interaction, usuario: discord.Memb
     )
     
     if item == "anel_supremo":
-        embed.description += f"\n\n💍 **O PODER SUPREMO FOI CONCEDIDO!** 💍"
+        embed.description += "\n\n💍 **O PODER SUPREMO FOI CONCEDIDO!** 💍"
         embed.color = discord.Color.purple()
     
-    await interaction.response.send_message(embed=embed)
+    await responder(interaction, embed=embed)
+    registrar_log(
+        interaction,
+        "Admin — Dar Item",
+        f"`{item}` dado para {usuario.mention}",
+        embed.color,
+        ("Alvo", usuario.mention)
+    )
 
 # ============ CONFIGURAÇÃO INICIAL ============
 
 DATA_FILE = "economy_data.json"
 
+# Onde os dados ficam:
+#   "journal" (padrão) - snapshot JSON + journal de alterações, compactado periodicamente
+#   "json"             - arquivo único regravado a cada salvamento
+#   "sqlite"           - uma linha por usuário
+#   "shards"           - vários arquivos JSON pequenos; só os alterados são regravados
+ARMAZENAMENTO = os.getenv('ARMAZENAMENTO', 'journal').lower()
+SQLITE_FILE = os.getenv('SQLITE_FILE', 'economy_data.db')
+SHARDS_DIR = os.getenv('SHARDS_DIR', 'economy_shards')
+# Só vale ao criar o diretório; para mudar depois use `armazenamento_shards.py rebalancear`
+NUM_SHARDS = int(os.getenv('NUM_SHARDS', '16'))
+# Formato do snapshot: "json" (legível) ou "compacto" (binário, carrega bem mais rápido)
+FORMATO_SNAPSHOT = os.getenv('FORMATO_SNAPSHOT', 'json').lower()
+SNAPSHOT_FILE = DATA_FILE if FORMATO_SNAPSHOT == 'json' else os.getenv('SNAPSHOT_FILE', 'economy_data.bin')
+COMPRIMIR_SNAPSHOT = os.getenv('COMPRIMIR_SNAPSHOT', '0') == '1'
+JOURNAL_FILE = os.getenv('JOURNAL_FILE', f'{DATA_FILE}.journal')
+# Saldos das contas do sistema (banco central, taxas, multas) de cada economia
+LIVRO_FILE = os.getenv('LIVRO_FILE', 'economy_ledger.json')
+# Tamanho do journal (em bytes) que dispara a compactação em um snapshot novo
+JOURNAL_LIMITE_BYTES = int(os.getenv('JOURNAL_LIMITE_BYTES', str(5 * 1024 * 1024)))
+
+# Cada servidor tem sua economia em ECONOMIAS_DIR/<id do servidor>/. O servidor
+# GUILD_PRINCIPAL continua usando os arquivos antigos da pasta do bot; se eles
+# existirem, o bot não sobe sem GUILD_PRINCIPAL (ver dados_legados).
+ECONOMIAS_DIR = os.getenv('ECONOMIAS_DIR', 'economias')
+GUILD_PRINCIPAL = int(os.getenv('GUILD_PRINCIPAL', '0')) or None
+# Economias sem uso por TEMPO_INATIVIDADE_ECONOMIA segundos são descarregadas;
+# acima de LIMITE_USUARIOS_MEMORIA usuários em memória, as menos usadas saem antes
+TEMPO_INATIVIDADE_ECONOMIA = int(os.getenv('TEMPO_INATIVIDADE_ECONOMIA', '1800'))
+LIMITE_USUARIOS_MEMORIA = int(os.getenv('LIMITE_USUARIOS_MEMORIA', '500000'))
+
+# Gravação em lote: alterações ficam em memória por até INTERVALO_SALVAMENTO
+# segundos ou até LIMITE_ALTERACOES usuários pendentes
+INTERVALO_SALVAMENTO = int(os.getenv('INTERVALO_SALVAMENTO', '30'))
+LIMITE_ALTERACOES = int(os.getenv('LIMITE_ALTERACOES', '100'))
+
+# De quanto em quanto tempo os totais do /admin_economia são conferidos
+# contra os registros (ver agregados.py)
+INTERVALO_AUDITORIA = int(os.getenv('INTERVALO_AUDITORIA', '60'))  # minutos
+
+# Histórico da economia (ver metricas.py): uma amostra a cada INTERVALO_METRICAS
+# minutos (um divisor de 60) por 24h, médias de 1h por 7 dias e de 4h por 30 dias
+INTERVALO_METRICAS = int(os.getenv('INTERVALO_METRICAS', '5'))
+METRICAS_FILE = os.getenv('METRICAS_FILE', 'economy_metrics.bin')
+NIVEIS_METRICAS = (
+    (INTERVALO_METRICAS * 60, 24 * 60 // INTERVALO_METRICAS),
+    (3600, 7 * 24),
+    (4 * 3600, 30 * 6),
+)
+
+# Comandos que não respondem em ORCAMENTO_RESPOSTA segundos são adiados
+# ("pensando...") e respondem depois pelo followup (ver adiamento.py)
+ORCAMENTO_RESPOSTA = float(os.getenv('ORCAMENTO_RESPOSTA', '2.0'))
+adiamento = AdiamentoAutomatico(ORCAMENTO_RESPOSTA)
+responder = adiamento.responder
+
+# Nomes de membros usados nas listagens (ver nomes_membros.py)
+CACHE_NOMES_CAPACIDADE = int(os.getenv('CACHE_NOMES_CAPACIDADE', '5000'))
+CACHE_NOMES_TTL = int(os.getenv('CACHE_NOMES_TTL', '600'))
+nomes_membros = CacheNomesMembros(CACHE_NOMES_CAPACIDADE, CACHE_NOMES_TTL)
+
+# Logs de moderação (Anel Supremo e comandos de admin): entram numa fila e
+# saem em lote a cada INTERVALO_LOGS segundos (ver logs_moderacao.py)
+CANAL_LOGS = int(os.getenv('CANAL_LOGS', '1398712093238235237'))
+INTERVALO_LOGS = float(os.getenv('INTERVALO_LOGS', '2'))
+logs = FilaLogs(CANAL_LOGS)
+
+# Cargo de cada plano VIP por servidor (/admin_configurar_cargo_vip) e o ritmo,
+# por servidor, das alterações de cargo feitas em segundo plano (ver cargos_vip.py)
+CARGOS_VIP_FILE = os.getenv('CARGOS_VIP_FILE', 'vip_roles.json')
+INTERVALO_CARGOS = float(os.getenv('INTERVALO_CARGOS', '1.0'))
+# A conferência de cargos só dá o cargo a quem tem o plano e não tem o cargo.
+# Com REMOVER_CARGOS_SEM_VIP=1 também tira o cargo de quem não tem o plano nos
+# dados (inclusive cargos dados à mão por um admin)
+REMOVER_CARGOS_SEM_VIP = os.getenv('REMOVER_CARGOS_SEM_VIP', '0') == '1'
+cargos_vip = ConfiguracaoCargos(CARGOS_VIP_FILE)
+sincronizador_cargos = SincronizadorCargos(INTERVALO_CARGOS)
+
+# Slash commands só são sincronizados quando mudam (ver sincronizacao_comandos.py).
+# Com GUILD_DESENVOLVIMENTO a sincronização é só nesse servidor, onde aparece na
+# hora (para testar); FORCAR_SYNC=1 sincroniza mesmo sem mudança
+COMANDOS_HASH_FILE = os.getenv('COMANDOS_HASH_FILE', 'command_tree.json')
+GUILD_DESENVOLVIMENTO = int(os.getenv('GUILD_DESENVOLVIMENTO', '0')) or None
+FORCAR_SYNC = os.getenv('FORCAR_SYNC', '0') == '1'
+
 # ============ SISTEMA VIP ============
 
 VIPS = {
@@ -1341,42 +1496,206 @@ VIPS = {
     }
 }
 
-def load_data():
-    if os.path.exists(DATA_FILE):
-        with open(DATA_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return {}
+def diretorio_economia(guild_id):
+    if guild_id is not None and guild_id == GUILD_PRINCIPAL:
+        return "."
+    return os.path.join(ECONOMIAS_DIR, str(guild_id) if guild_id else "dm")
+
+def criar_armazenamento(diretorio="."):
+    def caminho(nome):
+        return os.path.join(diretorio, nome)
+
+    data_file = caminho(DATA_FILE)
+    if ARMAZENAMENTO == 'sqlite':
+        banco = ArmazenamentoSQLite(caminho(SQLITE_FILE))
+        # Primeira execução com SQLite: importa o JSON antigo uma única vez
+        if banco.vazio() and os.path.exists(data_file):
+            total = banco.importar_json(data_file)
+            print(f"[SQLITE] {total} usuários importados de {data_file}")
+        return banco
+    if ARMAZENAMENTO == 'shards':
+        # Na primeira execução o economy_data.json é distribuído nos shards
+        return ArmazenamentoShards(caminho(SHARDS_DIR), NUM_SHARDS, caminho_legado=data_file)
+    opcoes = dict(formato=FORMATO_SNAPSHOT, comprimir=COMPRIMIR_SNAPSHOT, caminho_legado=data_file)
+    if ARMAZENAMENTO == 'json':
+        return ArmazenamentoJSON(caminho(SNAPSHOT_FILE), **opcoes)
+    return ArmazenamentoJournal(caminho(SNAPSHOT_FILE), caminho(JOURNAL_FILE), limite_bytes=JOURNAL_LIMITE_BYTES, **opcoes)
+
+# Uma única thread grava os dados de todas as economias
+executor_persistencia = ThreadPoolExecutor(max_workers=1, thread_name_prefix="persistencia")
+
+def abrir_economia(guild_id):
+    """Carrega a economia de um servidor (roda fora do event loop)."""
+    diretorio = diretorio_economia(guild_id)
+    os.makedirs(diretorio, exist_ok=True)
+    armazenamento = criar_armazenamento(diretorio)
+    dados = {uid: RegistroUsuario.de_dict(r) for uid, r in armazenamento.carregar().items()}
+    persistencia = GerenciadorPersistencia(
+        dados,
+        armazenamento,
+        intervalo=INTERVALO_SALVAMENTO,
+        limite_alterados=LIMITE_ALTERACOES,
+        executor=executor_persistencia
+    )
+    print(f"[ECONOMIA] Servidor {guild_id or 'DM'}: {len(dados)} usuários carregados de {diretorio}")
+    livro = LivroRazao(dados, persistencia, RegistroUsuario, os.path.join(diretorio, LIVRO_FILE))
+    cooldowns = MotorCooldowns(ACOES_COOLDOWN)
+    cooldowns.reconstruir(dados, int(time.time()))
+    ranking = RankingPatrimonio()
+    ranking.reconstruir(dados)
+    agregados = AgregadosEconomia()
+    agregados.reconstruir(dados)
+    indices = IndicesAtributos()
+    indices.reconstruir(dados)
+    persistencia.ouvintes += [ranking, agregados, indices]
+    persistencia.anexos.append(livro)
+    metricas = SerieMetricas(os.path.join(diretorio, METRICAS_FILE), NIVEIS_METRICAS)
+    return Economia(guild_id, dados, armazenamento, persistencia, livro, cooldowns, ranking, agregados, indices, metricas)
+
+economias = GerenciadorEconomias(
+    abrir_economia,
+    inatividade=TEMPO_INATIVIDADE_ECONOMIA,
+    limite_usuarios=LIMITE_USUARIOS_MEMORIA
+)
+
+# Economia da interação sendo tratada (definida antes de cada comando/botão)
+economia_atual = contextvars.ContextVar('economia_atual')
+
+async def selecionar_economia(interaction):
+    economia_atual.set(await economias.obter(interaction.guild_id))
+
+def economia():
+    """Economia do servidor da interação em andamento."""
+    return economia_atual.get()
+
+def save_data(data_to_save=None):
+    """Grava as alterações pendentes (em segundo plano se o bot estiver rodando)."""
+    economias.gravar_todas()
+
+def travar_usuarios(*user_ids):
+    """Trava os usuários (nesta economia) durante uma leitura-espera-escrita.
+
+        async with travar_usuarios(interaction.user.id, usuario.id):
+            ...
+    """
+    return economia().travas.travar(*user_ids)
+
+def aplicar_transacao(transacao):
+    """Aplica a transação na economia atual: todos os lançamentos ou nenhum.
 
-def save_data(data_to_save):
-    with open(DATA_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data_to_save, f, indent=4, ensure_ascii=False)
+    Levanta SaldoInsuficiente sem alterar nada se alguma conta ficaria negativa.
+    """
+    return economia().livro.aplicar(transacao)
+
+def registrar_log(interaction, titulo, descricao, cor, *campos):
+    """Põe um log de moderação na fila; o envio é feito pelo loop enviar_logs.
+
+    `campos` são pares (nome, valor), mostrados entre Executor e Servidor.
+    """
+    embed = discord.Embed(title=titulo, description=descricao, color=cor, timestamp=datetime.now())
+    embed.add_field(name="Executor", value=interaction.user.mention, inline=True)
+    for nome, valor in campos:
+        embed.add_field(name=nome, value=valor, inline=True)
+    embed.add_field(name="Servidor", value=interaction.guild.name if interaction.guild else "Direto/DM", inline=False)
+    logs.registrar(embed)
+
+def marcar_alterado(*user_ids):
+    """Registra que os usuários mudaram; a gravação acontece em lote."""
+    economia().persistencia.marcar(*user_ids)
+
+def usuarios_por_patrimonio(limite, deslocamento=0):
+    """[(user_id, patrimônio)] em ordem decrescente, direto do ranking em memória."""
+    return economia().ranking.fatia(deslocamento, limite)
+
+def cargo_vip(guild_id, vip):
+    """ID do cargo do plano no servidor: o configurado ou o cargo_id fixo em VIPS."""
+    vip_info = VIPS.get(vip)
+    return cargos_vip.cargo(guild_id, vip) or (vip_info["cargo_id"] if vip_info else None)
+
+def trocar_cargo_vip(guild_id, user_id, vip_anterior, vip_novo):
+    """Enfileira a troca de cargo de quem mudou de plano (vip_novo None = perdeu o VIP).
+
+    Não espera o Discord: devolve o cargo que vai ser dado, ou None.
+    """
+    if guild_id is None:
+        return None
+    anterior = cargo_vip(guild_id, vip_anterior) if vip_anterior else None
+    novo = cargo_vip(guild_id, vip_novo) if vip_novo else None
+    if anterior and anterior != novo:
+        sincronizador_cargos.tirar(guild_id, user_id, anterior)
+    if novo:
+        sincronizador_cargos.dar(guild_id, user_id, novo)
+    return novo
+
+async def reconciliar_cargos_vip(guild):
+    """Compara quem tem VIP nos dados com quem tem o cargo no servidor e
+    enfileira as correções (remoções só com REMOVER_CARGOS_SEM_VIP).
+    Devolve quantas foram enfileiradas."""
+    por_cargo = {}  # cargo_id -> {user_id} que deveriam ter o cargo
+    for vip in VIPS:
+        cargo_id = cargo_vip(guild.id, vip)
+        if cargo_id:
+            por_cargo.setdefault(cargo_id, set())
+    if not por_cargo:
+        return 0
+    
+    atual = await economias.obter(guild.id)
+    for vip in VIPS:
+        cargo_id = cargo_vip(guild.id, vip)
+        if cargo_id:
+            por_cargo[cargo_id].update(int(user_id) for user_id in atual.indices.com_vip(vip))
+    if not guild.chunked:
+        await guild.chunk()
+    
+    correcoes = 0
+    for cargo_id, com_vip in por_cargo.items():
+        cargo = guild.get_role(cargo_id)
+        if cargo is None:
+            print(f"⚠️ Cargo VIP {cargo_id} não existe mais em {guild.name}")
+            continue
+        com_cargo = {membro.id for membro in cargo.members}
+        for user_id in com_vip - com_cargo:
+            # Quem saiu do servidor recebe o cargo se voltar (on_member_join)
+            if guild.get_member(user_id) is not None:
+                sincronizador_cargos.dar(guild.id, user_id, cargo_id)
+                correcoes += 1
+        if REMOVER_CARGOS_SEM_VIP:
+            for user_id in com_cargo - com_vip:
+                sincronizador_cargos.tirar(guild.id, user_id, cargo_id)
+                correcoes += 1
+    return correcoes
+
+async def reconciliar_todos_cargos_vip():
+    """Uma vez por processo (tarefa criada no setup_hook), quando o cache de
+    servidores estiver pronto: corrige cargos que mudaram com o bot fora."""
+    await bot.wait_until_ready()
+    for guild in bot.guilds:
+        try:
+            correcoes = await reconciliar_cargos_vip(guild)
+        except Exception as e:
+            print(f"Erro ao conferir cargos VIP de {guild.name}: {e}")
+            continue
+        if correcoes:
+            print(f"[VIP] {guild.name}: {correcoes} cargos fora de sincronia, corrigindo em segundo plano")
+
+# Devolvido por ver_user_data para quem ainda não tem registro
+REGISTRO_PADRAO = RegistroSomenteLeitura()
 
-data = load_data()
+def ver_user_data(user_id):
+    """Dados do usuário só para leitura: não cria registro nem agenda gravação.
+
+    Use em comandos que apenas exibem dados (/saldo, /perfil, menus...); para
+    alterar qualquer campo use get_user_data.
+    """
+    return economia().dados.get(str(user_id), REGISTRO_PADRAO)
 
 def get_user_data(user_id):
     user_id = str(user_id)
-    if user_id not in data:
-        data[user_id] = {
-            "carteira": 1000,
-            "banco": 0,
-            "inventario": {},
-            "trabalho": None,
-            "ultimo_trabalho": None,
-            "ultimo_daily": None,
-            "ultimo_roubo": None,
-            "celular": False,
-            "apps": [],
-            "nivel": 1,
-            "xp": 0,
-            "reputacao": 0,
-            "vip": None,
-            "vip_expira": None,
-            # Anel Supremo usage tracking (separado por subcomando)
-            "anel_ultimo_uso_criar": None,
-            "anel_ultimo_uso_punir": None
-        }
-        save_data(data)
-    return data[user_id]
+    dados = economia().dados
+    if user_id not in dados:
+        dados[user_id] = RegistroUsuario()
+        marcar_alterado(user_id)
+    return dados[user_id]
 
 # ============ EMOJIS E DADOS ============
 
@@ -1431,446 +1750,692 @@ MERCADO_NEGRO = {
     "chip_hacker": {"preco": 30000, "emoji": "🔌", "descricao": "Hackeie sistemas com sucesso"}
 }
 
-# ============ VIEWS E SELECTS - ECONOMIA ============
+# ============ CARREGAMENTO DOS DADOS ============
 
-class LojaView(discord.ui.View):
-    def __init__(self, user_id):
-        super().__init__(timeout=180)
-        self.user_id = user_id
-        self.add_item(LojaSelect(user_id))
-    
-    @discord.ui.button(label="Fechar", emoji="❌", style=discord.ButtonStyle.danger, row=1)
-    async def fechar_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if interaction.user.id != self.user_id:
-            await interaction.response.send_message(f"{EMOJIS['erro']} Esta não é sua loja!", ephemeral=True)
-            return
-        await interaction.message.delete()
+# Inventário e apps ficam em máscaras de bits na ordem destes catálogos
+configurar_catalogos(list(LOJA) + list(MERCADO_NEGRO), list(APPS))
 
-class LojaSelect(discord.ui.Select):
-    def __init__(self, user_id):
-        self.user_id = user_id
-        options = []
-        
-        for item_id, item_info in LOJA.items():
-            if item_info.get("secreto"):
-                continue
-            options.append(
-                discord.SelectOption(
-                    label=item_id.replace('_', ' ').title(),
-                    description=f"R$ {item_info['preco']:,} - {item_info['descricao'][:50]}",
-                    emoji=item_info['emoji'],
-                    value=item_id
-                )
-            )
-        
-        super().__init__(placeholder="Escolha um item para comprar...", options=options, row=0)
-    
-    async def callback(self, interaction: discord.Interaction):
-        if interaction.user.id != self.user_id:
-            await interaction.response.send_message(f"{EMOJIS['erro']} Esta não é sua loja!", ephemeral=True)
-            return
-        
-        item = self.values[0]
-        user_data = get_user_data(self.user_id)
-        
-        if item in user_data["inventario"]:
-            await interaction.response.send_message(f"{EMOJIS['erro']} Você já possui este item!", ephemeral=True)
-            return
-        
-        preco = LOJA[item]["preco"]
-        if user_data["carteira"] < preco:
-            await interaction.response.send_message(
-                f"{EMOJIS['erro']} Saldo insuficiente! Faltam R$ {preco - user_data['carteira']:,}",
-                ephemeral=True
-            )
-            return
-        
-        user_data["carteira"] -= preco
-        user_data["inventario"][item] = 1
-        save_data(data)
-        
-        embed = discord.Embed(
-            title=f"{EMOJIS['sucesso']} Compra Realizada!",
-            description=f"Você adquiriu **{item.replace('_', ' ').title()}** {LOJA[item]['emoji']}\n\n{LOJA[item]['descricao']}",
-            color=discord.Color.green()
-        )
-        embed.add_field(name="Saldo Restante", value=f"R$ {user_data['carteira']:,}")
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+def dados_legados():
+    """Arquivos da economia antiga (de antes de separar por servidor) na pasta do bot.
 
-class EmpregosView(discord.ui.View):
-    def __init__(self, user_id):
-        super().__init__(timeout=180)
-        self.user_id = user_id
-        self.add_item(EmpregosSelect(user_id))
-    
-    @discord.ui.button(label="Fechar", emoji="❌", style=discord.ButtonStyle.danger, row=1)
-    async def fechar_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if interaction.user.id != self.user_id:
-            await interaction.response.send_message(f"{EMOJIS['erro']} Este não é seu menu!", ephemeral=True)
-            return
-        await interaction.message.delete()
+    Só o servidor GUILD_PRINCIPAL lê esses arquivos; sem ele definido, os
+    dados existentes não seriam lidos por nenhum servidor.
+    """
+    candidatos = [DATA_FILE, SNAPSHOT_FILE, JOURNAL_FILE, SQLITE_FILE, SHARDS_DIR]
+    return [caminho for caminho in dict.fromkeys(candidatos) if os.path.exists(caminho)]
+
+# Cooldown de cada ação; o último uso fica no registro do usuário
+ACOES_COOLDOWN = {
+    "daily": Acao("ultimo_daily", DIA),
+    "trabalhar": Acao("ultimo_trabalho", lambda u: TRABALHOS[u["trabalho"]]["tempo"]),
+    "roubar": Acao("ultimo_roubo", 2 * 3600),
+    "anel_criar": Acao("anel_ultimo_uso_criar", diaria=True),
+    "anel_punir": Acao("anel_ultimo_uso_punir", diaria=True),
+}
 
-class EmpregosSelect(discord.ui.Select):
-    def __init__(self, user_id):
-        self.user_id = user_id
-        user_data = get_user_data(user_id)
-        options = []
-        
-        for emprego_id, emprego_info in TRABALHOS.items():
-            disponivel = user_data["nivel"] >= emprego_info["nivel_min"]
-            desc = f"R$ {emprego_info['salario']:,}/h - "
-            desc += "Disponível" if disponivel else f"Nível {emprego_info['nivel_min']} necessário"
-            
-            options.append(
-                discord.SelectOption(
-                    label=emprego_id.title(),
-                    description=desc[:100],
-                    emoji=emprego_info['emoji'],
-                    value=emprego_id
-                )
-            )
-        
-        super().__init__(placeholder="Escolha uma profissão...", options=options, row=0)
-    
-    async def callback(self, interaction: discord.Interaction):
-        if interaction.user.id != self.user_id:
-            await interaction.response.send_message(f"{EMOJIS['erro']} Este não é seu menu!", ephemeral=True)
-            return
-        
-        emprego = self.values[0]
-        user_data = get_user_data(self.user_id)
-        
-        if user_data["nivel"] < TRABALHOS[emprego]["nivel_min"]:
-            await interaction.response.send_message(
-                f"{EMOJIS['erro']} Você precisa ser nível {TRABALHOS[emprego]['nivel_min']} para este emprego!",
-                ephemeral=True
-            )
-            return
-        
-        user_data["trabalho"] = emprego
-        save_data(data)
-        
-        embed = discord.Embed(
-            title=f"{EMOJIS['sucesso']} Parabéns!",
-            description=f"Você foi contratado como **{emprego.title()}**!\n\nComece a trabalhar usando `/trabalhar`",
-            color=discord.Color.green()
-        )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+# Garante que nada pendente se perca ao desligar o bot
+atexit.register(save_data)
 
-class CelularView(discord.ui.View):
-    def __init__(self, user_id):
-        super().__init__(timeout=180)
-        self.user_id = user_id
+# ============ RENDERS EM CACHE ============
+
+# Embeds e opções montados a partir dos catálogos (ver cache_render.py)
+renders = CacheRender()
+
+def montar_embed_admin_ajuda():
+    embed = discord.Embed(
+        title="👑 Comandos Administrativos",
+        description="Lista completa de comandos para administradores:\n",
+        color=discord.Color.gold()
+    )
     
-    @discord.ui.button(label="Play Store", emoji="🏪", style=discord.ButtonStyle.primary)
-    async def playstore_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if interaction.user.id != self.user_id:
-            await interaction.response.send_message(f"{EMOJIS['erro']} Este não é seu celular!", ephemeral=True)
-            return
-        
-        user_data = get_user_data(self.user_id)
-        embed = discord.Embed(
-            title="🏪 Play Store",
-            description="Baixe apps úteis para seu celular!\n",
-            color=discord.Color.green()
-        )
-        
-        for app, info in APPS.items():
-            ja_possui = app in user_data["apps"]
-            status = "✅ Instalado" if ja_possui else f"💰 R$ {info['preco']:,}"
-            
-            embed.add_field(
-                name=f"{info['emoji']} {app.replace('_', ' ').title()}",
-                value=f"{info['beneficio']}\n**{status}**",
-                inline=True
-            )
-        
-        embed.set_footer(text="Use o menu abaixo para instalar apps!")
-        view = PlayStoreView(self.user_id)
-        await interaction.response.edit_message(embed=embed, view=view)
+    embed.add_field(
+        name="💰 Economia",
+        value=(
+            "`/admin_add` - Adicionar dinheiro\n"
+            "`/admin_remove` - Remover dinheiro\n"
+            "`/admin_dar_dinheiro_todos` - Dar dinheiro a todos\n"
+            "`/admin_economia` - Ver estatísticas\n"
+            "`/admin_economia_historico` - Evolução em 24h/7d/30d\n"
+            "`/admin_adiamentos` - Comandos lentos e adiados"
+        ),
+        inline=False
+    )
     
-    @discord.ui.button(label="Mercado Negro", emoji="🎭", style=discord.ButtonStyle.danger)
-    async def mercado_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if interaction.user.id != self.user_id:
-            await interaction.response.send_message(f"{EMOJIS['erro']} Este não é seu celular!", ephemeral=True)
-            return
-        
-        user_data = get_user_data(self.user_id)
-        embed = discord.Embed(
-            title="🎭 Mercado Negro",
-            description="⚠️ Itens raros e ilegais... use por sua conta e risco!\n",
-            color=discord.Color.dark_red()
-        )
-        
-        for item, info in MERCADO_NEGRO.items():
-            ja_possui = item in user_data["inventario"]
-            status = "✅ Possui" if ja_possui else f"💰 R$ {info['preco']:,}"
-            
-            embed.add_field(
-                name=f"{info['emoji']} {item.replace('_', ' ').title()}",
-                value=f"{info['descricao']}\n**{status}**",
-                inline=True
-            )
-        
-        embed.set_footer(text="⚠️ Compras no mercado negro diminuem sua reputação!")
-        view = MercadoNegroView(self.user_id)
-        await interaction.response.edit_message(embed=embed, view=view)
+    embed.add_field(
+        name="🎒 Itens",
+        value=(
+            "`/admin_dar_item` - Dar item\n"
+            "`/admin_remover_item` - Remover item\n"
+            "`/admin_listar_itens` - Listar todos os itens\n"
+            "`/admin_ver_inventario` - Ver inventário de alguém"
+        ),
+        inline=False
+    )
     
-    @discord.ui.button(label="Banco Digital", emoji="💳", style=discord.ButtonStyle.secondary)
-    async def banco_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if interaction.user.id != self.user_id:
-            await interaction.response.send_message(f"{EMOJIS['erro']} Este não é seu celular!", ephemeral=True)
-            return
-        
-        user_data = get_user_data(self.user_id)
-        
-        if "banco_digital" not in user_data["apps"]:
-            await interaction.response.send_message(f"{EMOJIS['erro']} Você precisa do app Banco Digital!", ephemeral=True)
-            return
-        
-        embed = discord.Embed(
-            title="💳 Banco Digital",
-            description="Gerencie suas finanças pelo celular!\n",
-            color=discord.Color.blue()
-        )
-        embed.add_field(name="💰 Carteira", value=f"R$ {user_data['carteira']:,}", inline=True)
-        embed.add_field(name="🏦 Banco", value=f"R$ {user_data['banco']:,}", inline=True)
-        embed.add_field(name="📊 Total", value=f"R$ {user_data['carteira'] + user_data['banco']:,}", inline=True)
-        
-        view = BancoView(self.user_id)
-        await interaction.response.edit_message(embed=embed, view=view)
+    embed.add_field(
+        name="👤 Perfil",
+        value=(
+            "`/admin_set_nivel` - Definir nível\n"
+            "`/admin_set_xp` - Definir XP\n"
+            "`/admin_set_reputacao` - Definir reputação\n"
+            "`/admin_set_trabalho` - Definir trabalho\n"
+            "`/admin_reset` - Resetar dados"
+        ),
+        inline=False
+    )
     
-    @discord.ui.button(label="Meus Apps", emoji="📂", style=discord.ButtonStyle.success)
-    async def apps_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if interaction.user.id != self.user_id:
-            await interaction.response.send_message(f"{EMOJIS['erro']} Este não é seu celular!", ephemeral=True)
-            return
-        
-        user_data = get_user_data(self.user_id)
-        embed = discord.Embed(
-            title="📂 Meus Aplicativos",
-            color=discord.Color.blue()
-        )
-        
-        if not user_data["apps"]:
-            embed.description = "Nenhum app instalado. Visite a Play Store!"
-        else:
-            apps_text = ""
-            for app in user_data["apps"]:
-                if app in APPS:
-                    info = APPS[app]
-                    apps_text += f"{info['emoji']} **{app.replace('_', ' ').title()}**\n{info['beneficio']}\n\n"
-            embed.description = apps_text
-        
-        await interaction.response.edit_message(embed=embed, view=self)
+    embed.add_field(
+        name="🌟 VIP",
+        value=(
+            "`/admin_dar_vip` - Dar VIP a alguém\n"
+            "`/admin_remover_vip` - Remover VIP\n"
+            "`/admin_listar_vips` - Ver todos os VIPs\n"
+            "`/admin_configurar_cargo_vip` - Configurar cargo VIP\n"
+            "`/admin_painel_vip` - Criar painel público de VIP"
+        ),
+        inline=False
+    )
     
-    @discord.ui.button(label="Fechar", emoji="❌", style=discord.ButtonStyle.danger, row=1)
-    async def fechar_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if interaction.user.id != self.user_id:
-            await interaction.response.send_message(f"{EMOJIS['erro']} Este não é seu celular!", ephemeral=True)
-            return
-        await interaction.message.delete()
+    embed.add_field(
+        name="⚠️ Perigoso",
+        value="`/admin_limpar_economia` - Resetar TUDO (requer confirmação)",
+        inline=False
+    )
+    
+    embed.set_footer(text="⚡ Use com responsabilidade!")
+    return embed
 
-class PlayStoreView(discord.ui.View):
-    def __init__(self, user_id):
-        super().__init__(timeout=180)
-        self.user_id = user_id
-        self.add_item(PlayStoreSelect(user_id))
-        
-        voltar_btn = discord.ui.Button(label="Voltar", emoji="◀️", style=discord.ButtonStyle.secondary, row=1)
-        voltar_btn.callback = self.voltar_callback
-        self.add_item(voltar_btn)
+def montar_embed_ajuda():
+    embed = discord.Embed(
+        title=f"{EMOJIS['diamante']} Central de Ajuda",
+        description="Bem-vindo ao sistema de economia mais completo!\n",
+        color=discord.Color.blue()
+    )
     
-    async def voltar_callback(self, interaction: discord.Interaction):
-        if interaction.user.id != self.user_id:
-            await interaction.response.send_message(f"{EMOJIS['erro']} Este não é seu celular!", ephemeral=True)
-            return
+    embed.add_field(
+        name=f"{EMOJIS['dinheiro']} Comandos Básicos",
+        value="`/saldo` - Veja seu saldo\n`/perfil` - Perfil completo\n`/daily` - Auxílio diário\n`/inventario` - Seus itens\n`/ranking top` - Top usuários\n`/ranking posicao` - Sua posição\n`/vip` - Ver seu status VIP\n`/cooldowns` - Quando cada ação libera",
+        inline=False
+    )
+    
+    embed.add_field(
+        name=f"{EMOJIS['trabalho']} Trabalho",
+        value="`/empregos` - Ver e candidatar\n`/trabalhar` - Trabalhar",
+        inline=False
+    )
+    
+    embed.add_field(
+        name=f"{EMOJIS['celular']} Shopping",
+        value="`/loja` - Ver e comprar itens\n`/celular` - Smartphone completo\n`/transferir` - Enviar dinheiro\n`/loja_vip` - 🌟 **Comprar VIP**",
+        inline=False
+    )
+    
+    embed.add_field(
+        name="🎰 Jogos & Riscos",
+        value="`/apostar` - Cara ou coroa\n`/investir` - Bolsa de valores\n`/roubar` - Roubar alguém\n`/crime` - Cometer crimes",
+        inline=False
+    )
+    
+    embed.set_footer(text="💡 Explore os menus interativos!")
+    return embed
+
+def montar_embed_loja_vip():
+    embed = discord.Embed(
+        title="🌟 Loja VIP — Astral Roleplay",
+        description="Apoie o servidor e desbloqueie benefícios exclusivos no jogo e no Discord!\n\n**Use o menu abaixo para comprar:**",
+        color=discord.Color.purple()
+    )
+    
+    for vip_id, vip_info in VIPS.items():
+        beneficios_resumo = "\n".join([f"• {b}" for b in vip_info["beneficios"][:3]])
         
-        user_data = get_user_data(self.user_id)
-        embed = discord.Embed(
-            title=f"{EMOJIS['celular']} Meu Smartphone",
-            description="📱 Seu hub central para tudo!\n\nEscolha um app abaixo:",
-            color=discord.Color.blue()
+        embed.add_field(
+            name=f"{vip_info['emoji']} {vip_info['nome']}",
+            value=f"**R$ {vip_info['preco']:,}**\n{beneficios_resumo}",
+            inline=True
         )
-        embed.add_field(name="📱 Modelo", value="iPhone 15 Pro Max", inline=True)
-        embed.add_field(name="📦 Apps Instalados", value=str(len(user_data["apps"])), inline=True)
-        embed.add_field(name="🔋 Bateria", value="100%", inline=True)
-        
-        view = CelularView(self.user_id)
-        await interaction.response.edit_message(embed=embed, view=view)
+    
+    embed.set_footer(text="💡 O dinheiro do bot será usado para a compra!")
+    return embed
 
-class PlayStoreSelect(discord.ui.Select):
-    def __init__(self, user_id):
-        self.user_id = user_id
-        user_data = get_user_data(user_id)
-        options = []
-        
-        for app_id, app_info in APPS.items():
-            ja_possui = app_id in user_data["apps"]
-            status = "✅ Instalado" if ja_possui else f"R$ {app_info['preco']:,}"
+def montar_embed_loja():
+    embed = discord.Embed(
+        title=f"{EMOJIS['diamante']} Loja de Luxo",
+        description="Invista em itens que trarão benefícios!\n\nUse o menu abaixo para comprar:",
+        color=discord.Color.purple()
+    )
+    
+    for item, info in LOJA.items():
+        if info.get("secreto"):
+            continue
             
-            options.append(
-                discord.SelectOption(
-                    label=app_id.replace('_', ' ').title(),
-                    description=f"{status} - {app_info['beneficio'][:50]}",
-                    emoji=app_info['emoji'],
-                    value=app_id
-                )
-            )
-        
-        super().__init__(placeholder="Escolha um app para instalar...", options=options, row=0)
+        embed.add_field(
+            name=f"{info['emoji']} {item.replace('_', ' ').title()}",
+            value=f"**Preço:** R$ {info['preco']:,}\n{info['descricao']}",
+            inline=True
+        )
+    return embed
+
+def montar_embed_painel_vip():
+    embed = discord.Embed(
+        title="🌟 Planos VIP — Astral Roleplay",
+        description="**Apoie o servidor e desbloqueie benefícios exclusivos no jogo e no Discord!**\n\nUse seus créditos do bot de economia para adquirir VIP!\nEscolha um plano no menu abaixo ou use `/loja_vip`.\n",
+        color=discord.Color.from_rgb(138, 43, 226)
+    )
     
-    async def callback(self, interaction: discord.Interaction):
-        if interaction.user.id != self.user_id:
-            await interaction.response.send_message(f"{EMOJIS['erro']} Este não é seu celular!", ephemeral=True)
-            return
-        
-        app_id = self.values[0]
-        user_data = get_user_data(self.user_id)
-        
-        if app_id in user_data["apps"]:
-            await interaction.response.send_message(f"{EMOJIS['erro']} App já instalado!", ephemeral=True)
-            return
-        
-        preco = APPS[app_id]["preco"]
-        if user_data["carteira"] < preco:
-            await interaction.response.send_message(
-                f"{EMOJIS['erro']} Saldo insuficiente! Faltam R$ {preco - user_data['carteira']:,}",
-                ephemeral=True
-            )
-            return
-        
-        user_data["carteira"] -= preco
-        user_data["apps"].append(app_id)
-        save_data(data)
-        
-        await interaction.response.send_message(
-            f"{EMOJIS['sucesso']} **{app_id.replace('_', ' ').title()}** instalado com sucesso!",
-            ephemeral=True
+    embed.add_field(
+        name="⭐ VIP Alpha — R$3.000",
+        value="• Acesso à área VIP\n• Fila prioritária em tickets\n• **R$100.000,00** no jogo",
+        inline=False
+    )
+    
+    embed.add_field(
+        name="💎 VIP Beta — R$10.000",
+        value="• Tudo do Alpha\n• **R$250.000,00** no jogo\n• Cargo diferenciado no Discord",
+        inline=False
+    )
+    
+    embed.add_field(
+        name="👑 VIP Ômega — R$18.000",
+        value="• Tudo do Beta\n• **R$300.000,00** no jogo\n• Salário VIP",
+        inline=False
+    )
+    
+    embed.add_field(
+        name="💠 VIP Diamond — R$30.000",
+        value="• Tudo do Ômega\n• **R$750.000,00** no jogo\n• Loja VIP no jogo\n• Tag VIP DIAMOND\n• 1 veículo exclusivo",
+        inline=False
+    )
+    
+    embed.add_field(
+        name="💫 VIP Diamond 2.0 — R$50.000",
+        value="• Tudo do Diamond\n• 2 veículos únicos\n• **R$1.000.000,00** no jogo\n• Acesso antecipado a updates\n• Cores especiais no chat",
+        inline=False
+    )
+    
+    embed.set_footer(text="💰 Use /loja_vip para comprar | 🎮 Entre no servidor após a compra para receber os benefícios")
+    return embed
+
+def montar_linhas_itens():
+    """(item, início, fim) de cada linha do /admin_listar_itens; a contagem entra no meio."""
+    linhas_loja = [
+        (item, f"{info['emoji']} `{item}`", " ⚠️ **SECRETO**" if info.get("secreto") else "")
+        for item, info in LOJA.items()
+    ]
+    linhas_mercado = [(item, f"{info['emoji']} `{item}`", "") for item, info in MERCADO_NEGRO.items()]
+    return linhas_loja, linhas_mercado
+
+def montar_opcoes_loja():
+    return [
+        discord.SelectOption(
+            label=item_id.replace('_', ' ').title(),
+            description=f"R$ {item_info['preco']:,} - {item_info['descricao'][:50]}",
+            emoji=item_info['emoji'],
+            value=item_id
         )
+        for item_id, item_info in LOJA.items()
+        if not item_info.get("secreto")
+    ]
 
-class MercadoNegroView(discord.ui.View):
+def montar_opcoes_vip():
+    return [
+        discord.SelectOption(
+            label=vip_info['nome'],
+            description=f"R$ {vip_info['preco']:,} - {vip_info['beneficios'][0][:50]}",
+            emoji=vip_info['emoji'],
+            value=vip_id
+        )
+        for vip_id, vip_info in VIPS.items()
+    ]
+
+def montar_opcoes_play_store():
+    """{app: (opção para comprar, opção de já instalado)}"""
+    def opcao(app_id, app_info, status):
+        return discord.SelectOption(
+            label=app_id.replace('_', ' ').title(),
+            description=f"{status} - {app_info['beneficio'][:50]}",
+            emoji=app_info['emoji'],
+            value=app_id
+        )
+    return {
+        app_id: (opcao(app_id, app_info, f"R$ {app_info['preco']:,}"), opcao(app_id, app_info, "✅ Instalado"))
+        for app_id, app_info in APPS.items()
+    }
+
+def montar_opcoes_mercado_negro():
+    """{item: (opção para comprar, opção de já possui)}"""
+    def opcao(item_id, item_info, status):
+        return discord.SelectOption(
+            label=item_id.replace('_', ' ').title(),
+            description=f"{status} - {item_info['descricao'][:50]}",
+            emoji=item_info['emoji'],
+            value=item_id
+        )
+    return {
+        item_id: (opcao(item_id, item_info, f"R$ {item_info['preco']:,}"), opcao(item_id, item_info, "✅ Possui"))
+        for item_id, item_info in MERCADO_NEGRO.items()
+    }
+
+def montar_campos_play_store():
+    """{app: (nome do campo, valor para comprar, valor de já instalado)}"""
+    return {
+        app: (
+            f"{info['emoji']} {app.replace('_', ' ').title()}",
+            f"{info['beneficio']}\n**💰 R$ {info['preco']:,}**",
+            f"{info['beneficio']}\n**✅ Instalado**",
+        )
+        for app, info in APPS.items()
+    }
+
+def montar_campos_mercado_negro():
+    """{item: (nome do campo, valor para comprar, valor de já possui)}"""
+    return {
+        item: (
+            f"{info['emoji']} {item.replace('_', ' ').title()}",
+            f"{info['descricao']}\n**💰 R$ {info['preco']:,}**",
+            f"{info['descricao']}\n**✅ Possui**",
+        )
+        for item, info in MERCADO_NEGRO.items()
+    }
+
+MONTADORES = {
+    "admin_ajuda": montar_embed_admin_ajuda,
+    "ajuda": montar_embed_ajuda,
+    "loja_vip": montar_embed_loja_vip,
+    "loja": montar_embed_loja,
+    "painel_vip": montar_embed_painel_vip,
+    "linhas_itens": montar_linhas_itens,
+    "opcoes_loja": montar_opcoes_loja,
+    "opcoes_vip": montar_opcoes_vip,
+    "opcoes_play_store": montar_opcoes_play_store,
+    "opcoes_mercado_negro": montar_opcoes_mercado_negro,
+    "campos_play_store": montar_campos_play_store,
+    "campos_mercado_negro": montar_campos_mercado_negro,
+}
+
+def preparar_renders():
+    """Monta tudo de uma vez na inicialização (o resto do tempo vem do cache)."""
+    for chave, montar in MONTADORES.items():
+        renders.obter(chave, montar)
+
+# ============ VIEWS E SELECTS - ECONOMIA ============
+
+class ViewEconomia(discord.ui.View):
+    """View cujos botões/menus rodam sobre a economia do servidor da interação."""
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        await selecionar_economia(interaction)
+        return True
+
+class ModalEconomia(discord.ui.Modal):
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        await selecionar_economia(interaction)
+        return True
+
+# ---- Menus persistentes ----
+# Os botões e menus de seleção das views abaixo não guardam estado: o
+# custom_id leva o menu, a ação e o dono ("eco:celular:banco:1234") e o clique
+# é tratado pela função registrada com @acao_menu. BotaoMenu e SelecaoMenu são
+# registrados uma vez no setup_hook (bot.add_dynamic_items), então os menus
+# continuam funcionando depois de reiniciar o bot e nada fica em memória por
+# mensagem aberta. Dono 0 = qualquer um pode usar (painel público).
+
+ACOES_MENU = {}  # (menu, ação) -> async função(interaction, user_id, valor)
+
+AVISOS_DONO = {
+    "loja": "Esta não é sua loja!",
+    "empregos": "Este não é seu menu!",
+    "celular": "Este não é seu celular!",
+    "vip": "Este não é seu painel!",
+    "compra_vip": "Esta não é sua compra!",
+}
+
+def acao_menu(menu, acao):
+    def registrar(funcao):
+        ACOES_MENU[(menu, acao)] = funcao
+        return funcao
+    return registrar
+
+class ItemMenu:
+    """Parte comum de BotaoMenu e SelecaoMenu: confere o dono e despacha."""
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        await selecionar_economia(interaction)
+        if (self.menu, self.acao) not in ACOES_MENU:
+            # Botão de uma versão antiga do bot
+            await responder(interaction, f"{EMOJIS['erro']} Este menu expirou, use o comando de novo!", ephemeral=True)
+            return False
+        if self.dono and interaction.user.id != self.dono:
+            await responder(interaction, f"{EMOJIS['erro']} {AVISOS_DONO[self.menu]}", ephemeral=True)
+            return False
+        return True
+
+    async def callback(self, interaction: discord.Interaction):
+        funcao = ACOES_MENU[(self.menu, self.acao)]
+        await funcao(interaction, self.dono or interaction.user.id, self.valor())
+
+class BotaoMenu(ItemMenu, discord.ui.DynamicItem[discord.ui.Button],
+                template=r"eco:(?P<menu>[a-z_]+):(?P<acao>[a-z_]+):(?P<dono>\d+)(?::(?P<arg>\w+))?"):
+    def __init__(self, menu, acao, dono, arg=None, **kwargs):
+        custom_id = f"eco:{menu}:{acao}:{dono}" + (f":{arg}" if arg else "")
+        super().__init__(discord.ui.Button(custom_id=custom_id, **kwargs))
+        self.menu, self.acao, self.dono, self.arg = menu, acao, dono, arg
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item, match):
+        return cls(match["menu"], match["acao"], int(match["dono"]), match["arg"])
+
+    def valor(self):
+        return self.arg
+
+class SelecaoMenu(ItemMenu, discord.ui.DynamicItem[discord.ui.Select],
+                  template=r"eco-sel:(?P<menu>[a-z_]+):(?P<acao>[a-z_]+):(?P<dono>\d+)"):
+    def __init__(self, menu, acao, dono, **kwargs):
+        super().__init__(discord.ui.Select(custom_id=f"eco-sel:{menu}:{acao}:{dono}", **kwargs))
+        self.menu, self.acao, self.dono = menu, acao, dono
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item, match):
+        return cls(match["menu"], match["acao"], int(match["dono"]))
+
+    def valor(self):
+        return self.item.values[0]
+
+def botao_fechar(menu, user_id):
+    return BotaoMenu(menu, "fechar", user_id, label="Fechar", emoji="❌", style=discord.ButtonStyle.danger, row=1)
+
+@acao_menu("loja", "fechar")
+@acao_menu("empregos", "fechar")
+@acao_menu("celular", "fechar")
+@acao_menu("vip", "fechar")
+async def fechar_menu(interaction: discord.Interaction, user_id, valor):
+    await interaction.message.delete()
+
+# ---- Loja ----
+
+class LojaView(discord.ui.View):
     def __init__(self, user_id):
-        super().__init__(timeout=180)
-        self.user_id = user_id
-        self.add_item(MercadoNegroSelect(user_id))
-        
-        voltar_btn = discord.ui.Button(label="Voltar", emoji="◀️", style=discord.ButtonStyle.secondary, row=1)
-        voltar_btn.callback = self.voltar_callback
-        self.add_item(voltar_btn)
+        super().__init__(timeout=None)
+        self.add_item(SelecaoMenu(
+            "loja", "comprar", user_id,
+            placeholder="Escolha um item para comprar...",
+            options=list(renders.obter("opcoes_loja", montar_opcoes_loja)),
+            row=0
+        ))
+        self.add_item(botao_fechar("loja", user_id))
+
+@acao_menu("loja", "comprar")
+async def comprar_item_loja(interaction: discord.Interaction, user_id, item):
+    user_data = get_user_data(user_id)
     
-    async def voltar_callback(self, interaction: discord.Interaction):
-        if interaction.user.id != self.user_id:
-            await interaction.response.send_message(f"{EMOJIS['erro']} Este não é seu celular!", ephemeral=True)
-            return
-        
-        user_data = get_user_data(self.user_id)
-        embed = discord.Embed(
-            title=f"{EMOJIS['celular']} Meu Smartphone",
-            description="📱 Seu hub central para tudo!\n\nEscolha um app abaixo:",
-            color=discord.Color.blue()
+    if item in user_data["inventario"]:
+        await responder(interaction, f"{EMOJIS['erro']} Você já possui este item!", ephemeral=True)
+        return
+    
+    preco = LOJA[item]["preco"]
+    if user_data["carteira"] < preco:
+        await responder(
+            interaction,
+            f"{EMOJIS['erro']} Saldo insuficiente! Faltam R$ {preco - user_data['carteira']:,}",
+            ephemeral=True
         )
-        embed.add_field(name="📱 Modelo", value="iPhone 15 Pro Max", inline=True)
-        embed.add_field(name="📦 Apps Instalados", value=str(len(user_data["apps"])), inline=True)
-        embed.add_field(name="🔋 Bateria", value="100%", inline=True)
-        
-        view = CelularView(self.user_id)
-        await interaction.response.edit_message(embed=embed, view=view)
+        return
+    
+    user_data["carteira"] -= preco
+    user_data["inventario"][item] = 1
+    marcar_alterado(user_id)
+    
+    embed = discord.Embed(
+        title=f"{EMOJIS['sucesso']} Compra Realizada!",
+        description=f"Você adquiriu **{item.replace('_', ' ').title()}** {LOJA[item]['emoji']}\n\n{LOJA[item]['descricao']}",
+        color=discord.Color.green()
+    )
+    embed.add_field(name="Saldo Restante", value=f"R$ {user_data['carteira']:,}")
+    await responder(interaction, embed=embed, ephemeral=True)
 
-class MercadoNegroSelect(discord.ui.Select):
+# ---- Empregos ----
+
+class EmpregosView(discord.ui.View):
     def __init__(self, user_id):
-        self.user_id = user_id
-        user_data = get_user_data(user_id)
+        super().__init__(timeout=None)
+        user_data = ver_user_data(user_id)
         options = []
         
-        for item_id, item_info in MERCADO_NEGRO.items():
-            ja_possui = item_id in user_data["inventario"]
-            status = "✅ Possui" if ja_possui else f"R$ {item_info['preco']:,}"
+        for emprego_id, emprego_info in TRABALHOS.items():
+            disponivel = user_data["nivel"] >= emprego_info["nivel_min"]
+            desc = f"R$ {emprego_info['salario']:,}/h - "
+            desc += "Disponível" if disponivel else f"Nível {emprego_info['nivel_min']} necessário"
             
             options.append(
                 discord.SelectOption(
-                    label=item_id.replace('_', ' ').title(),
-                    description=f"{status} - {item_info['descricao'][:50]}",
-                    emoji=item_info['emoji'],
-                    value=item_id
+                    label=emprego_id.title(),
+                    description=desc[:100],
+                    emoji=emprego_info['emoji'],
+                    value=emprego_id
                 )
             )
         
-        super().__init__(placeholder="Escolha um item para comprar...", options=options, row=0)
+        self.add_item(SelecaoMenu("empregos", "contratar", user_id, placeholder="Escolha uma profissão...", options=options, row=0))
+        self.add_item(botao_fechar("empregos", user_id))
+
+@acao_menu("empregos", "contratar")
+async def contratar_emprego(interaction: discord.Interaction, user_id, emprego):
+    user_data = get_user_data(user_id)
     
-    async def callback(self, interaction: discord.Interaction):
-        if interaction.user.id != self.user_id:
-            await interaction.response.send_message(f"{EMOJIS['erro']} Este não é seu celular!", ephemeral=True)
-            return
-        
-        item_id = self.values[0]
-        user_data = get_user_data(self.user_id)
-        
-        if item_id in user_data["inventario"]:
-            await interaction.response.send_message(f"{EMOJIS['erro']} Você já possui este item!", ephemeral=True)
-            return
-        
-        preco = MERCADO_NEGRO[item_id]["preco"]
-        if user_data["carteira"] < preco:
-            await interaction.response.send_message(
-                f"{EMOJIS['erro']} Dinheiro insuficiente! Faltam R$ {preco - user_data['carteira']:,}",
-                ephemeral=True
-            )
-            return
-        
-        user_data["carteira"] -= preco
-        user_data["inventario"][item_id] = 1
-        user_data["reputacao"] -= 20
-        save_data(data)
-        
-        await interaction.response.send_message(
-            f"{EMOJIS['roubou']} **{item_id.replace('_', ' ').title()}** comprado! Sua reputação diminuiu (-20).",
+    if user_data["nivel"] < TRABALHOS[emprego]["nivel_min"]:
+        await responder(
+            interaction,
+            f"{EMOJIS['erro']} Você precisa ser nível {TRABALHOS[emprego]['nivel_min']} para este emprego!",
             ephemeral=True
         )
+        return
+    
+    user_data["trabalho"] = emprego
+    # O cooldown de /trabalhar depende do tempo do trabalho atual
+    economia().cooldowns.recalcular(user_id, "trabalhar", user_data, int(time.time()))
+    marcar_alterado(user_id)
+    
+    embed = discord.Embed(
+        title=f"{EMOJIS['sucesso']} Parabéns!",
+        description=f"Você foi contratado como **{emprego.title()}**!\n\nComece a trabalhar usando `/trabalhar`",
+        color=discord.Color.green()
+    )
+    await responder(interaction, embed=embed, ephemeral=True)
+
+# ---- Celular ----
+
+def embed_celular(user_data):
+    embed = discord.Embed(
+        title=f"{EMOJIS['celular']} Meu Smartphone",
+        description="📱 Seu hub central para tudo!\n\nEscolha um app abaixo:",
+        color=discord.Color.blue()
+    )
+    embed.add_field(name="📱 Modelo", value="iPhone 15 Pro Max", inline=True)
+    embed.add_field(name="📦 Apps Instalados", value=str(len(user_data["apps"])), inline=True)
+    embed.add_field(name="🔋 Bateria", value="100%", inline=True)
+    return embed
+
+def botao_voltar_celular(user_id, row=None):
+    return BotaoMenu("celular", "inicio", user_id, label="Voltar", emoji="◀️", style=discord.ButtonStyle.secondary, row=row)
+
+class CelularView(discord.ui.View):
+    def __init__(self, user_id):
+        super().__init__(timeout=None)
+        self.add_item(BotaoMenu("celular", "play_store", user_id, label="Play Store", emoji="🏪", style=discord.ButtonStyle.primary))
+        self.add_item(BotaoMenu("celular", "mercado_negro", user_id, label="Mercado Negro", emoji="🎭", style=discord.ButtonStyle.danger))
+        self.add_item(BotaoMenu("celular", "banco", user_id, label="Banco Digital", emoji="💳", style=discord.ButtonStyle.secondary))
+        self.add_item(BotaoMenu("celular", "apps", user_id, label="Meus Apps", emoji="📂", style=discord.ButtonStyle.success))
+        self.add_item(botao_fechar("celular", user_id))
+
+class PlayStoreView(discord.ui.View):
+    def __init__(self, user_id):
+        super().__init__(timeout=None)
+        user_data = ver_user_data(user_id)
+        variantes = renders.obter("opcoes_play_store", montar_opcoes_play_store)
+        options = [
+            instalado if app_id in user_data["apps"] else comprar
+            for app_id, (comprar, instalado) in variantes.items()
+        ]
+        self.add_item(SelecaoMenu("celular", "instalar", user_id, placeholder="Escolha um app para instalar...", options=options, row=0))
+        self.add_item(botao_voltar_celular(user_id, row=1))
+
+class MercadoNegroView(discord.ui.View):
+    def __init__(self, user_id):
+        super().__init__(timeout=None)
+        user_data = ver_user_data(user_id)
+        variantes = renders.obter("opcoes_mercado_negro", montar_opcoes_mercado_negro)
+        options = [
+            possui if item_id in user_data["inventario"] else comprar
+            for item_id, (comprar, possui) in variantes.items()
+        ]
+        self.add_item(SelecaoMenu("celular", "comprar_ilegal", user_id, placeholder="Escolha um item para comprar...", options=options, row=0))
+        self.add_item(botao_voltar_celular(user_id, row=1))
 
 class BancoView(discord.ui.View):
     def __init__(self, user_id):
-        super().__init__(timeout=180)
-        self.user_id = user_id
+        super().__init__(timeout=None)
+        self.add_item(BotaoMenu("celular", "depositar", user_id, label="Depositar", emoji="⬇️", style=discord.ButtonStyle.success))
+        self.add_item(BotaoMenu("celular", "sacar", user_id, label="Sacar", emoji="⬆️", style=discord.ButtonStyle.primary))
+        self.add_item(botao_voltar_celular(user_id))
+
+@acao_menu("celular", "inicio")
+async def abrir_celular(interaction: discord.Interaction, user_id, valor):
+    embed = embed_celular(ver_user_data(user_id))
+    await interaction.response.edit_message(embed=embed, view=CelularView(user_id))
+
+@acao_menu("celular", "play_store")
+async def abrir_play_store(interaction: discord.Interaction, user_id, valor):
+    user_data = ver_user_data(user_id)
+    embed = discord.Embed(
+        title="🏪 Play Store",
+        description="Baixe apps úteis para seu celular!\n",
+        color=discord.Color.green()
+    )
     
-    @discord.ui.button(label="Depositar", emoji="⬇️", style=discord.ButtonStyle.success)
-    async def depositar_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if interaction.user.id != self.user_id:
-            await interaction.response.send_message(f"{EMOJIS['erro']} Este não é seu celular!", ephemeral=True)
-            return
-        
-        modal = DepositarModal(self.user_id)
-        await interaction.response.send_modal(modal)
+    for app, (nome, comprar, instalado) in renders.obter("campos_play_store", montar_campos_play_store).items():
+        embed.add_field(name=nome, value=instalado if app in user_data["apps"] else comprar, inline=True)
     
-    @discord.ui.button(label="Sacar", emoji="⬆️", style=discord.ButtonStyle.primary)
-    async def sacar_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if interaction.user.id != self.user_id:
-            await interaction.response.send_message(f"{EMOJIS['erro']} Este não é seu celular!", ephemeral=True)
-            return
-        
-        modal = SacarModal(self.user_id)
-        await interaction.response.send_modal(modal)
+    embed.set_footer(text="Use o menu abaixo para instalar apps!")
+    await interaction.response.edit_message(embed=embed, view=PlayStoreView(user_id))
+
+@acao_menu("celular", "mercado_negro")
+async def abrir_mercado_negro(interaction: discord.Interaction, user_id, valor):
+    user_data = ver_user_data(user_id)
+    embed = discord.Embed(
+        title="🎭 Mercado Negro",
+        description="⚠️ Itens raros e ilegais... use por sua conta e risco!\n",
+        color=discord.Color.dark_red()
+    )
     
-    @discord.ui.button(label="Voltar", emoji="◀️", style=discord.ButtonStyle.secondary)
-    async def voltar_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if interaction.user.id != self.user_id:
-            await interaction.response.send_message(f"{EMOJIS['erro']} Este não é seu celular!", ephemeral=True)
-            return
-        
-        user_data = get_user_data(self.user_id)
-        embed = discord.Embed(
-            title=f"{EMOJIS['celular']} Meu Smartphone",
-            description="📱 Seu hub central para tudo!\n\nEscolha um app abaixo:",
-            color=discord.Color.blue()
+    for item, (nome, comprar, possui) in renders.obter("campos_mercado_negro", montar_campos_mercado_negro).items():
+        embed.add_field(name=nome, value=possui if item in user_data["inventario"] else comprar, inline=True)
+    
+    embed.set_footer(text="⚠️ Compras no mercado negro diminuem sua reputação!")
+    await interaction.response.edit_message(embed=embed, view=MercadoNegroView(user_id))
+
+@acao_menu("celular", "banco")
+async def abrir_banco(interaction: discord.Interaction, user_id, valor):
+    user_data = ver_user_data(user_id)
+    
+    if "banco_digital" not in user_data["apps"]:
+        await responder(interaction, f"{EMOJIS['erro']} Você precisa do app Banco Digital!", ephemeral=True)
+        return
+    
+    embed = discord.Embed(
+        title="💳 Banco Digital",
+        description="Gerencie suas finanças pelo celular!\n",
+        color=discord.Color.blue()
+    )
+    embed.add_field(name="💰 Carteira", value=f"R$ {user_data['carteira']:,}", inline=True)
+    embed.add_field(name="🏦 Banco", value=f"R$ {user_data['banco']:,}", inline=True)
+    embed.add_field(name="📊 Total", value=f"R$ {user_data['carteira'] + user_data['banco']:,}", inline=True)
+    
+    await interaction.response.edit_message(embed=embed, view=BancoView(user_id))
+
+@acao_menu("celular", "apps")
+async def meus_apps(interaction: discord.Interaction, user_id, valor):
+    user_data = ver_user_data(user_id)
+    embed = discord.Embed(
+        title="📂 Meus Aplicativos",
+        color=discord.Color.blue()
+    )
+    
+    if not user_data["apps"]:
+        embed.description = "Nenhum app instalado. Visite a Play Store!"
+    else:
+        apps_text = ""
+        for app in user_data["apps"]:
+            if app in APPS:
+                info = APPS[app]
+                apps_text += f"{info['emoji']} **{app.replace('_', ' ').title()}**\n{info['beneficio']}\n\n"
+        embed.description = apps_text
+    
+    await interaction.response.edit_message(embed=embed, view=CelularView(user_id))
+
+@acao_menu("celular", "instalar")
+async def instalar_app(interaction: discord.Interaction, user_id, app_id):
+    user_data = get_user_data(user_id)
+    
+    if app_id in user_data["apps"]:
+        await responder(interaction, f"{EMOJIS['erro']} App já instalado!", ephemeral=True)
+        return
+    
+    preco = APPS[app_id]["preco"]
+    if user_data["carteira"] < preco:
+        await responder(
+            interaction,
+            f"{EMOJIS['erro']} Saldo insuficiente! Faltam R$ {preco - user_data['carteira']:,}",
+            ephemeral=True
         )
-        embed.add_field(name="📱 Modelo", value="iPhone 15 Pro Max", inline=True)
-        embed.add_field(name="📦 Apps Instalados", value=str(len(user_data["apps"])), inline=True)
-        embed.add_field(name="🔋 Bateria", value="100%", inline=True)
-        
-        view = CelularView(self.user_id)
-        await interaction.response.edit_message(embed=embed, view=view)
+        return
+    
+    user_data["carteira"] -= preco
+    user_data["apps"].append(app_id)
+    marcar_alterado(user_id)
+    
+    await responder(
+        interaction,
+        f"{EMOJIS['sucesso']} **{app_id.replace('_', ' ').title()}** instalado com sucesso!",
+        ephemeral=True
+    )
+
+@acao_menu("celular", "comprar_ilegal")
+async def comprar_mercado_negro(interaction: discord.Interaction, user_id, item_id):
+    user_data = get_user_data(user_id)
+    
+    if item_id in user_data["inventario"]:
+        await responder(interaction, f"{EMOJIS['erro']} Você já possui este item!", ephemeral=True)
+        return
+    
+    preco = MERCADO_NEGRO[item_id]["preco"]
+    if user_data["carteira"] < preco:
+        await responder(
+            interaction,
+            f"{EMOJIS['erro']} Dinheiro insuficiente! Faltam R$ {preco - user_data['carteira']:,}",
+            ephemeral=True
+        )
+        return
+    
+    user_data["carteira"] -= preco
+    user_data["inventario"][item_id] = 1
+    user_data["reputacao"] -= 20
+    marcar_alterado(user_id)
+    
+    await responder(
+        interaction,
+        f"{EMOJIS['roubou']} **{item_id.replace('_', ' ').title()}** comprado! Sua reputação diminuiu (-20).",
+        ephemeral=True
+    )
 
-class DepositarModal(discord.ui.Modal, title="Depositar Dinheiro"):
+@acao_menu("celular", "depositar")
+async def abrir_deposito(interaction: discord.Interaction, user_id, valor):
+    await interaction.response.send_modal(DepositarModal(user_id))
+
+@acao_menu("celular", "sacar")
+async def abrir_saque(interaction: discord.Interaction, user_id, valor):
+    await interaction.response.send_modal(SacarModal(user_id))
+
+class DepositarModal(ModalEconomia, title="Depositar Dinheiro"):
     def __init__(self, user_id):
         super().__init__()
         self.user_id = user_id
@@ -1882,30 +2447,32 @@ class DepositarModal(discord.ui.Modal, title="Depositar Dinheiro"):
     )
     
     async def on_submit(self, interaction: discord.Interaction):
-        try:
-            valor = int(self.quantia.value)
-            user_data = get_user_data(self.user_id)
-            
-            if valor <= 0:
-                await interaction.response.send_message(f"{EMOJIS['erro']} Valor inválido!", ephemeral=True)
-                return
-            
-            if user_data["carteira"] < valor:
-                await interaction.response.send_message(f"{EMOJIS['erro']} Saldo insuficiente!", ephemeral=True)
-                return
-            
-            user_data["carteira"] -= valor
-            user_data["banco"] += valor
-            save_data(data)
-            
-            await interaction.response.send_message(
-                f"{EMOJIS['sucesso']} R$ {valor:,} depositados com sucesso!",
-                ephemeral=True
-            )
-        except ValueError:
-            await interaction.response.send_message(f"{EMOJIS['erro']} Digite apenas números!", ephemeral=True)
+        async with travar_usuarios(self.user_id):
+            try:
+                valor = int(self.quantia.value)
+                user_data = get_user_data(self.user_id)
+                
+                if valor <= 0:
+                    await responder(interaction, f"{EMOJIS['erro']} Valor inválido!", ephemeral=True)
+                    return
+                
+                if user_data["carteira"] < valor:
+                    await responder(interaction, f"{EMOJIS['erro']} Saldo insuficiente!", ephemeral=True)
+                    return
+                
+                user_data["carteira"] -= valor
+                user_data["banco"] += valor
+                marcar_alterado(self.user_id)
+                
+                await responder(
+                    interaction,
+                    f"{EMOJIS['sucesso']} R$ {valor:,} depositados com sucesso!",
+                    ephemeral=True
+                )
+            except ValueError:
+                await responder(interaction, f"{EMOJIS['erro']} Digite apenas números!", ephemeral=True)
 
-class SacarModal(discord.ui.Modal, title="Sacar Dinheiro"):
+class SacarModal(ModalEconomia, title="Sacar Dinheiro"):
     def __init__(self, user_id):
         super().__init__()
         self.user_id = user_id
@@ -1917,152 +2484,258 @@ class SacarModal(discord.ui.Modal, title="Sacar Dinheiro"):
     )
     
     async def on_submit(self, interaction: discord.Interaction):
-        try:
-            valor = int(self.quantia.value)
-            user_data = get_user_data(self.user_id)
-            
-            if valor <= 0:
-                await interaction.response.send_message(f"{EMOJIS['erro']} Valor inválido!", ephemeral=True)
-                return
-            
-            if user_data["banco"] < valor:
-                await interaction.response.send_message(f"{EMOJIS['erro']} Saldo insuficiente no banco!", ephemeral=True)
-                return
-            
-            user_data["banco"] -= valor
-            user_data["carteira"] += valor
-            save_data(data)
-            
-            await interaction.response.send_message(
-                f"{EMOJIS['sucesso']} R$ {valor:,} sacados com sucesso!",
-                ephemeral=True
-            )
-        except ValueError:
-            await interaction.response.send_message(f"{EMOJIS['erro']} Digite apenas números!", ephemeral=True)
+        async with travar_usuarios(self.user_id):
+            try:
+                valor = int(self.quantia.value)
+                user_data = get_user_data(self.user_id)
+                
+                if valor <= 0:
+                    await responder(interaction, f"{EMOJIS['erro']} Valor inválido!", ephemeral=True)
+                    return
+                
+                if user_data["banco"] < valor:
+                    await responder(interaction, f"{EMOJIS['erro']} Saldo insuficiente no banco!", ephemeral=True)
+                    return
+                
+                user_data["banco"] -= valor
+                user_data["carteira"] += valor
+                marcar_alterado(self.user_id)
+                
+                await responder(
+                    interaction,
+                    f"{EMOJIS['sucesso']} R$ {valor:,} sacados com sucesso!",
+                    ephemeral=True
+                )
+            except ValueError:
+                await responder(interaction, f"{EMOJIS['erro']} Digite apenas números!", ephemeral=True)
 
-# ============ VIEWS VIP ============
+# ============ PAGINAÇÃO ============
 
-class VIPPainelView(discord.ui.View):
-    def __init__(self, user_id):
+class PaginadorView(ViewEconomia):
+    """Lista paginada que só monta a página sendo mostrada.
+    
+    - `total()`: quantidade de itens da lista
+    - `itens(inicio, quantidade)`: itens de uma página, lidos direto do índice
+    - `renderizar(interaction, itens, inicio)`: monta o embed da página (só
+      resolve os nomes dos itens dela)
+    - `posicao(user_id)`: índice do usuário na lista (None se não estiver),
+      usado pelo botão "Me encontrar"
+    """
+    
+    def __init__(self, user_id, total, itens, renderizar, posicao=None, por_pagina=10):
         super().__init__(timeout=300)
         self.user_id = user_id
-        self.add_item(VIPSelect(user_id))
-    
-    @discord.ui.button(label="Meu VIP", emoji="👤", style=discord.ButtonStyle.secondary, row=1)
-    async def meu_vip_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.total = total
+        self.itens = itens
+        self.renderizar = renderizar
+        self.posicao = posicao
+        self.por_pagina = por_pagina
+        self.pagina = 0
+        if posicao is None:
+            self.remove_item(self.me_encontrar_button)
+    
+    @property
+    def total_paginas(self):
+        return max(1, -(-self.total() // self.por_pagina))
+    
+    async def embed_pagina(self, interaction: discord.Interaction):
+        # A lista pode ter encolhido desde o último clique
+        self.pagina = max(0, min(self.pagina, self.total_paginas - 1))
+        inicio = self.pagina * self.por_pagina
+        embed = await self.renderizar(interaction, self.itens(inicio, self.por_pagina), inicio)
+        rodape = f"Página {self.pagina + 1}/{self.total_paginas}"
+        embed.set_footer(text=f"{embed.footer.text} • {rodape}" if embed.footer.text else rodape)
+        
+        primeira, ultima = self.pagina == 0, self.pagina == self.total_paginas - 1
+        self.primeira_button.disabled = self.anterior_button.disabled = primeira
+        self.proxima_button.disabled = self.ultima_button.disabled = ultima
+        return embed
+    
+    async def ir_para(self, interaction: discord.Interaction, pagina):
+        self.pagina = pagina
+        await interaction.response.edit_message(embed=await self.embed_pagina(interaction), view=self)
+    
+    async def _dono(self, interaction: discord.Interaction):
         if interaction.user.id != self.user_id:
-            await interaction.response.send_message(f"{EMOJIS['erro']} Este não é seu painel!", ephemeral=True)
+            await responder(interaction, f"{EMOJIS['erro']} Esta lista não é sua! Use o comando você mesmo.", ephemeral=True)
+            return False
+        return True
+    
+    @discord.ui.button(emoji="⏮️", style=discord.ButtonStyle.secondary, row=0)
+    async def primeira_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if await self._dono(interaction):
+            await self.ir_para(interaction, 0)
+    
+    @discord.ui.button(emoji="◀️", style=discord.ButtonStyle.primary, row=0)
+    async def anterior_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if await self._dono(interaction):
+            await self.ir_para(interaction, self.pagina - 1)
+    
+    @discord.ui.button(label="Ir para...", emoji="🔢", style=discord.ButtonStyle.secondary, row=0)
+    async def ir_para_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if await self._dono(interaction):
+            await interaction.response.send_modal(IrParaPaginaModal(self))
+    
+    @discord.ui.button(emoji="▶️", style=discord.ButtonStyle.primary, row=0)
+    async def proxima_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if await self._dono(interaction):
+            await self.ir_para(interaction, self.pagina + 1)
+    
+    @discord.ui.button(emoji="⏭️", style=discord.ButtonStyle.secondary, row=0)
+    async def ultima_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if await self._dono(interaction):
+            await self.ir_para(interaction, self.total_paginas - 1)
+    
+    @discord.ui.button(label="Me encontrar", emoji="🔎", style=discord.ButtonStyle.success, row=1)
+    async def me_encontrar_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if not await self._dono(interaction):
             return
-        
-        user_data = get_user_data(self.user_id)
-        embed = discord.Embed(title="👤 Seu Status VIP", color=discord.Color.blue())
-        
-        if user_data.get("vip"):
-            vip_info = VIPS.get(user_data["vip"])
-            if vip_info:
-                embed.description = f"**Plano Ativo:** {vip_info['emoji']} {vip_info['nome']}"
-                embed.color = vip_info["cor"]
-                beneficios_text = "\n".join([f"✅ {b}" for b in vip_info["beneficios"]])
-                embed.add_field(name="Benefícios", value=beneficios_text, inline=False)
-            else:
-                embed.description = "❌ Você não possui VIP ativo"
-        else:
-            embed.description = "❌ Você não possui VIP ativo"
-        
-        await interaction.response.send_message(embed=embed, ephemeral=True)
-    
-    @discord.ui.button(label="Fechar", emoji="❌", style=discord.ButtonStyle.danger, row=1)
-    async def fechar_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if interaction.user.id != self.user_id:
-            await interaction.response.send_message(f"{EMOJIS['erro']} Este não é seu painel!", ephemeral=True)
+        posicao = self.posicao(interaction.user.id)
+        if posicao is None:
+            await responder(interaction, f"{EMOJIS['alerta']} Você não aparece nesta lista!", ephemeral=True)
             return
-        await interaction.message.delete()
+        await self.ir_para(interaction, posicao // self.por_pagina)
 
-class VIPSelect(discord.ui.Select):
-    def __init__(self, user_id):
-        self.user_id = user_id
-        options = []
-        
-        for vip_id, vip_info in VIPS.items():
-            desc = f"R$ {vip_info['preco']:,} - {vip_info['beneficios'][0][:50]}"
-            options.append(
-                discord.SelectOption(
-                    label=vip_info['nome'],
-                    description=desc,
-                    emoji=vip_info['emoji'],
-                    value=vip_id
-                )
-            )
-        
-        super().__init__(placeholder="Escolha um plano VIP...", options=options, row=0)
+class IrParaPaginaModal(ModalEconomia, title="Ir para a página"):
+    def __init__(self, paginador):
+        super().__init__()
+        self.paginador = paginador
+        self.numero.placeholder = f"De 1 a {paginador.total_paginas}"
     
-    async def callback(self, interaction: discord.Interaction):
-        if interaction.user.id != self.user_id:
-            await interaction.response.send_message(f"{EMOJIS['erro']} Este não é seu painel!", ephemeral=True)
-            return
-        
-        vip_id = self.values[0]
-        vip_info = VIPS[vip_id]
-        user_data = get_user_data(self.user_id)
-        
-        if user_data.get("vip") == vip_id:
-            await interaction.response.send_message(f"{EMOJIS['erro']} Você já possui este VIP!", ephemeral=True)
+    numero = discord.ui.TextInput(
+        label="Número da página",
+        required=True,
+        max_length=7
+    )
+    
+    async def on_submit(self, interaction: discord.Interaction):
+        try:
+            pagina = int(self.numero.value)
+        except ValueError:
+            await responder(interaction, f"{EMOJIS['erro']} Digite apenas números!", ephemeral=True)
             return
         
-        if user_data["carteira"] < vip_info["preco"]:
-            falta = vip_info["preco"] - user_data["carteira"]
-            await interaction.response.send_message(
-                f"{EMOJIS['erro']} Saldo insuficiente! Faltam **R$ {falta:,}**",
-                ephemeral=True
-            )
+        if not 1 <= pagina <= self.paginador.total_paginas:
+            await responder(interaction, f"{EMOJIS['erro']} Página inválida! Escolha de 1 a {self.paginador.total_paginas}.", ephemeral=True)
             return
         
-        embed = discord.Embed(
-            title=f"{vip_info['emoji']} Confirmar Compra",
-            description=f"Você está prestes a comprar o **{vip_info['nome']}**",
-            color=vip_info["cor"]
-        )
-        
-        beneficios_text = "\n".join([f"✅ {b}" for b in vip_info["beneficios"]])
-        embed.add_field(name="Benefícios", value=beneficios_text, inline=False)
-        embed.add_field(name="Preço", value=f"**R$ {vip_info['preco']:,}**", inline=True)
-        embed.add_field(name="Seu Saldo", value=f"R$ {user_data['carteira']:,}", inline=True)
-        embed.set_footer(text="Clique em 'Confirmar' para concluir a compra")
-        
-        view = ConfirmarVIPView(self.user_id, vip_id)
-        await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+        await self.paginador.ir_para(interaction, pagina - 1)
+
+# ============ VIEWS VIP ============
+
+class VIPPainelView(discord.ui.View):
+    """Painel de compra de VIP. Com user_id 0 é o painel público do
+    /admin_painel_vip: cada um compra para si e não há botão de fechar."""
+
+    def __init__(self, user_id):
+        super().__init__(timeout=None)
+        self.add_item(SelecaoMenu(
+            "vip", "comprar", user_id,
+            placeholder="Escolha um plano VIP...",
+            options=list(renders.obter("opcoes_vip", montar_opcoes_vip)),
+            row=0
+        ))
+        self.add_item(BotaoMenu("vip", "meu_vip", user_id, label="Meu VIP", emoji="👤", style=discord.ButtonStyle.secondary, row=1))
+        if user_id:
+            self.add_item(botao_fechar("vip", user_id))
+
+# A confirmação de compra vale por pouco tempo: os botões são persistentes, e
+# uma mensagem antiga compraria com o preço e os termos de quando foi enviada
+VALIDADE_CONFIRMACAO_VIP = 60  # segundos
 
 class ConfirmarVIPView(discord.ui.View):
-    def __init__(self, user_id, vip_id):
-        super().__init__(timeout=60)
-        self.user_id = user_id
-        self.vip_id = vip_id
+    def __init__(self, user_id, vip_id, concluida=False):
+        super().__init__(timeout=None)
+        self.add_item(BotaoMenu(
+            "compra_vip", "confirmar", user_id, vip_id,
+            label="Confirmar Compra", emoji="✅", style=discord.ButtonStyle.success, disabled=concluida
+        ))
+        self.add_item(BotaoMenu(
+            "compra_vip", "cancelar", user_id,
+            label="Cancelar", emoji="❌", style=discord.ButtonStyle.danger, disabled=concluida
+        ))
+
+@acao_menu("vip", "meu_vip")
+async def meu_vip(interaction: discord.Interaction, user_id, valor):
+    user_data = ver_user_data(user_id)
+    embed = discord.Embed(title="👤 Seu Status VIP", color=discord.Color.blue())
     
-    @discord.ui.button(label="Confirmar Compra", emoji="✅", style=discord.ButtonStyle.success)
-    async def confirmar_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if interaction.user.id != self.user_id:
-            await interaction.response.send_message(f"{EMOJIS['erro']} Esta não é sua compra!", ephemeral=True)
-            return
+    if user_data.get("vip"):
+        vip_info = VIPS.get(user_data["vip"])
+        if vip_info:
+            embed.description = f"**Plano Ativo:** {vip_info['emoji']} {vip_info['nome']}"
+            embed.color = vip_info["cor"]
+            beneficios_text = "\n".join([f"✅ {b}" for b in vip_info["beneficios"]])
+            embed.add_field(name="Benefícios", value=beneficios_text, inline=False)
+        else:
+            embed.description = "❌ Você não possui VIP ativo"
+    else:
+        embed.description = "❌ Você não possui VIP ativo"
+    
+    await responder(interaction, embed=embed, ephemeral=True)
+
+@acao_menu("vip", "comprar")
+async def escolher_vip(interaction: discord.Interaction, user_id, vip_id):
+    vip_info = VIPS[vip_id]
+    user_data = ver_user_data(user_id)
+    
+    if user_data.get("vip") == vip_id:
+        await responder(interaction, f"{EMOJIS['erro']} Você já possui este VIP!", ephemeral=True)
+        return
+    
+    if user_data["carteira"] < vip_info["preco"]:
+        falta = vip_info["preco"] - user_data["carteira"]
+        await responder(
+            interaction,
+            f"{EMOJIS['erro']} Saldo insuficiente! Faltam **R$ {falta:,}**",
+            ephemeral=True
+        )
+        return
+    
+    embed = discord.Embed(
+        title=f"{vip_info['emoji']} Confirmar Compra",
+        description=f"Você está prestes a comprar o **{vip_info['nome']}**",
+        color=vip_info["cor"]
+    )
+    
+    beneficios_text = "\n".join([f"✅ {b}" for b in vip_info["beneficios"]])
+    embed.add_field(name="Benefícios", value=beneficios_text, inline=False)
+    embed.add_field(name="Preço", value=f"**R$ {vip_info['preco']:,}**", inline=True)
+    embed.add_field(name="Seu Saldo", value=f"R$ {user_data['carteira']:,}", inline=True)
+    embed.set_footer(text="Clique em 'Confirmar' para concluir a compra")
+    
+    view = ConfirmarVIPView(user_id, vip_id)
+    await responder(interaction, embed=embed, view=view, ephemeral=True)
+
+@acao_menu("compra_vip", "confirmar")
+async def confirmar_vip(interaction: discord.Interaction, user_id, vip_id):
+    idade = (discord.utils.utcnow() - interaction.message.created_at).total_seconds()
+    if idade > VALIDADE_CONFIRMACAO_VIP:
+        await responder(interaction, f"{EMOJIS['erro']} Esta confirmação expirou! Escolha o plano de novo.", ephemeral=True)
+        return
+    
+    vip_info = VIPS.get(vip_id)
+    if vip_info is None:
+        await responder(interaction, f"{EMOJIS['erro']} Este plano não existe mais!", ephemeral=True)
+        return
+    
+    async with travar_usuarios(user_id):
+        user_data = get_user_data(user_id)
         
-        user_data = get_user_data(self.user_id)
-        vip_info = VIPS[self.vip_id]
+        # Segundo clique enquanto o primeiro ainda processava
+        if user_data.get("vip") == vip_id:
+            await responder(interaction, f"{EMOJIS['erro']} Esta compra já foi concluída!", ephemeral=True)
+            return
         
         if user_data["carteira"] < vip_info["preco"]:
-            await interaction.response.send_message(f"{EMOJIS['erro']} Saldo insuficiente!", ephemeral=True)
+            await responder(interaction, f"{EMOJIS['erro']} Saldo insuficiente!", ephemeral=True)
             return
         
+        vip_anterior = user_data.get("vip")
         user_data["carteira"] -= vip_info["preco"]
-        user_data["vip"] = self.vip_id
-        
-        if vip_info["cargo_id"]:
-            try:
-                cargo = interaction.guild.get_role(vip_info["cargo_id"])
-                if cargo:
-                    await interaction.user.add_roles(cargo)
-            except Exception as e:
-                print(f"Erro ao adicionar cargo VIP: {e}")
-        
-        save_data(data)
+        user_data["vip"] = vip_id
+        marcar_alterado(user_id)
+        trocar_cargo_vip(interaction.guild_id, user_id, vip_anterior, vip_id)
         
         embed = discord.Embed(
             title=f"{EMOJIS['sucesso']} Compra Realizada!",
@@ -2081,46 +2754,146 @@ class ConfirmarVIPView(discord.ui.View):
         embed.add_field(name="💳 Saldo Restante", value=f"R$ {user_data['carteira']:,}", inline=True)
         embed.set_footer(text="🎮 Entre no servidor para receber seus benefícios!")
         
-        for item in self.children:
-            item.disabled = True
-        
-        await interaction.response.edit_message(embed=embed, view=self)
-    
-    @discord.ui.button(label="Cancelar", emoji="❌", style=discord.ButtonStyle.danger)
-    async def cancelar_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if interaction.user.id != self.user_id:
-            await interaction.response.send_message(f"{EMOJIS['erro']} Esta não é sua compra!", ephemeral=True)
-            return
-        
-        embed = discord.Embed(
-            title="❌ Compra Cancelada",
-            description="A compra do VIP foi cancelada.",
-            color=discord.Color.red()
-        )
-        await interaction.response.edit_message(embed=embed, view=None)
+        await interaction.response.edit_message(embed=embed, view=ConfirmarVIPView(user_id, vip_id, concluida=True))
+
+@acao_menu("compra_vip", "cancelar")
+async def cancelar_vip(interaction: discord.Interaction, user_id, valor):
+    embed = discord.Embed(
+        title="❌ Compra Cancelada",
+        description="A compra do VIP foi cancelada.",
+        color=discord.Color.red()
+    )
+    await interaction.response.edit_message(embed=embed, view=None)
 
 # ============ EVENTOS ============
 
+# Conferência dos cargos VIP na inicialização (ver reconciliar_todos_cargos_vip)
+tarefa_reconciliacao = None
+
 @bot.event
-async def on_ready():
-    print(f'✅ {bot.user} está online e pronto!')
+async def setup_hook():
+    # Uma vez por processo, logo depois do login. on_ready roda de novo a cada
+    # reconexão do gateway, então lá fica só o que depende do cache de servidores
+    
+    # Os cliques em qualquer menu (inclusive os enviados antes de reiniciar)
+    # caem em BotaoMenu/SelecaoMenu pelo custom_id
+    bot.add_dynamic_items(BotaoMenu, SelecaoMenu)
+    preparar_renders()
     verificar_daily.start()
+    salvar_alteracoes.start()
+    if ARMAZENAMENTO == 'journal':
+        compactar_journal.start()
+    descarregar_economias.start()
+    auditar_agregados.start()
+    amostrar_metricas.start()
+    enviar_logs.start()
+    sincronizador_cargos.iniciar(bot)
+    global tarefa_reconciliacao
+    if tarefa_reconciliacao is None:
+        tarefa_reconciliacao = asyncio.create_task(reconciliar_todos_cargos_vip())
+    await sincronizar_comandos()
+
+async def sincronizar_comandos():
+    guild = discord.Object(id=GUILD_DESENVOLVIMENTO) if GUILD_DESENVOLVIMENTO else None
+    escopo = f"no servidor {GUILD_DESENVOLVIMENTO}" if guild else "globalmente"
+    if guild:
+        bot.tree.copy_global_to(guild=guild)
     try:
-        synced = await bot.tree.sync()
-        print(f'Slash commands sincronizados: {len(synced)} comandos.')
+        quantidade = await sincronizar_se_mudou(bot.tree, COMANDOS_HASH_FILE, guild, forcar=FORCAR_SYNC)
     except Exception as e:
         print(f'Erro ao sincronizar comandos: {e}')
+        return
+    if quantidade is None:
+        print(f'Slash commands sem mudanças {escopo}; sincronização pulada.')
+    else:
+        print(f'Slash commands sincronizados {escopo}: {quantidade} comandos.')
+
+@bot.event
+async def on_ready():
+    # Roda de novo a cada reconexão: o trabalho de inicialização fica no setup_hook
+    print(f'✅ {bot.user} está online e pronto!')
+
+@bot.event
+async def on_member_update(before: discord.Member, after: discord.Member):
+    if before.display_name != after.display_name:
+        nomes_membros.invalidar(after.guild.id, after.id)
+
+@bot.event
+async def on_user_update(before: discord.User, after: discord.User):
+    if before.display_name != after.display_name:
+        nomes_membros.invalidar_usuario(after.id)
+
+@bot.event
+async def on_member_join(member: discord.Member):
+    nomes_membros.invalidar(member.guild.id, member.id)
+    # VIP que saiu e voltou: devolve o cargo do plano
+    if any(cargo_vip(member.guild.id, vip) for vip in VIPS):
+        registro = (await economias.obter(member.guild.id)).dados.get(str(member.id))
+        if registro is not None and registro.get("vip"):
+            trocar_cargo_vip(member.guild.id, member.id, None, registro["vip"])
+
+@bot.event
+async def on_member_remove(member: discord.Member):
+    nomes_membros.invalidar(member.guild.id, member.id)
+
+@bot.event
+async def on_app_command_completion(interaction: discord.Interaction, command):
+    adiamento.terminar(interaction)
 
 @tasks.loop(hours=1)
 async def verificar_daily():
-    save_data(data)
+    save_data()
+
+@tasks.loop(seconds=INTERVALO_SALVAMENTO)
+async def salvar_alteracoes():
+    economias.gravar_todas()
+
+@tasks.loop(minutes=5)
+async def compactar_journal():
+    for atual in economias.carregadas():
+        if atual.armazenamento.precisa_compactar():
+            try:
+                await atual.persistencia.consultar(atual.armazenamento.compactar)
+            except Exception as e:
+                print(f"Erro ao compactar journal ({atual.chave}): {e}")
+
+@tasks.loop(minutes=1)
+async def descarregar_economias():
+    descarregadas = await economias.descarregar_inativas()
+    if descarregadas:
+        print(f"[ECONOMIA] {descarregadas} economias inativas descarregadas "
+              f"({economias.total_usuarios()} usuários em memória)")
+
+@tasks.loop(minutes=INTERVALO_AUDITORIA)
+async def auditar_agregados():
+    for atual in economias.carregadas():
+        divergencia = atual.agregados.auditar(atual.dados)
+        for campo, (mantido, real) in divergencia.items():
+            print(f"[AUDITORIA] Economia {atual.chave}: {campo} estava {mantido:,}, o real é {real:,} (corrigido)")
+
+@tasks.loop(seconds=INTERVALO_LOGS)
+async def enviar_logs():
+    await logs.enviar(bot)
+
+@tasks.loop(minutes=INTERVALO_METRICAS)
+async def amostrar_metricas():
+    agora = time.time()
+    for atual in economias.carregadas():
+        agregados = atual.agregados
+        atual.metricas.registrar(agora, {
+            "carteiras": agregados.carteiras,
+            "bancos": agregados.bancos,
+            "ativos": agregados.coletar_ativos(),
+            "vips": agregados.vips,
+            "usuarios": agregados.usuarios,
+        })
 
 # ============ COMANDOS PRINCIPAIS ============
 
 @bot.tree.command(name="saldo", description="💰 Veja seu saldo completo")
 async def saldo(interaction: discord.Interaction, usuario: discord.Member = None):
     usuario = usuario or interaction.user
-    user_data = get_user_data(usuario.id)
+    user_data = ver_user_data(usuario.id)
     
     total = user_data["carteira"] + user_data["banco"]
     
@@ -2147,12 +2920,12 @@ async def saldo(interaction: discord.Interaction, usuario: discord.Member = None
     )
     
     embed.set_footer(text="💡 Use /perfil para ver informações completas")
-    await interaction.response.send_message(embed=embed)
+    await responder(interaction, embed=embed)
 
 @bot.tree.command(name="perfil", description="📊 Veja seu perfil completo na economia")
 async def perfil(interaction: discord.Interaction, usuario: discord.Member = None):
     usuario = usuario or interaction.user
-    user_data = get_user_data(usuario.id)
+    user_data = ver_user_data(usuario.id)
     
     total = user_data["carteira"] + user_data["banco"]
     trabalho_atual = user_data["trabalho"] or "Desempregado"
@@ -2180,32 +2953,31 @@ async def perfil(interaction: discord.Interaction, usuario: discord.Member = Non
         embed.add_field(name=f"{EMOJIS['celular']} Celular", value=f"✅ **{len(user_data['apps'])} apps instalados**", inline=False)
     
     embed.set_footer(text="💼 Sistema de Economia Realista")
-    await interaction.response.send_message(embed=embed)
+    await responder(interaction, embed=embed)
 
 @bot.tree.command(name="daily", description="🎁 Receba seu auxílio diário do governo")
 async def daily(interaction: discord.Interaction):
     user_data = get_user_data(interaction.user.id)
     
-    if user_data["ultimo_daily"]:
-        ultimo = datetime.fromisoformat(user_data["ultimo_daily"])
-        if datetime.now() - ultimo < timedelta(days=1):
-            tempo_restante = timedelta(days=1) - (datetime.now() - ultimo)
-            horas = tempo_restante.seconds // 3600
-            minutos = (tempo_restante.seconds % 3600) // 60
-            
-            embed = discord.Embed(
-                title=f"{EMOJIS['relogio']} Aguarde!",
-                description=f"Você já recebeu seu auxílio hoje!\n\n**Próximo daily em:** {horas}h {minutos}min",
-                color=discord.Color.orange()
-            )
-            await interaction.response.send_message(embed=embed, ephemeral=True)
-            return
+    agora = int(time.time())
+    tempo_restante = economia().cooldowns.restante(interaction.user.id, "daily", agora)
+    if tempo_restante:
+        horas = tempo_restante // 3600
+        minutos = (tempo_restante % 3600) // 60
+        
+        embed = discord.Embed(
+            title=f"{EMOJIS['relogio']} Aguarde!",
+            description=f"Você já recebeu seu auxílio hoje!\n\n**Próximo daily em:** {horas}h {minutos}min",
+            color=discord.Color.orange()
+        )
+        await responder(interaction, embed=embed, ephemeral=True)
+        return
     
     bonus = random.randint(800, 1500)
     user_data["carteira"] += bonus
-    user_data["ultimo_daily"] = datetime.now().isoformat()
+    economia().cooldowns.iniciar(interaction.user.id, "daily", user_data, agora)
     user_data["xp"] += 10
-    save_data(data)
+    marcar_alterado(interaction.user.id)
     
     embed = discord.Embed(
         title=f"{EMOJIS['presente']} Auxílio Governamental Recebido!",
@@ -2213,7 +2985,7 @@ async def daily(interaction: discord.Interaction):
         color=discord.Color.green()
     )
     embed.set_footer(text="💚 Volte amanhã para receber novamente!")
-    await interaction.response.send_message(embed=embed)
+    await responder(interaction, embed=embed)
 
 @bot.tree.command(name="trabalhar", description="💼 Trabalhe na sua profissão e ganhe dinheiro")
 async def trabalhar(interaction: discord.Interaction):
@@ -2225,23 +2997,21 @@ async def trabalhar(interaction: discord.Interaction):
             description="Use `/empregos` para ver vagas disponíveis!",
             color=discord.Color.red()
         )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await responder(interaction, embed=embed, ephemeral=True)
         return
     
-    if user_data["ultimo_trabalho"]:
-        ultimo = datetime.fromisoformat(user_data["ultimo_trabalho"])
-        tempo_espera = TRABALHOS[user_data["trabalho"]]["tempo"]
-        if datetime.now() - ultimo < timedelta(seconds=tempo_espera):
-            tempo_restante = timedelta(seconds=tempo_espera) - (datetime.now() - ultimo)
-            minutos = tempo_restante.seconds // 60
-            
-            embed = discord.Embed(
-                title=f"{EMOJIS['relogio']} Você está cansado!",
-                description=f"Descanse um pouco antes de trabalhar novamente.\n\n**Tempo restante:** {minutos} minutos",
-                color=discord.Color.orange()
-            )
-            await interaction.response.send_message(embed=embed, ephemeral=True)
-            return
+    agora = int(time.time())
+    tempo_restante = economia().cooldowns.restante(interaction.user.id, "trabalhar", agora)
+    if tempo_restante:
+        minutos = tempo_restante // 60
+        
+        embed = discord.Embed(
+            title=f"{EMOJIS['relogio']} Você está cansado!",
+            description=f"Descanse um pouco antes de trabalhar novamente.\n\n**Tempo restante:** {minutos} minutos",
+            color=discord.Color.orange()
+        )
+        await responder(interaction, embed=embed, ephemeral=True)
+        return
     
     trabalho_info = TRABALHOS[user_data["trabalho"]]
     salario = trabalho_info["salario"]
@@ -2253,9 +3023,9 @@ async def trabalhar(interaction: discord.Interaction):
     salario = int(salario * bonus_multiplier)
     
     user_data["carteira"] += salario
-    user_data["ultimo_trabalho"] = datetime.now().isoformat()
+    economia().cooldowns.iniciar(interaction.user.id, "trabalhar", user_data, agora)
     user_data["xp"] += 20
-    save_data(data)
+    marcar_alterado(interaction.user.id)
     
     frases = [
         "Você concluiu seu turno com excelência!",
@@ -2271,11 +3041,35 @@ async def trabalhar(interaction: discord.Interaction):
         color=discord.Color.blue()
     )
     embed.set_footer(text=f"💼 Profissão: {user_data['trabalho'].title()}")
-    await interaction.response.send_message(embed=embed)
+    await responder(interaction, embed=embed)
+
+@bot.tree.command(name="cooldowns", description="⏰ Veja quando cada ação fica disponível de novo", extras={"efemero": True})
+async def ver_cooldowns(interaction: discord.Interaction, usuario: discord.Member = None):
+    usuario = usuario or interaction.user
+    pendentes = economia().cooldowns.pendentes(usuario.id, int(time.time()))
+    
+    nomes = {
+        "daily": "🎁 Daily",
+        "trabalhar": "💼 Trabalhar",
+        "roubar": "🎭 Roubar",
+        "anel_criar": "💫 Anel — Criar",
+        "anel_punir": "⚔️ Anel — Punir",
+    }
+    
+    embed = discord.Embed(
+        title=f"{EMOJIS['relogio']} Cooldowns de {usuario.display_name}",
+        color=discord.Color.orange() if pendentes else discord.Color.green()
+    )
+    if not pendentes:
+        embed.description = "✅ Todas as ações estão disponíveis!"
+    for acao, expira in sorted(pendentes.items(), key=lambda x: x[1]):
+        embed.add_field(name=nomes.get(acao, acao), value=f"Disponível <t:{expira}:R>", inline=True)
+    
+    await responder(interaction, embed=embed, ephemeral=True)
 
 @bot.tree.command(name="empregos", description="📋 Veja e candidate-se a empregos")
 async def empregos(interaction: discord.Interaction):
-    user_data = get_user_data(interaction.user.id)
+    user_data = ver_user_data(interaction.user.id)
     
     embed = discord.Embed(
         title=f"{EMOJIS['trabalho']} Central de Empregos",
@@ -2283,44 +3077,32 @@ async def empregos(interaction: discord.Interaction):
         color=discord.Color.blue()
     )
     
+    indices = economia().indices
     for nome, info in TRABALHOS.items():
         tempo_horas = info["tempo"] // 3600
         disponivel = user_data["nivel"] >= info["nivel_min"]
         status = "✅ Disponível" if disponivel else f"🔒 Nível {info['nivel_min']} necessário"
+        funcionarios = len(indices.com_trabalho(nome))
         
         embed.add_field(
             name=f"{info['emoji']} {nome.title()}",
-            value=f"**Salário:** R$ {info['salario']:,}\n**Tempo:** {tempo_horas}h\n**Status:** {status}",
+            value=f"**Salário:** R$ {info['salario']:,}\n**Tempo:** {tempo_horas}h\n**Funcionários:** {funcionarios}\n**Status:** {status}",
             inline=True
         )
     
     view = EmpregosView(interaction.user.id)
-    await interaction.response.send_message(embed=embed, view=view)
+    await responder(interaction, embed=embed, view=view)
 
 @bot.tree.command(name="loja", description="🛍️ Veja e compre itens da loja")
 async def loja(interaction: discord.Interaction):
-    embed = discord.Embed(
-        title=f"{EMOJIS['diamante']} Loja de Luxo",
-        description="Invista em itens que trarão benefícios!\n\nUse o menu abaixo para comprar:",
-        color=discord.Color.purple()
-    )
-    
-    for item, info in LOJA.items():
-        if info.get("secreto"):
-            continue
-            
-        embed.add_field(
-            name=f"{info['emoji']} {item.replace('_', ' ').title()}",
-            value=f"**Preço:** R$ {info['preco']:,}\n{info['descricao']}",
-            inline=True
-        )
+    embed = renders.obter("loja", montar_embed_loja)
     
     view = LojaView(interaction.user.id)
-    await interaction.response.send_message(embed=embed, view=view)
+    await responder(interaction, embed=embed, view=view)
 
 @bot.tree.command(name="celular", description="📱 Acesse seu smartphone com interface completa")
 async def celular(interaction: discord.Interaction):
-    user_data = get_user_data(interaction.user.id)
+    user_data = ver_user_data(interaction.user.id)
     
     if not user_data["celular"] and "celular" not in user_data["inventario"]:
         embed = discord.Embed(
@@ -2328,29 +3110,23 @@ async def celular(interaction: discord.Interaction):
             description="Compre um celular na `/loja` para desbloquear esta funcionalidade!",
             color=discord.Color.red()
         )
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await responder(interaction, embed=embed, ephemeral=True)
         return
     
     if not user_data["celular"]:
+        user_data = get_user_data(interaction.user.id)
         user_data["celular"] = True
-        save_data(data)
+        marcar_alterado(interaction.user.id)
     
-    embed = discord.Embed(
-        title=f"{EMOJIS['celular']} Meu Smartphone",
-        description="📱 Seu hub central para tudo!\n\nEscolha um app abaixo:",
-        color=discord.Color.blue()
-    )
-    embed.add_field(name="📱 Modelo", value="iPhone 15 Pro Max", inline=True)
-    embed.add_field(name="📦 Apps Instalados", value=str(len(user_data["apps"])), inline=True)
-    embed.add_field(name="🔋 Bateria", value="100%", inline=True)
+    embed = embed_celular(user_data)
     embed.set_footer(text="💡 Dica: Explore a Play Store e o Mercado Negro!")
     
     view = CelularView(interaction.user.id)
-    await interaction.response.send_message(embed=embed, view=view)
+    await responder(interaction, embed=embed, view=view)
 
 @bot.tree.command(name="inventario", description="🎒 Veja seus itens")
 async def inventario(interaction: discord.Interaction):
-    user_data = get_user_data(interaction.user.id)
+    user_data = ver_user_data(interaction.user.id)
     
     embed = discord.Embed(
         title=f"{EMOJIS['diamante']} Seu Inventário",
@@ -2376,7 +3152,7 @@ async def inventario(interaction: discord.Interaction):
                     inline=False
                 )
     
-    await interaction.response.send_message(embed=embed)
+    await responder(interaction, embed=embed)
 
 
 if __name__ == '__main__':
@@ -2384,14 +3160,22 @@ if __name__ == '__main__':
 
     # Allow token to be provided as first CLI argument for convenience:
     #   python main.py <TOKEN>
-    # Fallback: BOT_TOKEN environment variable (or .env via python-dotenv)
+    # Fallback: BOT_TOKEN environment variable (or .env via python-dotenv),
+    # then TOKEN (the name used on Railway)
     token = None
     if len(sys.argv) > 1 and sys.argv[1].strip():
         token = sys.argv[1].strip()
     else:
-        token = os.environ.get('BOT_TOKEN')
+        token = os.environ.get('BOT_TOKEN') or os.environ.get('TOKEN')
+
+    legados = dados_legados() if GUILD_PRINCIPAL is None else []
+    if legados:
+        # Subir assim apagaria (para os usuários) toda a economia existente
+        print(f"ERROR: Existing economy data found ({', '.join(legados)}) but GUILD_PRINCIPAL is not set. "
+              "Set GUILD_PRINCIPAL to the ID of the server that owns this data, or move the files away to start empty.")
+        sys.exit(1)
 
     if not token:
-        print('ERROR: No token provided. You can run: python main.py <TOKEN> or set BOT_TOKEN in environment/.env')
+        print('ERROR: No token provided. You can run: python main.py <TOKEN> or set BOT_TOKEN (or TOKEN) in environment/.env')
     else:
         bot.run(token)
\ No newline at end of file
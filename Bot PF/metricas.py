@@ -0,0 +1,167 @@
+"""Série histórica da economia em buffers circulares de tamanho fixo.
+
+Cada amostra guarda dinheiro em carteiras e bancos, usuários ativos no
+intervalo, VIPs e total de usuários. As amostras vêm dos totais mantidos
+pelo AgregadosEconomia, então amostrar não percorre os usuários.
+
+Níveis (do mais fino para o mais grosso), cada um um buffer circular:
+
+    5 min x 288 = 24 h     1 h x 168 = 7 dias     4 h x 180 = 30 dias
+
+Toda amostra entra no primeiro nível. Quando uma amostra cai num período
+novo do nível seguinte, o período anterior é resumido (média) a partir do
+nível de baixo e gravado nele, e assim por diante. Como o resumo sai dos
+próprios buffers, reiniciar o bot não perde nada além da amostra em curso.
+
+Arquivo (tamanho fixo; cada amostra reescreve só um registro e o cabeçalho):
+    b"ECOM" | versão (u8) | níveis (u8) |
+    por nível: resolução (u32), capacidade (u32), cabeça (u32), quantidade (u32) |
+    registros de cada nível, em sequência
+"""
+import os
+import struct
+
+MAGICO = b"ECOM"
+VERSAO = 1
+
+CAMPOS = ("carteiras", "bancos", "ativos", "vips", "usuarios")
+# momento (segundos desde a época) + CAMPOS
+REGISTRO = struct.Struct("<q" + "q" * len(CAMPOS))
+CABECALHO = struct.Struct("<4sBB")
+NIVEL = struct.Struct("<IIII")
+
+NIVEIS_PADRAO = ((300, 288), (3600, 168), (4 * 3600, 180))
+
+
+class _Nivel:
+    __slots__ = ("resolucao", "capacidade", "cabeca", "quantidade", "registros", "inicio")
+
+    def __init__(self, resolucao, capacidade, inicio):
+        self.resolucao = resolucao
+        self.capacidade = capacidade
+        self.cabeca = 0  # próxima posição a escrever
+        self.quantidade = 0
+        self.registros = [None] * capacidade
+        self.inicio = inicio  # posição do primeiro registro do nível no arquivo
+
+    def adicionar(self, registro):
+        self.registros[self.cabeca] = registro
+        posicao = self.cabeca
+        self.cabeca = (self.cabeca + 1) % self.capacidade
+        self.quantidade = min(self.quantidade + 1, self.capacidade)
+        return posicao
+
+    def recentes(self):
+        """Registros do mais novo para o mais antigo."""
+        for i in range(1, self.quantidade + 1):
+            yield self.registros[(self.cabeca - i) % self.capacidade]
+
+    def ultimo(self):
+        return self.registros[(self.cabeca - 1) % self.capacidade] if self.quantidade else None
+
+
+class SerieMetricas:
+    """Buffers em memória espelhados em um arquivo de tamanho fixo.
+
+    Uma amostra grava só ~150 bytes (um registro por nível tocado mais o
+    cabeçalho), barato o bastante para rodar direto no event loop; `serie`
+    só lê da memória.
+    """
+
+    def __init__(self, caminho, niveis=NIVEIS_PADRAO):
+        self.caminho = caminho
+        self._arquivo = None
+        self._niveis = []
+        inicio = CABECALHO.size + NIVEL.size * len(niveis)
+        for resolucao, capacidade in niveis:
+            self._niveis.append(_Nivel(resolucao, capacidade, inicio))
+            inicio += REGISTRO.size * capacidade
+        self._tamanho = inicio
+        self._abrir()
+
+    def _abrir(self):
+        if os.path.exists(self.caminho) and os.path.getsize(self.caminho) == self._tamanho:
+            self._arquivo = open(self.caminho, 'r+b')
+            if self._ler():
+                return
+            self._arquivo.close()
+            print(f"⚠️ {self.caminho} tem outro formato; começando um histórico novo")
+        self._arquivo = open(self.caminho, 'w+b')
+        self._arquivo.truncate(self._tamanho)
+        self._gravar_cabecalho()
+
+    def _ler(self):
+        self._arquivo.seek(0)
+        magico, versao, quantidade = CABECALHO.unpack(self._arquivo.read(CABECALHO.size))
+        if magico != MAGICO or versao != VERSAO or quantidade != len(self._niveis):
+            return False
+        estados = [NIVEL.unpack(self._arquivo.read(NIVEL.size)) for _ in self._niveis]
+        if any((res, cap) != (nivel.resolucao, nivel.capacidade)
+               for (res, cap, _, _), nivel in zip(estados, self._niveis)):
+            return False
+        for (_, _, cabeca, quantidade), nivel in zip(estados, self._niveis):
+            bruto = self._arquivo.read(REGISTRO.size * nivel.capacidade)
+            nivel.registros = [tuple(r) if r[0] else None for r in REGISTRO.iter_unpack(bruto)]
+            nivel.cabeca, nivel.quantidade = cabeca, quantidade
+        return True
+
+    def _gravar_cabecalho(self):
+        self._arquivo.seek(0)
+        self._arquivo.write(CABECALHO.pack(MAGICO, VERSAO, len(self._niveis)))
+        for nivel in self._niveis:
+            self._arquivo.write(NIVEL.pack(nivel.resolucao, nivel.capacidade, nivel.cabeca, nivel.quantidade))
+
+    def _gravar(self, nivel, registro):
+        posicao = nivel.adicionar(registro)
+        self._arquivo.seek(nivel.inicio + posicao * REGISTRO.size)
+        self._arquivo.write(REGISTRO.pack(*registro))
+
+    def registrar(self, momento, valores):
+        """Adiciona uma amostra ({campo: valor}) e resume os níveis de cima."""
+        if self._arquivo is None:
+            return
+        registro = (int(momento),) + tuple(int(valores[campo]) for campo in CAMPOS)
+        anterior = self._niveis[0].ultimo()
+        self._gravar(self._niveis[0], registro)
+        if anterior is not None:
+            # As resoluções são múltiplas umas das outras: se o período do
+            # nível de cima não virou, os seguintes também não viraram
+            for baixo, cima in zip(self._niveis, self._niveis[1:]):
+                periodo = anterior[0] // cima.resolucao
+                if periodo == registro[0] // cima.resolucao:
+                    break
+                # O período da amostra anterior terminou: resume ele no nível de cima
+                inicio = periodo * cima.resolucao
+                do_periodo = [r for r in _ate(baixo.recentes(), inicio) if r[0] < inicio + cima.resolucao]
+                if do_periodo:
+                    self._gravar(cima, _media(inicio, do_periodo))
+        self._gravar_cabecalho()
+        self._arquivo.flush()
+
+    def serie(self, janela, agora):
+        """[(momento, {campo: valor})] das últimas `janela` segundos, do mais antigo
+        ao mais novo, no nível mais fino que cobre a janela inteira."""
+        for nivel in self._niveis:
+            if nivel.resolucao * nivel.capacidade >= janela:
+                break
+        registros = list(_ate(nivel.recentes(), agora - janela))
+        registros.reverse()
+        return [(r[0], dict(zip(CAMPOS, r[1:]))) for r in registros]
+
+    def fechar(self):
+        if self._arquivo:
+            self._arquivo.close()
+            self._arquivo = None
+
+
+def _ate(recentes, inicio):
+    """Registros (do mais novo ao mais antigo) até o momento `inicio`."""
+    for registro in recentes:
+        if registro[0] < inicio:
+            break
+        yield registro
+
+
+def _media(momento, registros):
+    colunas = zip(*(r[1:] for r in registros))
+    return (momento,) + tuple(sum(coluna) // len(registros) for coluna in colunas)
@@ -0,0 +1,98 @@
+"""Resolução de user_id -> nome de exibição, com cache limitado.
+
+Listagens (/ranking, /admin_listar_vips) só precisam do nome de quem ainda
+está no servidor. Para cada ID:
+
+1. cache local (LRU com validade `ttl`)
+2. cache de membros do gateway (`guild.get_member`, sem requisição)
+3. o que sobrar vai junto em `guild.query_members`, em lotes de 100 IDs por
+   pedido ao gateway, em vez de um `fetch_member` (REST) por usuário
+
+Quem não voltou na consulta não é membro e fica guardado como None, para a
+próxima listagem não perguntar de novo. Os eventos de membro (entrou, saiu,
+mudou apelido) chamam `invalidar`.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+
+import discord
+
+LOTE_CONSULTA = 100  # máximo de IDs por query_members
+
+
+class CacheNomesMembros:
+    """- `capacidade`: entradas máximas (as usadas há mais tempo saem primeiro)
+    - `ttl`: segundos até uma entrada precisar ser resolvida de novo
+    """
+
+    def __init__(self, capacidade=5000, ttl=600):
+        self.capacidade = capacidade
+        self.ttl = ttl
+        self._entradas = OrderedDict()  # (guild_id, user_id) -> (nome ou None, expira_em)
+        self.consultas = 0  # pedidos query_members feitos (para acompanhar o custo)
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def _ler(self, chave, agora):
+        entrada = self._entradas.get(chave)
+        if entrada is None:
+            return False, None
+        nome, expira = entrada
+        if expira <= agora:
+            del self._entradas[chave]
+            return False, None
+        self._entradas.move_to_end(chave)
+        return True, nome
+
+    def _guardar(self, chave, nome, agora):
+        self._entradas[chave] = (nome, agora + self.ttl)
+        self._entradas.move_to_end(chave)
+        while len(self._entradas) > self.capacidade:
+            self._entradas.popitem(last=False)
+
+    async def resolver(self, guild: discord.Guild, user_ids):
+        """{user_id (int): nome de exibição, ou None se não for membro}.
+
+        IDs que não deu para resolver (gateway fora do ar, timeout) ficam de
+        fora do resultado e não são guardados.
+        """
+        agora = time.monotonic()
+        nomes = {}
+        faltando = []
+        for user_id in map(int, user_ids):
+            chave = (guild.id, user_id)
+            achou, nome = self._ler(chave, agora)
+            if not achou:
+                membro = guild.get_member(user_id)
+                if membro is None:
+                    faltando.append(user_id)
+                    continue
+                nome = membro.display_name
+                self._guardar(chave, nome, agora)
+            nomes[user_id] = nome
+
+        for i in range(0, len(faltando), LOTE_CONSULTA):
+            lote = faltando[i:i + LOTE_CONSULTA]
+            self.consultas += 1
+            try:
+                membros = await guild.query_members(user_ids=lote, limit=len(lote), cache=True)
+            except (asyncio.TimeoutError, discord.ClientException) as e:
+                print(f"⚠️ Não foi possível consultar {len(lote)} membros de {guild.id}: {e!r}")
+                continue
+            encontrados = {membro.id: membro.display_name for membro in membros}
+            agora = time.monotonic()
+            for user_id in lote:
+                nome = encontrados.get(user_id)
+                self._guardar((guild.id, user_id), nome, agora)
+                nomes[user_id] = nome
+        return nomes
+
+    def invalidar(self, guild_id, user_id):
+        self._entradas.pop((guild_id, user_id), None)
+
+    def invalidar_usuario(self, user_id):
+        """Remove o usuário de todos os servidores (mudou o nome global)."""
+        for chave in [chave for chave in self._entradas if chave[1] == user_id]:
+            del self._entradas[chave]
@@ -0,0 +1,446 @@
+"""Persistência da economia com escrita atrasada (write-behind).
+
+Os handlers apenas marcam quais usuários foram alterados; o gerenciador
+junta essas marcações e grava tudo de uma vez, seja por intervalo ou quando
+o número de registros pendentes passa do limite configurado.
+
+A gravação roda em uma thread separada para não travar o event loop. O loop
+só copia os registros alterados; o armazenamento mantém seu próprio espelho
+dos dados e escreve em arquivo temporário + fsync + rename, então um crash no
+meio da escrita nunca corrompe o arquivo anterior.
+
+Com o ArmazenamentoJournal cada lote vira algumas linhas anexadas a um
+arquivo de journal (escrita sequencial e barata); de tempos em tempos o
+journal é compactado em um snapshot novo. As alterações são anexadas logo
+depois de cada handler (chegam ao sistema operacional, então sobrevivem à
+queda do processo), mas o fsync segue o mesmo intervalo/limite dos outros
+armazenamentos.
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import snapshot_compacto
+
+
+class PersistenciaFechada(RuntimeError):
+    """Alteração marcada em uma economia que já foi descarregada."""
+
+
+def copiar_registro(registro):
+    """Cópia independente de um usuário (dicts e listas internos inclusos)."""
+    if hasattr(registro, 'copia'):
+        return registro.copia()
+    return {
+        chave: valor.copy() if isinstance(valor, (dict, list)) else valor
+        for chave, valor in registro.items()
+    }
+
+
+def para_json(registro):
+    """`default` do json.dumps para registros que não são dicts."""
+    if hasattr(registro, 'para_dict'):
+        return registro.para_dict()
+    raise TypeError(f"Objeto não serializável: {type(registro).__name__}")
+
+
+def gravar_atomico(caminho, conteudo):
+    """Escreve `conteudo` (bytes) em `caminho` sem nunca deixar o arquivo pela metade."""
+    temporario = f"{caminho}.tmp"
+    with open(temporario, 'wb') as f:
+        f.write(conteudo)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporario, caminho)
+    # Garante que o rename também chegou ao disco (não suportado no Windows)
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(caminho)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class ArmazenamentoJSON:
+    """Guarda a economia inteira em um único arquivo de snapshot.
+
+    `formato` define como o snapshot é gravado: "json" (legível) ou
+    "compacto" (binário, ver snapshot_compacto). Na leitura o formato é
+    detectado pelo conteúdo do arquivo. Se `caminho` ainda não existir, os
+    dados são lidos de `caminho_legado` (ex.: o JSON antigo ao migrar).
+    """
+
+    def __init__(self, caminho, formato='json', comprimir=False, caminho_legado=None):
+        self.caminho = caminho
+        self.formato = formato
+        self.comprimir = comprimir
+        self.caminho_legado = caminho_legado
+        self._espelho = {}
+        self._trava = threading.Lock()
+
+    def _ler_snapshot(self):
+        caminho = self.caminho
+        if not os.path.exists(caminho):
+            if not self.caminho_legado or not os.path.exists(self.caminho_legado):
+                return {}
+            caminho = self.caminho_legado
+        with open(caminho, 'rb') as f:
+            conteudo = f.read()
+        if snapshot_compacto.eh_compacto(conteudo):
+            return snapshot_compacto.decodificar(conteudo)
+        return json.loads(conteudo.decode('utf-8'))
+
+    def carregar(self):
+        return self._ler_snapshot()
+
+    def espelhar(self, dados):
+        """Guarda uma cópia própria dos dados, usada para regravar o snapshot."""
+        self._espelho = {uid: copiar_registro(r) for uid, r in dados.items()}
+
+    def gravar(self, lote, removidos):
+        """Aplica o lote no espelho e regrava o arquivo (roda fora do event loop)."""
+        with self._trava:
+            for uid in removidos:
+                self._espelho.pop(uid, None)
+            self._espelho.update(lote)
+            # O formato JSON não permite atualização parcial: regrava o arquivo todo
+            self._gravar_snapshot()
+
+    def _gravar_snapshot(self):
+        if self.formato == 'compacto':
+            conteudo = snapshot_compacto.codificar(self._espelho, comprimir=self.comprimir)
+        else:
+            conteudo = json.dumps(self._espelho, indent=4, ensure_ascii=False, default=para_json).encode('utf-8')
+        gravar_atomico(self.caminho, conteudo)
+
+
+class ArmazenamentoJournal(ArmazenamentoJSON):
+    """Snapshot JSON + journal de mutações anexadas (uma linha por usuário alterado).
+
+    Cada linha guarda o registro completo do usuário (`{"u": id, "r": {...}}`)
+    ou sua remoção (`{"u": id, "x": 1}`). Como são substituições e não deltas,
+    reaplicar uma linha que já está no snapshot não muda nada, então a
+    recuperação após um crash é sempre segura.
+    """
+
+    # Anexar ao journal é barato: vale anexar logo após cada alteração e
+    # deixar só o fsync para o intervalo/limite do GerenciadorPersistencia
+    gravacao_barata = True
+
+    def __init__(self, caminho, caminho_journal=None, limite_bytes=5 * 1024 * 1024, **opcoes):
+        super().__init__(caminho, **opcoes)
+        self.caminho_journal = caminho_journal or f"{caminho}.journal"
+        self.limite_bytes = limite_bytes
+        self._journal = None
+
+    def carregar(self):
+        dados = super().carregar()
+        aplicadas = self._reaplicar_journal(dados)
+        if aplicadas:
+            print(f"[JOURNAL] {aplicadas} alterações recuperadas de {self.caminho_journal}")
+        self._journal = open(self.caminho_journal, 'ab')
+        return dados
+
+    def _reaplicar_journal(self, dados):
+        if not os.path.exists(self.caminho_journal):
+            return 0
+        aplicadas = 0
+        valido_ate = 0
+        with open(self.caminho_journal, 'rb') as f:
+            for linha in f:
+                if not linha.endswith(b'\n'):
+                    break  # última linha cortada por um crash no meio da escrita
+                try:
+                    entrada = json.loads(linha)
+                except ValueError:
+                    break
+                if entrada.get("x"):
+                    dados.pop(entrada["u"], None)
+                else:
+                    dados[entrada["u"]] = entrada["r"]
+                aplicadas += 1
+                valido_ate += len(linha)
+        if valido_ate < os.path.getsize(self.caminho_journal):
+            # Descarta o lixo no final para que as próximas linhas não grudem nele
+            with open(self.caminho_journal, 'r+b') as f:
+                f.truncate(valido_ate)
+        return aplicadas
+
+    def gravar(self, lote, removidos, sincronizar=True):
+        """Anexa o lote ao journal; com `sincronizar`, termina com um fsync."""
+        with self._trava:
+            linhas = []
+            for uid in removidos:
+                self._espelho.pop(uid, None)
+                linhas.append(json.dumps({"u": uid, "x": 1}))
+            for uid, registro in lote.items():
+                self._espelho[uid] = registro
+                linhas.append(json.dumps({"u": uid, "r": registro}, ensure_ascii=False, separators=(',', ':'), default=para_json))
+            if linhas:
+                self._journal.write(('\n'.join(linhas) + '\n').encode('utf-8'))
+                self._journal.flush()
+            if sincronizar:
+                os.fsync(self._journal.fileno())
+
+    def tamanho_journal(self):
+        return self._journal.tell() if self._journal else 0
+
+    def precisa_compactar(self):
+        return self.tamanho_journal() >= self.limite_bytes
+
+    def compactar(self):
+        """Grava um snapshot novo com o estado atual e esvazia o journal."""
+        with self._trava:
+            if not self.tamanho_journal():
+                return
+            self._gravar_snapshot()
+            # Se cair aqui, o journal ainda existe e é reaplicado sem efeito
+            self._journal.truncate(0)
+            self._journal.seek(0)
+            os.fsync(self._journal.fileno())
+
+    def fechar(self):
+        with self._trava:
+            if self._journal:
+                self._journal.close()
+                self._journal = None
+
+
+class GerenciadorPersistencia:
+    """Registra usuários alterados e agrupa as gravações em disco.
+
+    - `intervalo`: segundos máximos que uma alteração pode ficar só em memória
+    - `limite_alterados`: quantidade de registros pendentes que força gravação
+
+    No máximo uma gravação fica em andamento; pedidos que chegam durante ela
+    viram uma única gravação pendente, disparada assim que a atual termina.
+    Armazenamentos com `gravacao_barata` (journal) recebem as alterações ao
+    fim de cada handler, sem fsync; o fsync vem quando o intervalo passa ou
+    quando os registros gravados sem fsync chegam a `limite_alterados`.
+    Vários gerenciadores podem dividir o mesmo `executor` (uma thread de
+    gravação para todas as economias).
+
+    Todo registro alterado passa por aqui, então índices em memória (ranking,
+    agregados...) se inscrevem em `ouvintes`: objetos com
+    `atualizar(user_id, registro)` (registro None = removido) e `limpar()`.
+
+    Estado da economia que não é de usuário (as contas do sistema do
+    LivroRazao) entra em `anexos`: objetos com `alterado`, `coletar()` (no
+    loop, devolve uma cópia do estado e zera `alterado`), `gravar(estado)` (na
+    thread de gravação, depois dos usuários do mesmo lote) e `limpar()`.
+    """
+
+    def __init__(self, dados, armazenamento, intervalo=30, limite_alterados=100, executor=None):
+        self.dados = dados
+        self.armazenamento = armazenamento
+        self.intervalo = intervalo
+        self.limite_alterados = limite_alterados
+        self.alterados = set()
+        self.removidos = set()
+        self.ultima_gravacao = time.monotonic()
+        self._flush_agendado = False
+        self._executor_proprio = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix="persistencia")
+        self._gravacao = None
+        self._mais_uma = False
+        self._sincronizar_proxima = False
+        self.ouvintes = []
+        self.anexos = []
+        # Armazenamentos baratos de gravar (journal) recebem cada alteração na
+        # hora; `nao_sincronizados` conta os registros gravados desde o último fsync
+        self.gravacao_imediata = getattr(armazenamento, 'gravacao_barata', False)
+        self.nao_sincronizados = 0
+        # Depois de `fechar` o armazenamento não grava mais: marcar é um erro
+        self.fechado = False
+        if hasattr(armazenamento, 'espelhar'):
+            armazenamento.espelhar(dados)
+
+    def verificar_aberto(self):
+        if self.fechado:
+            raise PersistenciaFechada(
+                "Economia já descarregada: a alteração não seria gravada. "
+                "Pegue a economia de novo (economias.obter) antes de alterar."
+            )
+
+    def marcar(self, *user_ids):
+        self.verificar_aberto()
+        for user_id in user_ids:
+            user_id = str(user_id)
+            self.alterados.add(user_id)
+            self.removidos.discard(user_id)
+            for ouvinte in self.ouvintes:
+                ouvinte.atualizar(user_id, self.dados.get(user_id))
+        if self.gravacao_imediata or len(self.alterados) >= self.limite_alterados:
+            self._agendar_flush()
+
+    def _agendar_flush(self):
+        # Deixa o handler atual terminar suas marcações antes de gravar,
+        # assim operações em massa geram uma única gravação
+        if self._flush_agendado:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        self._flush_agendado = True
+        loop.call_soon(self._flush_agendado_cb)
+
+    def _flush_agendado_cb(self):
+        self._flush_agendado = False
+        self.agendar(sincronizar=self._precisa_sincronizar())
+
+    def _precisa_sincronizar(self):
+        if not self.gravacao_imediata:
+            return True
+        registros = self.nao_sincronizados + len(self.alterados) + len(self.removidos)
+        return registros >= self.limite_alterados or time.monotonic() - self.ultima_gravacao >= self.intervalo
+
+    def remover(self, user_id):
+        self.verificar_aberto()
+        user_id = str(user_id)
+        self.alterados.discard(user_id)
+        self.removidos.add(user_id)
+        for ouvinte in self.ouvintes:
+            ouvinte.atualizar(user_id, None)
+
+    def limpar(self):
+        """Apaga todos os usuários (usado por /admin_limpar_economia)."""
+        self.verificar_aberto()
+        self.removidos.update(self.dados.keys())
+        self.alterados.clear()
+        self.dados.clear()
+        for ouvinte in self.ouvintes:
+            ouvinte.limpar()
+        for anexo in self.anexos:
+            anexo.limpar()
+
+    @property
+    def pendente(self):
+        return (bool(self.alterados or self.removidos or self.nao_sincronizados)
+                or any(anexo.alterado for anexo in self.anexos))
+
+    def _coletar(self, sincronizar=True):
+        """Copia os registros alterados e zera as marcações (roda no event loop).
+
+        Os anexos só entram nas gravações com fsync.
+        """
+        lote = {}
+        removidos = self.removidos
+        for uid in self.alterados:
+            registro = self.dados.get(uid)
+            if registro is None:
+                removidos.add(uid)
+            else:
+                lote[uid] = copiar_registro(registro)
+        self.alterados, self.removidos = set(), set()
+        anexos = [(anexo, anexo.coletar()) for anexo in self.anexos if anexo.alterado] if sincronizar else []
+        return lote, removidos, anexos
+
+    def _gravar(self, lote, removidos, anexos, sincronizar=True):
+        if self.gravacao_imediata:
+            self.armazenamento.gravar(lote, removidos, sincronizar=sincronizar)
+        else:
+            self.armazenamento.gravar(lote, removidos)
+        for anexo, estado in anexos:
+            anexo.gravar(estado)
+
+    def _devolver(self, lote, removidos, anexos):
+        # A gravação falhou: remarca o que não foi substituído por algo mais novo
+        for uid in lote:
+            if uid not in self.removidos:
+                self.alterados.add(uid)
+        for uid in removidos:
+            if uid not in self.alterados:
+                self.removidos.add(uid)
+        for anexo, _ in anexos:
+            anexo.alterado = True
+
+    def agendar(self, sincronizar=True):
+        """Grava o que estiver pendente em segundo plano, sem bloquear o loop.
+
+        `sincronizar=False` (só com `gravacao_imediata`) anexa sem fsync.
+        """
+        if not self.pendente or not (sincronizar or self.alterados or self.removidos):
+            return
+        self.verificar_aberto()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        if self._gravacao is not None:
+            self._mais_uma = True
+            self._sincronizar_proxima = self._sincronizar_proxima or sincronizar
+            return
+        lote, removidos, anexos = self._coletar(sincronizar)
+        self._gravacao = loop.run_in_executor(self._executor, self._gravar, lote, removidos, anexos, sincronizar)
+        self._gravacao.add_done_callback(partial(self._gravacao_concluida, lote, removidos, anexos, sincronizar))
+
+    def _gravacao_concluida(self, lote, removidos, anexos, sincronizar, futuro):
+        self._gravacao = None
+        erro = None if futuro.cancelled() else futuro.exception()
+        if futuro.cancelled() or erro:
+            print(f"Erro ao salvar dados: {erro or 'gravação cancelada'}")
+            self._devolver(lote, removidos, anexos)
+        elif sincronizar:
+            self.nao_sincronizados = 0
+            self.ultima_gravacao = time.monotonic()
+        else:
+            self.nao_sincronizados += len(lote) + len(removidos)
+        if self._mais_uma:
+            sincronizar = self._sincronizar_proxima or self._precisa_sincronizar()
+            self._mais_uma = self._sincronizar_proxima = False
+            self.agendar(sincronizar)
+
+    async def consultar(self, funcao, *args):
+        """Executa uma consulta do armazenamento na thread de persistência.
+
+        As alterações pendentes são enviadas antes, então a consulta enxerga
+        o estado atual da economia.
+        """
+        await self.aguardar()
+        self.agendar()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(funcao, *args))
+
+    async def aguardar(self):
+        """Espera a gravação em andamento (e a pendente, se houver) terminarem."""
+        while self._gravacao is not None:
+            try:
+                await asyncio.shield(self._gravacao)
+            except Exception:
+                pass
+            await asyncio.sleep(0)
+
+    def flush(self):
+        """Grava imediatamente tudo que estiver pendente, bloqueando até terminar.
+
+        Usado no desligamento, quando o event loop já não está disponível.
+        """
+        if not self.pendente:
+            return
+        self.verificar_aberto()
+        lote, removidos, anexos = self._coletar()
+        try:
+            self._gravar(lote, removidos, anexos)
+        except Exception:
+            self._devolver(lote, removidos, anexos)
+            raise
+        self.nao_sincronizados = 0
+        self.ultima_gravacao = time.monotonic()
+
+    def fechar(self):
+        """Grava o que faltar e libera a thread de gravação (se for só deste gerenciador)."""
+        self.flush()
+        self.fechado = True
+        if self._executor_proprio:
+            self._executor.shutdown(wait=True)
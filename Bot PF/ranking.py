@@ -0,0 +1,154 @@
+"""Ranking de patrimônio (carteira + banco) mantido incrementalmente.
+
+Em vez de ordenar todos os usuários a cada /ranking, o índice guarda as
+chaves (-patrimônio, user_id) em ordem, divididas em baldes de até
+2 * CARGA itens (como uma lista ordenada em blocos), com uma árvore de
+Fenwick sobre o tamanho dos baldes:
+
+- atualizar um usuário: O(log n) para achar o lugar + deslocar um balde
+- top-k ou uma página a partir de qualquer posição: O(log n + k)
+- posição exata de um usuário: O(log n)
+
+O índice é montado a partir dos registros quando a economia carrega e depois
+acompanha cada usuário marcado como alterado (ver GerenciadorPersistencia).
+"""
+from bisect import bisect_left, insort
+
+CARGA = 500
+
+
+def _chave(user_id, registro):
+    return (-(registro["carteira"] + registro["banco"]), user_id)
+
+
+class RankingPatrimonio:
+    def __init__(self):
+        self._baldes = []
+        self._maximos = []  # última chave de cada balde, para achar o balde por bisect
+        self._arvore = [0]  # Fenwick (1-indexada) com o tamanho de cada balde
+        self._chaves = {}   # user_id -> chave atual no índice
+
+    def __len__(self):
+        return len(self._chaves)
+
+    def reconstruir(self, dados):
+        """Monta o índice do zero a partir de {user_id: registro}."""
+        self._chaves = {uid: _chave(uid, registro) for uid, registro in dados.items()}
+        ordenadas = sorted(self._chaves.values())
+        self._baldes = [ordenadas[i:i + CARGA] for i in range(0, len(ordenadas), CARGA)]
+        self._maximos = [balde[-1] for balde in self._baldes]
+        self._reconstruir_arvore()
+
+    def limpar(self):
+        self._baldes, self._maximos, self._arvore, self._chaves = [], [], [0], {}
+
+    # ---- ouvinte do GerenciadorPersistencia ----
+
+    def atualizar(self, user_id, registro):
+        """Reposiciona o usuário após uma alteração (registro None = removido)."""
+        nova = _chave(user_id, registro) if registro is not None else None
+        antiga = self._chaves.get(user_id)
+        if nova == antiga:
+            return
+        if antiga is not None:
+            self._remover(antiga)
+        if nova is None:
+            del self._chaves[user_id]
+        else:
+            self._inserir(nova)
+            self._chaves[user_id] = nova
+
+    # ---- consultas ----
+
+    def patrimonio(self, user_id):
+        chave = self._chaves.get(str(user_id))
+        return None if chave is None else -chave[0]
+
+    def posicao(self, user_id):
+        """Posição do usuário no ranking (1 = mais rico), ou None se não tiver registro."""
+        chave = self._chaves.get(str(user_id))
+        if chave is None:
+            return None
+        i = bisect_left(self._maximos, chave)
+        return self._prefixo(i) + bisect_left(self._baldes[i], chave) + 1
+
+    def fatia(self, inicio, quantidade):
+        """[(user_id, patrimônio)] a partir da posição `inicio` (0 = mais rico)."""
+        resultado = []
+        if inicio >= len(self._chaves) or quantidade <= 0:
+            return resultado
+        i, j = self._localizar(inicio)
+        while i < len(self._baldes) and len(resultado) < quantidade:
+            for negativo, user_id in self._baldes[i][j:j + quantidade - len(resultado)]:
+                resultado.append((user_id, -negativo))
+            i, j = i + 1, 0
+        return resultado
+
+    def top(self, quantidade):
+        return self.fatia(0, quantidade)
+
+    # ---- lista em blocos ----
+
+    def _inserir(self, chave):
+        if not self._baldes:
+            self._baldes.append([chave])
+            self._maximos.append(chave)
+            self._reconstruir_arvore()
+            return
+        i = bisect_left(self._maximos, chave)
+        if i == len(self._baldes):
+            i -= 1
+        balde = self._baldes[i]
+        insort(balde, chave)
+        self._maximos[i] = balde[-1]
+        if len(balde) > 2 * CARGA:
+            self._baldes[i:i + 1] = [balde[:CARGA], balde[CARGA:]]
+            self._maximos[i:i + 1] = [balde[CARGA - 1], balde[-1]]
+            self._reconstruir_arvore()
+        else:
+            self._somar(i, 1)
+
+    def _remover(self, chave):
+        i = bisect_left(self._maximos, chave)
+        balde = self._baldes[i]
+        del balde[bisect_left(balde, chave)]
+        if balde:
+            self._maximos[i] = balde[-1]
+            self._somar(i, -1)
+        else:
+            del self._baldes[i]
+            del self._maximos[i]
+            self._reconstruir_arvore()
+
+    def _reconstruir_arvore(self):
+        arvore = [0] + [len(balde) for balde in self._baldes]
+        for i in range(1, len(arvore)):
+            pai = i + (i & -i)
+            if pai < len(arvore):
+                arvore[pai] += arvore[i]
+        self._arvore = arvore
+
+    def _somar(self, i, delta):
+        i += 1
+        while i < len(self._arvore):
+            self._arvore[i] += delta
+            i += i & -i
+
+    def _prefixo(self, i):
+        """Quantidade de itens nos baldes [0, i)."""
+        total = 0
+        while i > 0:
+            total += self._arvore[i]
+            i -= i & -i
+        return total
+
+    def _localizar(self, indice):
+        """(balde, posição dentro do balde) do item na posição `indice`."""
+        pos = 0
+        passo = 1 << (len(self._baldes).bit_length() - 1) if self._baldes else 0
+        while passo:
+            if pos + passo <= len(self._baldes) and self._arvore[pos + passo] <= indice:
+                pos += passo
+                indice -= self._arvore[pos]
+            passo >>= 1
+        return pos, indice
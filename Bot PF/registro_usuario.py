@@ -0,0 +1,342 @@
+"""Registro compacto de um usuário da economia.
+
+Cada usuário era um dict com ~16 chaves, mais um dict de inventário e uma
+lista de apps. O RegistroUsuario usa __slots__, guarda inventário e apps como
+máscaras de bits (posição no catálogo) e cooldowns como inteiros (segundos
+desde a época), mas continua aceitando o acesso estilo dict usado pelos
+handlers:
+
+    "arma_plasma" in user_data["inventario"]
+    user_data["inventario"][item] = 1
+    user_data["apps"].append(app_id)
+    user_data["carteira"] += 100
+
+Os catálogos precisam ser informados com `configurar_catalogos` antes de
+criar qualquer registro.
+
+Arquivos antigos guardavam os cooldowns como texto ISO ("2025-10-24T12:00:00"
+ou "2025-10-24" no anel); esses valores são convertidos ao carregar.
+"""
+from datetime import datetime, timezone
+from operator import attrgetter
+
+_ITENS = ()
+_BITS_ITENS = {}
+_APPS = ()
+_BITS_APPS = {}
+
+CAMPOS_TEMPO = (
+    "ultimo_trabalho", "ultimo_daily", "ultimo_roubo", "vip_expira",
+    "anel_ultimo_uso_criar", "anel_ultimo_uso_punir",
+)
+CAMPOS_SIMPLES = ("carteira", "banco", "trabalho", "celular", "nivel", "xp", "reputacao", "vip") + CAMPOS_TEMPO
+CAMPOS = (
+    "carteira", "banco", "inventario", "trabalho", "ultimo_trabalho", "ultimo_daily",
+    "ultimo_roubo", "celular", "apps", "nivel", "xp", "reputacao", "vip", "vip_expira",
+    "anel_ultimo_uso_criar", "anel_ultimo_uso_punir",
+)
+
+
+def configurar_catalogos(itens, apps):
+    """Define a posição de cada item/app na máscara de bits.
+
+    Novos itens devem ser adicionados no fim dos catálogos para não mudar a
+    posição dos existentes (os snapshots guardam nomes, então só a memória
+    depende dessa ordem).
+    """
+    global _ITENS, _BITS_ITENS, _APPS, _BITS_APPS
+    _ITENS = tuple(itens)
+    _BITS_ITENS = {nome: 1 << i for i, nome in enumerate(_ITENS)}
+    _APPS = tuple(apps)
+    _BITS_APPS = {nome: 1 << i for i, nome in enumerate(_APPS)}
+
+
+def para_epoca(valor):
+    """Converte um cooldown (int ou texto ISO legado) em segundos desde a época."""
+    if valor is None or isinstance(valor, int):
+        return valor
+    momento = datetime.fromisoformat(valor)
+    if len(valor) == 10:
+        # Só a data (anel): conta como meia-noite UTC, o mesmo "dia" do time.time() // 86400
+        momento = momento.replace(tzinfo=timezone.utc)
+    # Horários sem fuso vinham de datetime.now() e por isso são hora local
+    return int(momento.timestamp())
+
+
+def _nomes(mascara, tabela):
+    return [nome for i, nome in enumerate(tabela) if mascara >> i & 1]
+
+
+class InventarioView:
+    """Visão tipo dict ({item: 1}) sobre a máscara de inventário de um registro."""
+
+    __slots__ = ("_registro",)
+
+    def __init__(self, registro):
+        self._registro = registro
+
+    def __contains__(self, item):
+        bit = _BITS_ITENS.get(item)
+        if bit is not None and self._registro._inventario & bit:
+            return True
+        # Fora do catálogo, ou do catálogo com quantidade diferente de 1
+        extras = self._registro._itens_extras
+        return bool(extras) and item in extras
+
+    def __iter__(self):
+        yield from _nomes(self._registro._inventario, _ITENS)
+        if self._registro._itens_extras:
+            yield from list(self._registro._itens_extras)
+
+    def __len__(self):
+        extras = self._registro._itens_extras
+        return bin(self._registro._inventario).count("1") + (len(extras) if extras else 0)
+
+    def __bool__(self):
+        return bool(self._registro._inventario or self._registro._itens_extras)
+
+    def __getitem__(self, item):
+        if item not in self:
+            raise KeyError(item)
+        extras = self._registro._itens_extras
+        return extras[item] if extras and item in extras else 1
+
+    def __setitem__(self, item, quantidade):
+        bit = _BITS_ITENS.get(item)
+        if bit is not None and quantidade == 1:
+            self._registro._inventario |= bit
+            # Se antes tinha outra quantidade, ela estava guardada à parte
+            extras = self._registro._itens_extras
+            if extras and item in extras:
+                del extras[item]
+                if not extras:
+                    self._registro._itens_extras = None
+            return
+        # Item fora do catálogo (ou com quantidade): guardado à parte
+        if bit is not None:
+            self._registro._inventario &= ~bit
+        if self._registro._itens_extras is None:
+            self._registro._itens_extras = {}
+        self._registro._itens_extras[item] = quantidade
+
+    def __delitem__(self, item):
+        if item not in self:
+            raise KeyError(item)
+        bit = _BITS_ITENS.get(item)
+        if bit is not None:
+            self._registro._inventario &= ~bit
+        extras = self._registro._itens_extras
+        if extras and item in extras:
+            del extras[item]
+            if not extras:
+                self._registro._itens_extras = None
+
+    def get(self, item, padrao=None):
+        return self[item] if item in self else padrao
+
+    def keys(self):
+        return list(self)
+
+    def items(self):
+        return [(item, self[item]) for item in self]
+
+    def para_dict(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return repr(self.para_dict())
+
+
+class AppsView:
+    """Visão tipo lista sobre a máscara de apps instalados de um registro."""
+
+    __slots__ = ("_registro",)
+
+    def __init__(self, registro):
+        self._registro = registro
+
+    def __contains__(self, app):
+        bit = _BITS_APPS.get(app)
+        if bit is not None:
+            return bool(self._registro._apps & bit)
+        extras = self._registro._apps_extras
+        return bool(extras) and app in extras
+
+    def __iter__(self):
+        yield from _nomes(self._registro._apps, _APPS)
+        if self._registro._apps_extras:
+            yield from list(self._registro._apps_extras)
+
+    def __len__(self):
+        extras = self._registro._apps_extras
+        return bin(self._registro._apps).count("1") + (len(extras) if extras else 0)
+
+    def __bool__(self):
+        return bool(self._registro._apps or self._registro._apps_extras)
+
+    def append(self, app):
+        bit = _BITS_APPS.get(app)
+        if bit is not None:
+            self._registro._apps |= bit
+            return
+        # App fora do catálogo (removido ou de outra versão): guardado à parte
+        if self._registro._apps_extras is None:
+            self._registro._apps_extras = []
+        if app not in self._registro._apps_extras:
+            self._registro._apps_extras.append(app)
+
+    def remove(self, app):
+        if app not in self:
+            raise ValueError(app)
+        bit = _BITS_APPS.get(app)
+        if bit is not None:
+            self._registro._apps &= ~bit
+            return
+        self._registro._apps_extras.remove(app)
+        if not self._registro._apps_extras:
+            self._registro._apps_extras = None
+
+    def para_lista(self):
+        return list(self)
+
+    def __repr__(self):
+        return repr(self.para_lista())
+
+
+class RegistroUsuario:
+    """Dados de um usuário com acesso compatível com o antigo dict."""
+
+    __slots__ = (
+        "carteira", "banco", "_inventario", "_itens_extras", "trabalho",
+        "ultimo_trabalho", "ultimo_daily", "ultimo_roubo", "celular", "_apps",
+        "_apps_extras", "nivel", "xp", "reputacao", "vip", "vip_expira",
+        "anel_ultimo_uso_criar", "anel_ultimo_uso_punir", "_extras",
+    )
+
+    def __init__(self):
+        self.carteira = 1000
+        self.banco = 0
+        self._inventario = 0
+        self._itens_extras = None
+        self.trabalho = None
+        # Cooldowns em segundos desde a época (int(time.time()))
+        self.ultimo_trabalho = None
+        self.ultimo_daily = None
+        self.ultimo_roubo = None
+        self.celular = False
+        self._apps = 0
+        self._apps_extras = None
+        self.nivel = 1
+        self.xp = 0
+        self.reputacao = 0
+        self.vip = None
+        self.vip_expira = None
+        self.anel_ultimo_uso_criar = None
+        self.anel_ultimo_uso_punir = None
+        # Campos desconhecidos vindos do arquivo (preservados ao salvar)
+        self._extras = None
+
+    @classmethod
+    def de_dict(cls, dados):
+        registro = cls()
+        for chave, valor in dados.items():
+            registro[chave] = valor
+        return registro
+
+    def copia(self):
+        novo = RegistroUsuario.__new__(RegistroUsuario)
+        for campo in RegistroUsuario.__slots__:
+            setattr(novo, campo, getattr(self, campo))
+        if self._itens_extras:
+            novo._itens_extras = dict(self._itens_extras)
+        if self._apps_extras:
+            novo._apps_extras = list(self._apps_extras)
+        if self._extras:
+            novo._extras = dict(self._extras)
+        return novo
+
+    def para_dict(self):
+        """Formato usado nos arquivos (mesmo layout do antigo dict)."""
+        dados = {chave: self[chave] for chave in CAMPOS}
+        dados["inventario"] = InventarioView(self).para_dict()
+        dados["apps"] = AppsView(self).para_lista()
+        if self._extras:
+            dados.update(self._extras)
+        return dados
+
+    # ----- Acesso estilo dict -----
+
+    def __getitem__(self, chave):
+        leitor = _LEITORES.get(chave)
+        if leitor is not None:
+            return leitor(self)
+        if self._extras and chave in self._extras:
+            return self._extras[chave]
+        raise KeyError(chave)
+
+    def __setitem__(self, chave, valor):
+        if chave in CAMPOS_TEMPO:
+            setattr(self, chave, para_epoca(valor))
+        elif chave in CAMPOS_SIMPLES:
+            setattr(self, chave, valor)
+        elif chave == "inventario":
+            self._inventario = 0
+            self._itens_extras = None
+            inventario = InventarioView(self)
+            for item, quantidade in valor.items():
+                inventario[item] = quantidade
+        elif chave == "apps":
+            self._apps = 0
+            self._apps_extras = None
+            apps = AppsView(self)
+            for app in valor:
+                apps.append(app)
+        else:
+            if self._extras is None:
+                self._extras = {}
+            self._extras[chave] = valor
+
+    def __contains__(self, chave):
+        return chave in CAMPOS or bool(self._extras) and chave in self._extras
+
+    def get(self, chave, padrao=None):
+        try:
+            return self[chave]
+        except KeyError:
+            return padrao
+
+    def keys(self):
+        return list(CAMPOS) + (list(self._extras) if self._extras else [])
+
+    def items(self):
+        return self.para_dict().items()
+
+    def __repr__(self):
+        return f"RegistroUsuario({self.para_dict()!r})"
+
+
+class RegistroSomenteLeitura(RegistroUsuario):
+    """Registro com os valores padrão que não aceita alterações.
+
+    Usado nas consultas de usuários que ainda não existem, para que apenas
+    olhar um perfil não crie (nem grave) um registro novo.
+    """
+
+    __slots__ = ()
+
+    def __init__(self):
+        padrao = RegistroUsuario()
+        for campo in RegistroUsuario.__slots__:
+            object.__setattr__(self, campo, getattr(padrao, campo))
+
+    def __setattr__(self, campo, valor):
+        raise TypeError("Registro somente leitura: use get_user_data para alterar")
+
+    def __delattr__(self, campo):
+        raise TypeError("Registro somente leitura: use get_user_data para alterar")
+
+
+# Como cada chave do antigo dict é lida a partir dos slots
+_LEITORES = {campo: attrgetter(campo) for campo in CAMPOS_SIMPLES}
+_LEITORES["inventario"] = InventarioView
+_LEITORES["apps"] = AppsView
@@ -0,0 +1,54 @@
+"""Sincroniza os slash commands só quando eles mudam.
+
+`tree.sync()` é lento e tem limite de taxa baixo; chamar a cada inicialização
+(ou pior, a cada reconexão) só atrasa o bot ficar pronto. Aqui o payload que
+seria enviado ao Discord vira um hash, guardado em um JSON por aplicação e
+escopo ("global" ou o ID do servidor):
+
+    {"<application_id>:global": "<sha256>", "<application_id>:<guild_id>": "..."}
+
+Se o hash atual for igual ao da última sincronização, nada é enviado.
+"""
+import hashlib
+import json
+import os
+
+from persistencia import gravar_atomico
+
+
+def hash_comandos(tree, guild=None):
+    """sha256 do payload dos comandos do escopo (o mesmo que tree.sync enviaria)."""
+    payload = sorted(
+        (comando.to_dict(tree) for comando in tree.get_commands(guild=guild)),
+        key=lambda comando: (comando.get("type", 1), comando["name"])
+    )
+    conteudo = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+
+def _ler(caminho):
+    if not os.path.exists(caminho):
+        return {}
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ {caminho} ilegível ({e}); os comandos serão sincronizados de novo")
+        return {}
+
+
+async def sincronizar_se_mudou(tree, caminho, guild=None, forcar=False):
+    """Sincroniza o escopo se os comandos mudaram desde a última vez.
+
+    Devolve quantos comandos foram sincronizados, ou None se nada mudou.
+    """
+    chave = f"{tree.client.application_id}:{guild.id if guild else 'global'}"
+    hashes = _ler(caminho)
+    atual = hash_comandos(tree, guild)
+    if not forcar and hashes.get(chave) == atual:
+        return None
+    sincronizados = await tree.sync(guild=guild)
+    # Só grava depois do sync dar certo: se falhar, tenta de novo na próxima inicialização
+    hashes[chave] = atual
+    gravar_atomico(caminho, json.dumps(hashes, indent=4).encode('utf-8'))
+    return len(sincronizados)
@@ -0,0 +1,200 @@
+"""Formato binário compacto para o snapshot da economia.
+
+Layout (versão 2):
+    b"ECOS" | versão (u8) | flags (u8) | corpo
+
+O corpo (comprimido com zlib quando a flag 1 está ligada) é:
+    tamanho do cabeçalho (u32) | cabeçalho JSON | registros de tamanho fixo
+
+O cabeçalho guarda as tabelas de nomes (itens, apps, trabalhos, VIPs) e os
+campos que não cabem no layout fixo. Cada registro usa a ordem de REGISTRO:
+inventário e apps viram máscaras de bits indexadas pelas tabelas e os
+cooldowns são segundos desde a época (0 = vazio). A versão 1 guardava o anel
+em dias ordinais; arquivos nessa versão continuam sendo lidos.
+
+Conversão pela linha de comando:
+    python snapshot_compacto.py para-binario economy_data.json economy_data.bin [--zlib]
+    python snapshot_compacto.py para-json economy_data.bin economy_data.json
+"""
+import json
+import struct
+import sys
+import zlib
+from datetime import date
+
+from registro_usuario import CAMPOS_TEMPO, para_epoca
+
+MAGICO = b"ECOS"
+VERSAO = 2
+FLAG_ZLIB = 1
+
+# user_id, carteira, banco, nivel, xp, reputacao, trabalho, vip, celular,
+# inventario, apps, ultimo_trabalho, ultimo_daily, ultimo_roubo, vip_expira,
+# anel_ultimo_uso_criar, anel_ultimo_uso_punir
+REGISTRO = struct.Struct("<QqqqqqBBBQIqqqqqq")
+# Versão 1: os dois últimos campos eram dias ordinais (i32)
+REGISTRO_V1 = struct.Struct("<QqqqqqBBBQIqqqqii")
+_EPOCA_ORDINAL = date(1970, 1, 1).toordinal()
+
+CAMPOS_FIXOS = (
+    "carteira", "banco", "nivel", "xp", "reputacao", "trabalho", "vip", "celular",
+    "inventario", "apps", "ultimo_trabalho", "ultimo_daily", "ultimo_roubo",
+    "vip_expira", "anel_ultimo_uso_criar", "anel_ultimo_uso_punir",
+)
+
+
+def eh_compacto(cabecalho):
+    return cabecalho[:4] == MAGICO
+
+
+def _dia_para_epoca(dia):
+    return (dia - _EPOCA_ORDINAL) * 86400 if dia else 0
+
+
+def _indice(tabela, posicoes, nome):
+    if nome not in posicoes:
+        posicoes[nome] = len(tabela)
+        tabela.append(nome)
+    return posicoes[nome]
+
+
+def codificar(dados, comprimir=False):
+    """Converte o dict da economia em bytes no formato compacto."""
+    tabelas = {"itens": [], "apps": [], "trabalhos": [], "vips": []}
+    posicoes = {nome: {} for nome in tabelas}
+    extras = {}
+    registros = []
+
+    for uid, r in dados.items():
+        if hasattr(r, 'para_dict'):
+            r = r.para_dict()
+        sobra = {k: v for k, v in r.items() if k not in CAMPOS_FIXOS}
+        inventario = 0
+        for item, quantidade in r.get("inventario", {}).items():
+            if quantidade != 1:
+                sobra.setdefault("inventario", {})[item] = quantidade
+                continue
+            inventario |= 1 << _indice(tabelas["itens"], posicoes["itens"], item)
+        apps = 0
+        for app in r.get("apps", []):
+            apps |= 1 << _indice(tabelas["apps"], posicoes["apps"], app)
+        trabalho = r.get("trabalho")
+        vip = r.get("vip")
+        try:
+            tempos = [para_epoca(r.get(c)) or 0 for c in CAMPOS_TEMPO]
+            registros.append(REGISTRO.pack(
+                int(uid),
+                r.get("carteira", 0), r.get("banco", 0), r.get("nivel", 1),
+                r.get("xp", 0), r.get("reputacao", 0),
+                _indice(tabelas["trabalhos"], posicoes["trabalhos"], trabalho) + 1 if trabalho else 0,
+                _indice(tabelas["vips"], posicoes["vips"], vip) + 1 if vip else 0,
+                1 if r.get("celular") else 0,
+                inventario, apps, *tempos
+            ))
+        except (TypeError, ValueError, struct.error):
+            # Valor fora do padrão: guarda o registro inteiro no cabeçalho
+            extras[uid] = r
+            continue
+        if sobra:
+            extras[uid] = sobra
+
+    if len(tabelas["itens"]) > 64 or len(tabelas["apps"]) > 32:
+        raise ValueError("Catálogo grande demais para o formato compacto")
+
+    cabecalho = json.dumps({"tabelas": tabelas, "extras": extras}, ensure_ascii=False).encode('utf-8')
+    corpo = struct.pack("<I", len(cabecalho)) + cabecalho + b"".join(registros)
+    flags = 0
+    if comprimir:
+        corpo = zlib.compress(corpo, 6)
+        flags |= FLAG_ZLIB
+    return MAGICO + bytes((VERSAO, flags)) + corpo
+
+
+def decodificar(conteudo):
+    """Converte bytes no formato compacto de volta para o dict da economia."""
+    if not eh_compacto(conteudo):
+        raise ValueError("Arquivo não está no formato compacto")
+    versao, flags = conteudo[4], conteudo[5]
+    if versao not in (1, VERSAO):
+        raise ValueError(f"Versão de snapshot não suportada: {versao}")
+    corpo = conteudo[6:]
+    if flags & FLAG_ZLIB:
+        corpo = zlib.decompress(corpo)
+    (tamanho,) = struct.unpack_from("<I", corpo)
+    cabecalho = json.loads(corpo[4:4 + tamanho])
+    tabelas = cabecalho["tabelas"]
+    itens, apps_tabela = tabelas["itens"], tabelas["apps"]
+    trabalhos = [None] + tabelas["trabalhos"]
+    vips = [None] + tabelas["vips"]
+    extras = cabecalho["extras"]
+
+    # Máscaras se repetem muito entre usuários: decodifica cada uma só uma vez
+    cache_itens, cache_apps = {0: ()}, {0: ()}
+    formato = REGISTRO_V1 if versao == 1 else REGISTRO
+
+    dados = {}
+    for (uid, carteira, banco, nivel, xp, reputacao, trabalho, vip, celular,
+         inventario, apps, t_trabalho, t_daily, t_roubo, t_vip, t_criar, t_punir) in \
+            formato.iter_unpack(memoryview(corpo)[4 + tamanho:]):
+        uid = str(uid)
+        if versao == 1:
+            t_criar, t_punir = _dia_para_epoca(t_criar), _dia_para_epoca(t_punir)
+        nomes_itens = cache_itens.get(inventario)
+        if nomes_itens is None:
+            nomes_itens = cache_itens[inventario] = tuple(
+                item for i, item in enumerate(itens) if inventario >> i & 1
+            )
+        nomes_apps = cache_apps.get(apps)
+        if nomes_apps is None:
+            nomes_apps = cache_apps[apps] = tuple(
+                app for i, app in enumerate(apps_tabela) if apps >> i & 1
+            )
+        registro = {
+            "carteira": carteira,
+            "banco": banco,
+            "inventario": dict.fromkeys(nomes_itens, 1),
+            "trabalho": trabalhos[trabalho],
+            "ultimo_trabalho": t_trabalho or None,
+            "ultimo_daily": t_daily or None,
+            "ultimo_roubo": t_roubo or None,
+            "celular": celular == 1,
+            "apps": list(nomes_apps),
+            "nivel": nivel,
+            "xp": xp,
+            "reputacao": reputacao,
+            "vip": vips[vip],
+            "vip_expira": t_vip or None,
+            "anel_ultimo_uso_criar": t_criar or None,
+            "anel_ultimo_uso_punir": t_punir or None,
+        }
+        sobra = extras.get(uid)
+        if sobra:
+            if "inventario" in sobra:
+                registro["inventario"].update(sobra.pop("inventario"))
+            registro.update(sobra)
+        dados[uid] = registro
+
+    # Registros guardados inteiros (valores fora do padrão)
+    for uid, sobra in extras.items():
+        if uid not in dados:
+            dados[uid] = sobra
+    return dados
+
+
+if __name__ == '__main__':
+    argumentos = [a for a in sys.argv[1:] if not a.startswith('--')]
+    if len(argumentos) != 3 or argumentos[0] not in ('para-binario', 'para-json'):
+        print('Uso: python snapshot_compacto.py para-binario|para-json <origem> <destino> [--zlib]')
+        sys.exit(1)
+    acao, origem, destino = argumentos
+    if acao == 'para-binario':
+        with open(origem, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+        with open(destino, 'wb') as f:
+            f.write(codificar(dados, comprimir='--zlib' in sys.argv))
+    else:
+        with open(origem, 'rb') as f:
+            dados = decodificar(f.read())
+        with open(destino, 'w', encoding='utf-8') as f:
+            json.dump(dados, f, indent=4, ensure_ascii=False)
+    print(f'{len(dados)} usuários convertidos para {destino}')
@@ -0,0 +1,19 @@
+import os
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+
+@pytest.fixture(scope="session")
+def main(tmp_path_factory):
+    """O main.py importado numa pasta vazia (os arquivos de dados são relativos)."""
+    anterior = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("bot"))
+    try:
+        import main as modulo
+    finally:
+        os.chdir(anterior)
+    return modulo
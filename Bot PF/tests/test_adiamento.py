@@ -0,0 +1,136 @@
+import ast
+import asyncio
+import inspect
+import textwrap
+
+import pytest
+
+from adiamento import AdiamentoAutomatico
+
+
+def _responde_privado(funcao):
+    """True se o handler chama `responder(..., ephemeral=True)` fora de um if/except.
+
+    Dentro de if/except ficam os erros e avisos que respondem na hora; o que
+    sobra é a resposta de sucesso, que pode sair depois de um adiamento.
+    """
+    arvore = ast.parse(textwrap.dedent(inspect.getsource(funcao)))
+
+    def visitar(no):
+        for filho in ast.iter_child_nodes(no):
+            if isinstance(filho, (ast.If, ast.ExceptHandler)):
+                continue
+            if (isinstance(filho, ast.Call) and isinstance(filho.func, ast.Name)
+                    and filho.func.id == "responder"
+                    and any(k.arg == "ephemeral" and isinstance(k.value, ast.Constant) and k.value.value is True
+                            for k in filho.keywords)):
+                return True
+            if visitar(filho):
+                return True
+        return False
+
+    return visitar(arvore.body[0])
+
+
+def test_comandos_privados_declaram_efemero(main):
+    faltando = [
+        comando.qualified_name
+        for comando in main.bot.tree.walk_commands()
+        if hasattr(comando, "callback")
+        and _responde_privado(comando.callback)
+        and not comando.extras.get("efemero")
+    ]
+    assert faltando == []
+
+
+async def responder(interaction, *args, **kwargs):
+    """Só para os handlers de exemplo de test_detecta_resposta_privada."""
+
+
+def test_detecta_resposta_privada():
+    async def privado(interaction):
+        if interaction:
+            await responder(interaction, "erro", ephemeral=True)
+            return
+        await responder(interaction, "ok", ephemeral=True)
+
+    async def publico(interaction):
+        if interaction:
+            await responder(interaction, "erro", ephemeral=True)
+            return
+        await responder(interaction, "ok")
+
+    assert _responde_privado(privado)
+    assert not _responde_privado(publico)
+
+
+class _Resposta:
+    def __init__(self, interaction):
+        self.interaction = interaction
+        self._feita = False
+
+    def is_done(self):
+        return self._feita
+
+    async def defer(self, ephemeral=False, thinking=False):
+        self._feita = True
+        self.interaction.enviados.append(("defer", ephemeral))
+
+    async def send_message(self, *args, ephemeral=False, **kwargs):
+        self._feita = True
+        self.interaction.enviados.append(("resposta", ephemeral))
+
+
+class _Followup:
+    def __init__(self, interaction):
+        self.interaction = interaction
+
+    async def send(self, *args, ephemeral=False, **kwargs):
+        self.interaction.enviados.append(("followup", ephemeral))
+
+
+class _Comando:
+    def __init__(self, efemero):
+        self.qualified_name = "teste"
+        self.extras = {"efemero": True} if efemero else {}
+
+
+class _Interaction:
+    def __init__(self, efemero=False):
+        self.id = 1
+        self.command = _Comando(efemero)
+        self.data = {}
+        self.enviados = []
+        self.response = _Resposta(self)
+        self.followup = _Followup(self)
+
+    async def delete_original_response(self):
+        self.enviados.append(("apagar", None))
+
+
+def _rodar(efemero, ephemeral, espera):
+    async def cenario():
+        adiamento = AdiamentoAutomatico(orcamento=0.01)
+        interaction = _Interaction(efemero)
+        adiamento.iniciar(interaction)
+        await asyncio.sleep(espera)
+        await adiamento.responder(interaction, "ok", ephemeral=ephemeral)
+        adiamento.terminar(interaction)
+        return interaction.enviados
+
+    return asyncio.run(cenario())
+
+
+def test_resposta_a_tempo_nao_adia():
+    assert _rodar(efemero=False, ephemeral=True, espera=0) == [("resposta", True)]
+
+
+@pytest.mark.parametrize("efemero", [False, True])
+def test_defer_segue_a_declaracao(efemero):
+    assert _rodar(efemero, ephemeral=efemero, espera=0.05) == [("defer", efemero), ("followup", efemero)]
+
+
+def test_resposta_privada_depois_de_defer_publico():
+    assert _rodar(efemero=False, ephemeral=True, espera=0.05) == [
+        ("defer", False), ("apagar", None), ("followup", True)
+    ]
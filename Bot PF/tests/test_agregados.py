@@ -0,0 +1,63 @@
+import random
+
+from agregados import AgregadosEconomia
+
+
+def registro(carteira=0, banco=0, anel=False, vip=None):
+    return {"carteira": carteira, "banco": banco, "inventario": {"anel_supremo": 1} if anel else {}, "vip": vip}
+
+
+def recalculado(dados):
+    return {
+        "usuarios": len(dados),
+        "carteiras": sum(r["carteira"] for r in dados.values()),
+        "bancos": sum(r["banco"] for r in dados.values()),
+        "aneis": sum("anel_supremo" in r["inventario"] for r in dados.values()),
+        "vips": sum(bool(r["vip"]) for r in dados.values()),
+    }
+
+
+def test_totais_acompanham_cada_alteracao():
+    aleatorio = random.Random(18)
+    dados = {}
+    agregados = AgregadosEconomia()
+    agregados.reconstruir(dados)
+    for _ in range(2000):
+        user_id = str(aleatorio.randrange(60))
+        if aleatorio.random() < 0.1:
+            dados.pop(user_id, None)
+            agregados.atualizar(user_id, None)
+        else:
+            dados[user_id] = registro(
+                aleatorio.randint(0, 1000), aleatorio.randint(0, 1000),
+                aleatorio.random() < 0.2, aleatorio.choice([None, "alpha", "beta"])
+            )
+            agregados.atualizar(user_id, dados[user_id])
+        assert agregados.totais() == recalculado(dados)
+    assert agregados.circulacao == agregados.carteiras + agregados.bancos
+    assert agregados.media == agregados.circulacao // len(dados)
+
+
+def test_auditoria_corrige_alteracao_sem_marcar():
+    dados = {"1": registro(100, 50, vip="alpha"), "2": registro(10)}
+    agregados = AgregadosEconomia()
+    agregados.reconstruir(dados)
+    assert agregados.auditar(dados) == {}
+
+    # Alterado sem passar pelo ouvinte
+    dados["2"]["carteira"] = 40
+    dados["3"] = registro(anel=True)
+    divergencia = agregados.auditar(dados)
+    assert divergencia == {"usuarios": (2, 3), "carteiras": (110, 140), "aneis": (0, 1)}
+    assert agregados.totais() == recalculado(dados)
+    assert agregados.ultima_divergencia == divergencia and agregados.ultima_auditoria
+
+
+def test_ativos_sao_coletados_uma_vez():
+    agregados = AgregadosEconomia()
+    agregados.atualizar("1", registro(1))
+    agregados.atualizar("1", registro(2))
+    agregados.atualizar("2", registro(1))
+    agregados.atualizar("2", None)
+    assert agregados.coletar_ativos() == 2
+    assert agregados.coletar_ativos() == 0
@@ -0,0 +1,93 @@
+import random
+
+from cooldowns import DIA, Acao, MotorCooldowns
+
+ACOES = {
+    "daily": Acao("ultimo_daily", diaria=True),
+    "roubar": Acao("ultimo_roubo", 3600),
+    "trabalhar": Acao("ultimo_trabalho", lambda registro: registro["espera"]),
+}
+
+
+def test_acao_diaria_libera_na_virada_do_dia():
+    motor = MotorCooldowns(ACOES)
+    registro = {}
+    expira = motor.iniciar(1, "daily", registro, 5 * DIA + 100)
+    assert expira == 6 * DIA
+    assert registro["ultimo_daily"] == 5 * DIA + 100
+    assert motor.restante(1, "daily", 6 * DIA - 1) == 1
+    assert motor.pronto("1", "daily", 6 * DIA)
+
+
+def test_reconstruir_ignora_vencidos_e_trabalhos_que_sumiram():
+    dados = {
+        "1": {"ultimo_roubo": 1000},
+        "2": {"ultimo_roubo": 100},
+        "3": {"ultimo_trabalho": 1000},  # sem "espera": KeyError na duração
+    }
+    motor = MotorCooldowns(ACOES)
+    motor.reconstruir(dados, agora=3800)
+    assert motor.pendentes(1, 3800) == {"roubar": 4600}
+    assert motor.pendentes(2, 3800) == {} and motor.pendentes(3, 3800) == {}
+    assert len(motor) == 1
+
+
+def test_heap_bate_com_busca_linear():
+    aleatorio = random.Random(13)
+    motor = MotorCooldowns(ACOES)
+    modelo = {}  # (user_id, acao) -> expira_em
+    agora = 0
+    for _ in range(5000):
+        agora += aleatorio.randint(0, 120)
+        user_id = str(aleatorio.randrange(50))
+        operacao = aleatorio.random()
+        if operacao < 0.6:
+            acao = aleatorio.choice(list(ACOES))
+            registro = {"espera": aleatorio.randint(1, 900)}
+            modelo[user_id, acao] = motor.iniciar(user_id, acao, registro, agora)
+        elif operacao < 0.65:
+            motor.esquecer(user_id)
+            modelo = {chave: expira for chave, expira in modelo.items() if chave[0] != user_id}
+
+        ativos = {chave: expira for chave, expira in modelo.items() if expira > agora}
+        esperado = {acao: expira for (uid, acao), expira in ativos.items() if uid == user_id}
+        assert motor.pendentes(user_id, agora) == esperado
+        for acao in ACOES:
+            assert motor.restante(user_id, acao, agora) == max(0, esperado.get(acao, 0) - agora)
+
+        proximo = motor.proximo(agora)
+        if ativos:
+            assert proximo is not None and proximo[0] == min(ativos.values())
+            assert ativos[proximo[1], proximo[2]] == proximo[0]
+        else:
+            assert proximo is None
+        assert len(motor) == len(ativos)
+
+
+def test_trocar_de_trabalho_no_meio_do_cooldown():
+    tempos = {"medico": 3600, "gari": 600}
+    acoes = {"trabalhar": Acao("ultimo_trabalho", lambda registro: tempos[registro["trabalho"]])}
+    motor = MotorCooldowns(acoes)
+    registro = {"trabalho": "medico"}
+    motor.iniciar(1, "trabalhar", registro, 1000)
+    assert motor.restante(1, "trabalhar", 1100) == 3500
+
+    # Mais curto: vale o tempo do trabalho novo, como depois de um reinício
+    registro["trabalho"] = "gari"
+    assert motor.recalcular(1, "trabalhar", registro, 1100) == 500
+    assert motor.restante(1, "trabalhar", 1100) == 500
+    reiniciado = MotorCooldowns(acoes)
+    reiniciado.reconstruir({"1": registro}, 1100)
+    assert reiniciado.pendentes(1, 1100) == motor.pendentes(1, 1100)
+    assert motor.proximo(1100) == (1600, "1", "trabalhar")
+
+    # Já passou do tempo do trabalho novo: libera na hora
+    assert motor.recalcular(1, "trabalhar", registro, 1700) == 0
+    assert motor.pronto(1, "trabalhar", 1700) and len(motor) == 0
+
+    # Sem trabalho o cooldown some, como no reconstruir
+    registro["trabalho"] = "medico"
+    assert motor.recalcular(1, "trabalhar", registro, 1700) == 2900
+    registro["trabalho"] = None
+    assert motor.recalcular(1, "trabalhar", registro, 1700) == 0
+    assert motor.pendentes(1, 1700) == {} and motor.proximo(1700) is None
@@ -0,0 +1,129 @@
+import asyncio
+import threading
+
+import pytest
+
+from economias import Economia, GerenciadorEconomias
+from persistencia import ArmazenamentoJournal, GerenciadorPersistencia, PersistenciaFechada
+from transacoes import LivroRazao, Transacao
+
+
+class _Persistencia:
+    pendente = False
+
+    def agendar(self):
+        pass
+
+    async def aguardar(self):
+        pass
+
+    def fechar(self):
+        pass
+
+
+def test_cargas_simultaneas_do_mesmo_servidor_abrem_uma_vez():
+    aberturas = []
+    liberar = threading.Event()
+
+    def abrir(chave):
+        aberturas.append(chave)
+        liberar.wait(5)
+        return Economia(chave, {}, None, _Persistencia())
+
+    async def cenario():
+        economias = GerenciadorEconomias(abrir)
+        tarefas = [asyncio.create_task(economias.obter(1)) for _ in range(5)]
+        tarefas.append(asyncio.create_task(economias.obter(2)))
+        await asyncio.sleep(0.05)
+        liberar.set()
+        resultado = await asyncio.gather(*tarefas)
+        return economias, resultado
+
+    economias, resultado = asyncio.run(cenario())
+    assert sorted(aberturas) == [1, 2]
+    assert len({id(economia) for economia in resultado[:5]}) == 1
+    assert resultado[5].chave == 2 and len(economias.carregadas()) == 2
+
+
+def test_descarrega_so_as_ociosas():
+    economias = GerenciadorEconomias(lambda chave: Economia(chave, {}, None, _Persistencia()), inatividade=60)
+
+    async def cenario():
+        ociosa = await economias.obter(1)
+        await economias.obter(2)
+        ociosa.ultimo_uso -= 120
+        return await economias.descarregar_inativas()
+
+    assert asyncio.run(cenario()) == 1
+    assert [economia.chave for economia in economias.carregadas()] == [2]
+
+
+def test_economia_descarregada_recusa_alteracoes(tmp_path):
+    def abrir(chave):
+        armazenamento = ArmazenamentoJournal(str(tmp_path / f"{chave}.json"))
+        dados = armazenamento.carregar()
+        persistencia = GerenciadorPersistencia(dados, armazenamento)
+        livro = LivroRazao(dados, persistencia, lambda: {"carteira": 0, "banco": 0})
+        return Economia(chave, dados, armazenamento, persistencia, livro)
+
+    economias = GerenciadorEconomias(abrir, inatividade=60)
+
+    async def cenario():
+        antiga = await economias.obter(1)
+        antiga.dados["1"] = {"carteira": 10, "banco": 0}
+        antiga.persistencia.marcar("1")
+        antiga.ultimo_uso -= 120
+        assert await economias.descarregar_inativas() == 1
+
+        # Um handler que ainda segura a economia antiga
+        antiga.dados["1"]["carteira"] = 99
+        with pytest.raises(PersistenciaFechada):
+            antiga.persistencia.marcar("1")
+        with pytest.raises(PersistenciaFechada):
+            antiga.livro.aplicar(Transacao().emitir(1, 5))
+        assert antiga.dados["1"]["carteira"] == 99  # o livro recusou antes de mexer
+        antiga.persistencia.agendar()  # nada pendente: não levanta
+
+        return await economias.obter(1), antiga
+
+    nova, antiga = asyncio.run(cenario())
+    assert nova is not antiga
+    assert nova.dados == {"1": {"carteira": 10, "banco": 0}}
+    nova.fechar()
+
+
+class _Interaction:
+    def __init__(self, guild_id):
+        self.guild_id = guild_id
+
+
+@pytest.fixture
+def bot(main, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    yield main
+    for economia in main.economias.carregadas():
+        economia.fechar()
+    main.economias._carregadas.clear()
+
+
+def test_cada_interacao_usa_a_economia_do_seu_servidor(bot):
+    async def comando(guild_id, quantia):
+        await bot.selecionar_economia(_Interaction(guild_id))
+        # Outro comando roda enquanto este espera
+        await asyncio.sleep(0.01)
+        bot.get_user_data(1)["carteira"] += quantia
+        await asyncio.sleep(0.01)
+        return bot.economia().chave, bot.ver_user_data(1)["carteira"]
+
+    async def cenario():
+        return await asyncio.gather(comando(10, 5), comando(20, 7), comando(None, 1))
+
+    assert asyncio.run(cenario()) == [(10, 1005), (20, 1007), (None, 1001)]
+
+
+def test_fora_de_uma_interacao_nao_ha_economia(bot):
+    async def cenario():
+        with pytest.raises(LookupError):
+            bot.economia()
+
+    asyncio.run(cenario())
@@ -0,0 +1,59 @@
+import random
+
+from indices import IndicesAtributos
+
+PLANOS = ["alpha", "beta", "omega"]
+
+
+def registro(vip=None, trabalho=None, itens=()):
+    return {"vip": vip, "trabalho": trabalho, "inventario": {item: 1 for item in itens}}
+
+
+def lista_completa(dados):
+    return [
+        (user_id, vip)
+        for vip in PLANOS
+        for user_id in sorted((u for u, r in dados.items() if r["vip"] == vip), key=int)
+    ]
+
+
+def test_acompanha_alteracoes():
+    indices = IndicesAtributos()
+    indices.reconstruir({"1": registro("alpha", "medico", ["faca"]), "2": registro(None, "medico")})
+    assert indices.com_trabalho("medico") == {"1", "2"}
+
+    indices.atualizar("1", registro("beta", None, ["arma"]))
+    assert indices.com_vip("alpha") == frozenset() and indices.com_vip("beta") == {"1"}
+    assert indices.com_trabalho("medico") == {"2"}
+    assert indices.com_item("faca") == frozenset() and indices.com_item("arma") == {"1"}
+    assert "alpha" not in indices.vip
+
+    indices.atualizar("2", None)
+    assert indices.com_trabalho("medico") == frozenset()
+
+
+def test_paginas_de_vip_batem_com_a_lista_completa():
+    aleatorio = random.Random(17)
+    dados = {}
+    indices = IndicesAtributos()
+    for _ in range(2000):
+        user_id = str(aleatorio.randrange(300))
+        if aleatorio.random() < 0.1:
+            dados.pop(user_id, None)
+            indices.atualizar(user_id, None)
+        else:
+            dados[user_id] = registro(aleatorio.choice(PLANOS + [None, "antigo"]))
+            indices.atualizar(user_id, dados[user_id])
+
+        if aleatorio.random() < 0.05:
+            completa = lista_completa(dados)
+            assert indices.total_vip(PLANOS) == len(completa)
+            por_pagina = aleatorio.randint(1, 25)
+            paginas = []
+            for inicio in range(0, len(completa) + por_pagina, por_pagina):
+                paginas += indices.fatia_vip(PLANOS, inicio, por_pagina)
+            assert paginas == completa
+            for posicao, (user_id, _) in enumerate(completa):
+                assert indices.posicao_vip(PLANOS, user_id) == posicao
+            sem_plano = [u for u, r in dados.items() if r["vip"] not in PLANOS]
+            assert all(indices.posicao_vip(PLANOS, u) is None for u in sem_plano)
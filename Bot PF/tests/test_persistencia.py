@@ -0,0 +1,99 @@
+import asyncio
+import os
+
+import persistencia
+from persistencia import ArmazenamentoJournal, GerenciadorPersistencia
+
+
+def abrir_journal(pasta, **opcoes):
+    armazenamento = ArmazenamentoJournal(str(pasta / "economy_data.json"), **opcoes)
+    return armazenamento, armazenamento.carregar()
+
+
+def test_journal_reaplicado_depois_de_um_crash(tmp_path):
+    armazenamento, _ = abrir_journal(tmp_path)
+    armazenamento.gravar({"1": {"carteira": 10}, "2": {"carteira": 20}}, ())
+    armazenamento.gravar({"1": {"carteira": 15}}, {"2"})
+    # Crash no meio de uma linha: sem o \n final
+    armazenamento._journal.write(b'{"u":"3","r":{"cart')
+    armazenamento._journal.flush()
+    tamanho_valido = os.path.getsize(armazenamento.caminho_journal) - len(b'{"u":"3","r":{"cart')
+
+    armazenamento, dados = abrir_journal(tmp_path)
+    assert dados == {"1": {"carteira": 15}}
+    assert os.path.getsize(armazenamento.caminho_journal) == tamanho_valido
+
+    # As linhas seguintes não grudam no lixo descartado
+    armazenamento.espelhar(dados)
+    armazenamento.gravar({"4": {"carteira": 4}}, ())
+    armazenamento.fechar()
+    _, dados = abrir_journal(tmp_path)
+    assert dados == {"1": {"carteira": 15}, "4": {"carteira": 4}}
+
+
+def test_compactar_grava_snapshot_e_esvazia_o_journal(tmp_path):
+    armazenamento, dados = abrir_journal(tmp_path, limite_bytes=50)
+    armazenamento.espelhar(dados)
+    armazenamento.gravar({str(i): {"carteira": i} for i in range(10)}, ())
+    assert armazenamento.precisa_compactar()
+    armazenamento.compactar()
+    assert armazenamento.tamanho_journal() == 0
+    assert os.path.getsize(armazenamento.caminho_journal) == 0
+    armazenamento.gravar({"3": {"carteira": 33}}, {"9"})
+    armazenamento.fechar()
+
+    _, dados = abrir_journal(tmp_path)
+    esperado = {str(i): {"carteira": i} for i in range(9)}
+    esperado["3"] = {"carteira": 33}
+    assert dados == esperado
+
+
+def test_journal_anexa_a_cada_handler_mas_fsync_segue_o_limite(tmp_path, monkeypatch):
+    fsyncs = []
+    fsync = os.fsync
+    monkeypatch.setattr(persistencia.os, "fsync", lambda fd: (fsyncs.append(fd), fsync(fd)))
+
+    async def cenario():
+        armazenamento, dados = abrir_journal(tmp_path)
+        gerenciador = GerenciadorPersistencia(dados, armazenamento, intervalo=3600, limite_alterados=5)
+        for i in range(4):
+            dados[str(i)] = {"carteira": i}
+            gerenciador.marcar(i)
+            await asyncio.sleep(0)
+            await gerenciador.aguardar()
+        linhas = open(armazenamento.caminho_journal, "rb").read().count(b"\n")
+        sem_fsync = len(fsyncs)
+
+        dados["4"] = {"carteira": 4}
+        gerenciador.marcar(4)
+        await asyncio.sleep(0)
+        await gerenciador.aguardar()
+        resultado = (linhas, sem_fsync, gerenciador.nao_sincronizados, len(fsyncs), gerenciador.pendente)
+        gerenciador.fechar()
+        armazenamento.fechar()
+        return resultado
+
+    linhas, sem_fsync, nao_sincronizados, com_fsync, pendente = asyncio.run(cenario())
+    assert (linhas, sem_fsync) == (4, 0)
+    assert nao_sincronizados == 0 and com_fsync == 1 and not pendente
+
+
+def test_intervalo_sincroniza_o_que_foi_anexado(tmp_path, monkeypatch):
+    fsyncs = []
+    monkeypatch.setattr(persistencia.os, "fsync", fsyncs.append)
+
+    async def cenario():
+        armazenamento, dados = abrir_journal(tmp_path)
+        gerenciador = GerenciadorPersistencia(dados, armazenamento, intervalo=3600, limite_alterados=100)
+        dados["1"] = {"carteira": 1}
+        gerenciador.marcar(1)
+        await asyncio.sleep(0)
+        await gerenciador.aguardar()
+        antes = (len(fsyncs), gerenciador.pendente)
+        # O loop salvar_alteracoes chama agendar() a cada intervalo
+        gerenciador.agendar()
+        await gerenciador.aguardar()
+        armazenamento.fechar()
+        return antes, (len(fsyncs), gerenciador.pendente)
+
+    assert asyncio.run(cenario()) == ((0, True), (1, False))
@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+import ranking
+from ranking import RankingPatrimonio
+
+
+def ordenado(dados):
+    chaves = sorted((-(r["carteira"] + r["banco"]), uid) for uid, r in dados.items())
+    return [(uid, -negativo) for negativo, uid in chaves]
+
+
+def test_posicao_e_fatia():
+    dados = {"1": {"carteira": 10, "banco": 5}, "2": {"carteira": 50, "banco": 0}, "3": {"carteira": 15, "banco": 0}}
+    indice = RankingPatrimonio()
+    indice.reconstruir(dados)
+    assert indice.top(10) == [("2", 50), ("1", 15), ("3", 15)]
+    assert [indice.posicao(uid) for uid in ("1", "2", "3", "4")] == [2, 1, 3, None]
+    assert indice.fatia(1, 1) == [("1", 15)] and indice.fatia(3, 5) == []
+    assert indice.patrimonio(2) == 50
+
+
+@pytest.mark.parametrize("carga", [2, 7, 500])
+def test_fuzz_contra_ordenacao(monkeypatch, carga):
+    # Baldes pequenos forçam divisões e baldes esvaziados
+    monkeypatch.setattr(ranking, "CARGA", carga)
+    aleatorio = random.Random(carga)
+    dados = {str(i): {"carteira": aleatorio.randint(0, 100), "banco": 0} for i in range(40)}
+    indice = RankingPatrimonio()
+    indice.reconstruir(dados)
+
+    for passo in range(3000):
+        user_id = str(aleatorio.randrange(120))
+        if aleatorio.random() < 0.15:
+            dados.pop(user_id, None)
+            indice.atualizar(user_id, None)
+        else:
+            dados[user_id] = {"carteira": aleatorio.randint(0, 100), "banco": aleatorio.randint(0, 3)}
+            indice.atualizar(user_id, dados[user_id])
+
+        if passo % 50 == 0:
+            esperado = ordenado(dados)
+            assert len(indice) == len(esperado)
+            assert indice.fatia(0, len(esperado) + 5) == esperado
+            inicio = aleatorio.randrange(len(esperado) + 1)
+            quantidade = aleatorio.randint(0, 12)
+            assert indice.fatia(inicio, quantidade) == esperado[inicio:inicio + quantidade]
+            for posicao, (uid, patrimonio) in enumerate(esperado, 1):
+                assert indice.posicao(uid) == posicao
+                assert indice.patrimonio(uid) == patrimonio
@@ -0,0 +1,73 @@
+import pytest
+
+import registro_usuario
+from registro_usuario import RegistroUsuario
+
+
+@pytest.fixture(autouse=True)
+def catalogos():
+    anteriores = registro_usuario._ITENS, registro_usuario._APPS
+    registro_usuario.configurar_catalogos(["faca", "arma"], ["banco_digital", "uber"])
+    yield
+    registro_usuario.configurar_catalogos(*anteriores)
+
+
+def test_campos_e_cooldowns_legados():
+    registro = RegistroUsuario.de_dict({
+        "carteira": 50, "trabalho": "medico", "ultimo_daily": 1700000000,
+        "anel_ultimo_uso_criar": "2025-10-24", "campo_novo": [1, 2],
+    })
+    assert registro["carteira"] == 50 and registro["trabalho"] == "medico"
+    assert registro["anel_ultimo_uso_criar"] == 1761264000
+    assert registro["campo_novo"] == [1, 2] and "campo_novo" in registro
+    assert registro.para_dict()["campo_novo"] == [1, 2]
+
+
+def test_itens_e_apps_fora_do_catalogo_sao_preservados():
+    original = {"inventario": {"faca": 1, "espada_antiga": 1, "arma": 3}, "apps": ["uber", "app_removido"]}
+    registro = RegistroUsuario.de_dict(original)
+
+    assert "app_removido" in registro["apps"] and "uber" in registro["apps"]
+    assert len(registro["apps"]) == 2
+    assert registro["inventario"]["arma"] == 3
+    dados = registro.para_dict()
+    assert sorted(dados["apps"]) == ["app_removido", "uber"]
+    assert dados["inventario"] == original["inventario"]
+    assert RegistroUsuario.de_dict(dados).para_dict() == dados
+
+
+def test_copia_nao_compartilha_extras():
+    registro = RegistroUsuario.de_dict({"apps": ["app_removido"], "inventario": {"espada_antiga": 1}})
+    copia = registro.copia()
+    registro["apps"].remove("app_removido")
+    registro["apps"].append("outro_app")
+    del registro["inventario"]["espada_antiga"]
+    assert copia.para_dict()["apps"] == ["app_removido"]
+    assert copia.para_dict()["inventario"] == {"espada_antiga": 1}
+    assert registro.para_dict()["apps"] == ["outro_app"]
+
+
+def test_remover_app():
+    registro = RegistroUsuario.de_dict({"apps": ["uber", "app_removido"]})
+    registro["apps"].remove("uber")
+    registro["apps"].remove("app_removido")
+    assert not registro["apps"] and registro.para_dict()["apps"] == []
+    with pytest.raises(ValueError):
+        registro["apps"].remove("uber")
+
+
+def test_item_do_catalogo_volta_para_quantidade_1():
+    registro = RegistroUsuario.de_dict({"inventario": {"arma": 2, "espada_antiga": 1}})
+    inventario = registro["inventario"]
+    inventario["arma"] = 1
+    assert list(inventario) == ["arma", "espada_antiga"]
+    assert inventario["arma"] == 1 and len(inventario) == 2
+    assert registro.para_dict()["inventario"] == {"arma": 1, "espada_antiga": 1}
+
+    inventario["arma"] = 5
+    inventario["arma"] = 1
+    del inventario["espada_antiga"]
+    assert registro._itens_extras is None
+    dados = registro.para_dict()
+    assert dados["inventario"] == {"arma": 1}
+    assert RegistroUsuario.de_dict(dados).para_dict() == dados
@@ -0,0 +1,62 @@
+import json
+import struct
+
+import pytest
+
+import snapshot_compacto
+from snapshot_compacto import codificar, decodificar, eh_compacto
+
+COMPLETO = {
+    "carteira": 1500, "banco": -20, "inventario": {"faca": 1, "arma": 1}, "trabalho": "medico",
+    "ultimo_trabalho": 1700000000, "ultimo_daily": None, "ultimo_roubo": 1700000500,
+    "celular": True, "apps": ["uber"], "nivel": 3, "xp": 40, "reputacao": -2, "vip": "alpha",
+    "vip_expira": 1800000000, "anel_ultimo_uso_criar": 1761264000, "anel_ultimo_uso_punir": None,
+}
+
+
+def padrao(**campos):
+    registro = {
+        "carteira": 1000, "banco": 0, "inventario": {}, "trabalho": None, "ultimo_trabalho": None,
+        "ultimo_daily": None, "ultimo_roubo": None, "celular": False, "apps": [], "nivel": 1,
+        "xp": 0, "reputacao": 0, "vip": None, "vip_expira": None,
+        "anel_ultimo_uso_criar": None, "anel_ultimo_uso_punir": None,
+    }
+    registro.update(campos)
+    return registro
+
+
+@pytest.mark.parametrize("comprimir", [False, True])
+def test_ida_e_volta(comprimir):
+    dados = {
+        "123456789012345678": COMPLETO,
+        "2": padrao(inventario={"faca": 1, "pocao": 3}, campo_novo={"a": [1]}),
+        "3": padrao(),
+        # Não cabe no layout fixo: vai inteiro para o cabeçalho
+        "4": padrao(carteira=2 ** 70),
+    }
+    conteudo = codificar(json.loads(json.dumps(dados)), comprimir=comprimir)
+    assert eh_compacto(conteudo)
+    assert decodificar(conteudo) == dados
+
+
+def test_cooldowns_legados_viram_epoca():
+    dados = {"1": padrao(ultimo_daily="2025-10-24T12:00:00", anel_ultimo_uso_criar="2025-10-24")}
+    registro = decodificar(codificar(dados))["1"]
+    assert isinstance(registro["ultimo_daily"], int)
+    assert registro["anel_ultimo_uso_criar"] == 1761264000
+
+
+def test_le_a_versao_1():
+    # Versão 1: anel em dias ordinais (i32) nos dois últimos campos
+    cabecalho = json.dumps({"tabelas": {"itens": [], "apps": [], "trabalhos": [], "vips": []}, "extras": {}}).encode()
+    dia = snapshot_compacto._EPOCA_ORDINAL + 20385
+    registro = snapshot_compacto.REGISTRO_V1.pack(7, 10, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, dia, 0)
+    conteudo = b"ECOS" + bytes((1, 0)) + struct.pack("<I", len(cabecalho)) + cabecalho + registro
+    dados = decodificar(conteudo)
+    assert dados["7"]["anel_ultimo_uso_criar"] == 20385 * 86400
+    assert dados["7"]["anel_ultimo_uso_punir"] is None
+
+
+def test_versao_desconhecida():
+    with pytest.raises(ValueError):
+        decodificar(b"ECOS" + bytes((9, 0)))
@@ -0,0 +1,70 @@
+import pytest
+
+from persistencia import ArmazenamentoJSON, GerenciadorPersistencia
+from transacoes import BANCO_CENTRAL, MULTAS, TAXAS, LivroRazao, SaldoInsuficiente, Transacao
+
+
+def novo_registro():
+    return {"carteira": 0, "banco": 0}
+
+
+def abrir(pasta, dados=None):
+    armazenamento = ArmazenamentoJSON(str(pasta / "economy_data.json"))
+    dados = armazenamento.carregar() if dados is None else dados
+    persistencia = GerenciadorPersistencia(dados, armazenamento)
+    livro = LivroRazao(dados, persistencia, novo_registro, str(pasta / "economy_ledger.json"))
+    persistencia.anexos.append(livro)
+    return dados, persistencia, livro
+
+
+def total(dados, livro):
+    return sum(r["carteira"] + r["banco"] for r in dados.values()) + sum(livro.contas_sistema.values())
+
+
+def test_transferencia_com_taxa(tmp_path):
+    dados, _, livro = abrir(tmp_path, {"1": {"carteira": 1000, "banco": 0}})
+    afetados = livro.aplicar(Transacao().transferir(1, 2, 1000, taxa=50))
+    assert afetados == ["1", "2"]
+    assert dados["1"]["carteira"] == 0
+    assert dados["2"]["carteira"] == 950
+    assert livro.contas_sistema[TAXAS] == 50
+    assert total(dados, livro) == 1000
+
+
+def test_saldo_insuficiente_nao_altera_nada(tmp_path):
+    dados, persistencia, livro = abrir(tmp_path, {"1": {"carteira": 10, "banco": 0}})
+    with pytest.raises(SaldoInsuficiente) as erro:
+        livro.aplicar(Transacao().emitir(2, 500).transferir(1, 2, 100))
+    assert (erro.value.user_id, erro.value.necessario) == ("1", 100)
+    assert dados == {"1": {"carteira": 10, "banco": 0}}
+    assert not livro.contas_sistema and not persistencia.pendente
+
+
+def test_transacao_desbalanceada(tmp_path):
+    _, _, livro = abrir(tmp_path, {})
+    with pytest.raises(ValueError):
+        livro.aplicar(Transacao().creditar(1, 5))
+    with pytest.raises(ValueError):
+        livro.aplicar(Transacao().creditar(1, 5, campo="xp").sistema(BANCO_CENTRAL, -5))
+
+
+def test_contas_do_sistema_sobrevivem_ao_reinicio(tmp_path):
+    dados, persistencia, livro = abrir(tmp_path, {})
+    livro.aplicar(Transacao().emitir(1, 300))
+    livro.aplicar(Transacao().recolher(1, 40, conta=MULTAS))
+    persistencia.fechar()
+
+    dados, _, livro = abrir(tmp_path)
+    assert livro.contas_sistema == {BANCO_CENTRAL: -300, MULTAS: 40}
+    assert dados["1"]["carteira"] == 260
+    assert total(dados, livro) == 0
+
+
+def test_limpar_zera_as_contas_do_sistema(tmp_path):
+    _, persistencia, livro = abrir(tmp_path, {})
+    livro.aplicar(Transacao().emitir(1, 300))
+    persistencia.limpar()
+    persistencia.fechar()
+
+    dados, _, livro = abrir(tmp_path)
+    assert dados == {} and not livro.contas_sistema
@@ -0,0 +1,155 @@
+"""Transações de dinheiro entre contas, aplicadas de forma atômica.
+
+Uma Transacao é uma lista de lançamentos (créditos positivos, débitos
+negativos) em carteiras/bancos de usuários e em contas do sistema:
+
+    transacao = Transacao()
+    transacao.transferir(pagador_id, recebedor_id, 1000, taxa=50)
+    livro.aplicar(transacao)
+
+O LivroRazao valida a transação inteira antes de mexer em qualquer saldo:
+ou todos os lançamentos entram, ou nenhum (SaldoInsuficiente). A soma dos
+lançamentos precisa ser zero. Dinheiro criado ou destruído passa pelo
+BANCO_CENTRAL e taxas/multas vão para suas próprias contas, então dá para
+saber quanto entrou e saiu da economia. Todos os usuários tocados são
+marcados de uma vez, virando um único lote de gravação.
+
+Os saldos das contas do sistema ficam em um JSON ao lado dos dados da
+economia ({"banco_central": -1500, "taxas": 50, ...}) e são gravados no
+mesmo lote que os usuários (o LivroRazao é um anexo do
+GerenciadorPersistencia).
+"""
+import json
+import os
+from collections import defaultdict
+
+from persistencia import gravar_atomico
+
+# Contas do sistema (não pertencem a usuários e podem ficar negativas)
+BANCO_CENTRAL = "banco_central"  # emite e recolhe dinheiro (admin, anel...)
+TAXAS = "taxas"
+MULTAS = "multas"
+
+CAMPOS_SALDO = ("carteira", "banco")
+
+
+class SaldoInsuficiente(Exception):
+    def __init__(self, user_id, campo, saldo, necessario):
+        super().__init__(f"Usuário {user_id}: {campo} com R$ {saldo:,}, precisa de R$ {necessario:,}")
+        self.user_id = user_id
+        self.campo = campo
+        self.saldo = saldo
+        self.necessario = necessario
+
+
+class Transacao:
+    """Lançamentos a aplicar juntos. Os métodos podem ser encadeados."""
+
+    __slots__ = ("lancamentos",)
+
+    def __init__(self):
+        # (user_id, campo, valor) para usuários; (nome, None, valor) para contas do sistema
+        self.lancamentos = []
+
+    def creditar(self, user_id, valor, campo="carteira"):
+        self.lancamentos.append((str(user_id), campo, valor))
+        return self
+
+    def debitar(self, user_id, valor, campo="carteira"):
+        self.lancamentos.append((str(user_id), campo, -valor))
+        return self
+
+    def sistema(self, conta, valor):
+        """Lançamento em uma conta do sistema (BANCO_CENTRAL, TAXAS, MULTAS)."""
+        self.lancamentos.append((conta, None, valor))
+        return self
+
+    def transferir(self, de, para, valor, taxa=0, conta_taxa=TAXAS, campo="carteira"):
+        """`de` paga `valor`; `para` recebe `valor - taxa` e a taxa vai para `conta_taxa`."""
+        self.debitar(de, valor, campo)
+        self.creditar(para, valor - taxa, campo)
+        if taxa:
+            self.sistema(conta_taxa, taxa)
+        return self
+
+    def emitir(self, user_id, valor, campo="carteira"):
+        """Dinheiro novo para o usuário (sai do BANCO_CENTRAL)."""
+        return self.creditar(user_id, valor, campo).sistema(BANCO_CENTRAL, -valor)
+
+    def recolher(self, user_id, valor, campo="carteira", conta=BANCO_CENTRAL):
+        """Tira dinheiro do usuário (para o BANCO_CENTRAL ou outra conta do sistema)."""
+        return self.debitar(user_id, valor, campo).sistema(conta, valor)
+
+
+class LivroRazao:
+    """Aplica transações nos registros de uma economia.
+
+    - `dados`: {user_id: registro} da economia
+    - `persistencia`: GerenciadorPersistencia onde os usuários são marcados
+    - `novo_registro`: cria o registro de um usuário que ainda não existe
+    - `caminho`: JSON com os saldos das contas do sistema (None = só em memória)
+    """
+
+    def __init__(self, dados, persistencia, novo_registro, caminho=None):
+        self.dados = dados
+        self.persistencia = persistencia
+        self.novo_registro = novo_registro
+        self.caminho = caminho
+        # Saldo acumulado das contas do sistema
+        self.contas_sistema = defaultdict(int)
+        self.alterado = False
+        if caminho and os.path.exists(caminho):
+            with open(caminho, 'r', encoding='utf-8') as f:
+                self.contas_sistema.update(json.load(f))
+
+    def aplicar(self, transacao):
+        """Valida e aplica todos os lançamentos; devolve os IDs dos usuários afetados."""
+        variacoes = defaultdict(int)
+        total = 0
+        for conta, campo, valor in transacao.lancamentos:
+            if campo is not None and campo not in CAMPOS_SALDO:
+                raise ValueError(f"Campo de saldo inválido: {campo}")
+            variacoes[conta, campo] += valor
+            total += valor
+        if total:
+            raise ValueError(f"Transação desbalanceada (sobra R$ {total:,})")
+
+        # Valida tudo antes de alterar qualquer saldo
+        self.persistencia.verificar_aberto()
+        for (conta, campo), variacao in variacoes.items():
+            if campo is None or variacao >= 0:
+                continue
+            registro = self.dados.get(conta)
+            saldo = registro[campo] if registro is not None else self.novo_registro()[campo]
+            if saldo + variacao < 0:
+                raise SaldoInsuficiente(conta, campo, saldo, -variacao)
+
+        afetados = []
+        for (conta, campo), variacao in variacoes.items():
+            if campo is None:
+                self.contas_sistema[conta] += variacao
+                self.alterado = True
+                continue
+            registro = self.dados.get(conta)
+            if registro is None:
+                registro = self.dados[conta] = self.novo_registro()
+            registro[campo] += variacao
+            if conta not in afetados:
+                afetados.append(conta)
+        self.persistencia.marcar(*afetados)
+        return afetados
+
+    # Anexo do GerenciadorPersistencia (ver persistencia)
+
+    def coletar(self):
+        self.alterado = False
+        return dict(self.contas_sistema)
+
+    def gravar(self, estado):
+        if self.caminho:
+            gravar_atomico(self.caminho, json.dumps(estado, indent=4).encode('utf-8'))
+
+    def limpar(self):
+        """Zera as contas do sistema junto com os usuários (/admin_limpar_economia)."""
+        self.contas_sistema.clear()
+        self.alterado = True
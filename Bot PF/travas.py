@@ -0,0 +1,68 @@
+"""Travas por usuário para operações de leitura-espera-escrita.
+
+Um handler que lê o saldo, espera uma chamada ao Discord e depois grava pode
+se intercalar com outro handler do mesmo usuário (dois cliques em "Confirmar",
+um depósito durante um roubo...). `TravasUsuarios.travar` serializa só as
+operações que envolvem os mesmos usuários; usuários diferentes continuam em
+paralelo.
+
+    async with travas.travar(pagador_id, recebedor_id):
+        ...
+
+As travas de vários usuários são pegas sempre na mesma ordem (por ID), então
+A->B e B->A ao mesmo tempo não dão deadlock. Cada entrada some do registro
+assim que ninguém mais a segura ou espera. As travas não são reentrantes: não
+chame `travar` de novo para um usuário que a operação atual já travou.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+
+
+class _Trava:
+    __slots__ = ("trava", "usuarios")
+
+    def __init__(self):
+        self.trava = asyncio.Lock()
+        # Quantas operações seguram ou esperam esta trava
+        self.usuarios = 0
+
+
+def _ordem(chave):
+    # IDs do Discord são números: ordena pelo valor, não pela string
+    return len(chave), chave
+
+
+class TravasUsuarios:
+    def __init__(self):
+        self._travas = {}
+
+    def __len__(self):
+        return len(self._travas)
+
+    @asynccontextmanager
+    async def travar(self, *user_ids):
+        chaves = sorted({str(user_id) for user_id in user_ids}, key=_ordem)
+        pegas = []
+        try:
+            for chave in chaves:
+                trava = self._travas.get(chave)
+                if trava is None:
+                    trava = self._travas[chave] = _Trava()
+                trava.usuarios += 1
+                try:
+                    await trava.trava.acquire()
+                except BaseException:
+                    # Cancelado enquanto esperava
+                    self._liberar(chave, trava)
+                    raise
+                pegas.append((chave, trava))
+            yield
+        finally:
+            for chave, trava in reversed(pegas):
+                trava.trava.release()
+                self._liberar(chave, trava)
+
+    def _liberar(self, chave, trava):
+        trava.usuarios -= 1
+        if not trava.usuarios:
+            del self._travas[chave]